@@ -0,0 +1,170 @@
+"""
+Résolution par lots des scénarios JSON, sans interface graphique
+Les fichiers sont résolus en parallèle dans des processus séparés; les
+threads Gurobi sont répartis entre les processus et chaque ligne du tableau
+récapitulatif s'affiche dès que son scénario est résolu
+
+Usage:
+    python batch.py data/
+    python batch.py "lignes/*.json" --processus 4 --threads 8 --temps-limite 120
+    python batch.py data/ --methode salbp2 --resultats lot.csv --solutions solutions/
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Ajouter le répertoire courant au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver.optimizer import AssemblyLineOptimizer
+from solver.heuristics import HeuristicLineBalancer
+from solver.salbp2 import ExactSALBP2Solver
+
+
+METHODES = ('plne', 'heuristique', 'salbp2')
+
+COLONNES = ['fichier', 'scenario', 'methode', 'statut', 'temps_cycle', 'efficacite',
+            'gap', 'objectif', 'temps_resolution', 'temps_total']
+
+
+def lister_scenarios(motifs):
+    """Fichiers JSON désignés par des dossiers, des motifs glob ou des chemins"""
+    fichiers = []
+    for motif in motifs:
+        if os.path.isdir(motif):
+            fichiers.extend(sorted(glob.glob(os.path.join(motif, '*.json'))))
+        else:
+            fichiers.extend(sorted(glob.glob(motif)) or [motif])
+    # Un fichier désigné deux fois n'est résolu qu'une fois
+    return list(dict.fromkeys(os.path.normpath(f) for f in fichiers))
+
+
+def resoudre_fichier(chemin, methode, temps_limite, threads, dossier_solutions=None):
+    """
+    Résout un scénario (exécuté dans un processus de travail)
+    
+    Returns:
+        dict: ligne du tableau récapitulatif (voir COLONNES)
+    """
+    debut = time.time()
+    ligne = {'fichier': chemin, 'scenario': '', 'methode': methode}
+    try:
+        with open(chemin, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        ligne['scenario'] = data.get('nom_scenario', 'Sans nom')
+        if methode == 'heuristique':
+            solution = HeuristicLineBalancer(data).solve()
+        elif methode == 'salbp2':
+            solution = ExactSALBP2Solver(data).solve(temps_limite)
+        else:
+            optimiseur = AssemblyLineOptimizer(data)
+            if not optimiseur.build_model():
+                raise ValueError("construction du modèle impossible")
+            # Les processus se partagent les cœurs
+            optimiseur.model.setParam('Threads', threads)
+            solution = optimiseur.solve(temps_limite)
+        ligne['statut'] = 'ok' if solution is not None else 'sans solution'
+    except Exception as e:
+        solution = None
+        ligne['statut'] = f"erreur: {e}"
+    
+    if solution is not None:
+        ligne.update({
+            'temps_cycle': solution['temps_cycle'],
+            'efficacite': round(solution['efficacite'], 3),
+            'gap': round(solution['gap'], 6),
+            'objectif': round(solution['objectif'], 6),
+            'temps_resolution': round(solution['temps_resolution'], 4)
+        })
+        if dossier_solutions:
+            nom = os.path.splitext(os.path.basename(chemin))[0]
+            with open(os.path.join(dossier_solutions, f"{nom}_solution.json"), 'w',
+                      encoding='utf-8') as f:
+                json.dump(solution, f, indent=2, ensure_ascii=False)
+    ligne['temps_total'] = round(time.time() - debut, 4)
+    return ligne
+
+
+def afficher_ligne(ligne):
+    """Ligne du tableau récapitulatif affiché au fil des résolutions"""
+    def champ(cle, fmt, facteur=1):
+        return format(ligne[cle] * facteur, fmt) if cle in ligne else "-"
+    statut = ligne['statut'] if ligne['statut'] != 'ok' else ''
+    print(f"{os.path.basename(ligne['fichier'])[:35]:<35} {champ('temps_cycle', '.2f'):>8} "
+          f"{champ('efficacite', '.1f'):>7} {champ('gap', '.2f', 100):>7} "
+          f"{champ('temps_resolution', '.3f'):>9} {ligne['temps_total']:>9.3f}  {statut}",
+          flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Résolution par lots de scénarios JSON")
+    parser.add_argument('scenarios', nargs='+',
+                        help="fichiers, dossiers ou motifs glob de scénarios JSON")
+    parser.add_argument('--methode', default='plne', choices=METHODES)
+    parser.add_argument('--temps-limite', type=float, default=300)
+    parser.add_argument('--processus', type=int, default=None,
+                        help="processus de travail (par défaut: un par cœur, au plus un par fichier)")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="threads Gurobi au total, répartis entre les processus "
+                             "(par défaut: nombre de cœurs)")
+    parser.add_argument('--resultats', default=None, help="fichier CSV des résultats")
+    parser.add_argument('--solutions', default=None,
+                        help="dossier où enregistrer la solution JSON de chaque scénario")
+    args = parser.parse_args()
+    
+    fichiers = lister_scenarios(args.scenarios)
+    if not fichiers:
+        print("Aucun scénario trouvé")
+        sys.exit(1)
+    coeurs = os.cpu_count() or 1
+    processus = max(1, min(args.processus or coeurs, len(fichiers)))
+    threads = max(1, (args.threads or coeurs) // processus)
+    if args.solutions:
+        os.makedirs(args.solutions, exist_ok=True)
+    
+    print(f"{len(fichiers)} scénario(s), {processus} processus, {threads} thread(s) Gurobi par processus")
+    print(f"{'Fichier':<35} {'Cycle':>8} {'Eff. %':>7} {'Gap %':>7} {'Résol.':>9} {'Total':>9}")
+    print("-" * 80)
+    
+    debut = time.time()
+    lignes = []
+    sortie = open(args.resultats, 'w', newline='', encoding='utf-8') if args.resultats else None
+    try:
+        writer = csv.DictWriter(sortie, fieldnames=COLONNES) if sortie else None
+        if writer:
+            writer.writeheader()
+        with ProcessPoolExecutor(max_workers=processus) as executeur:
+            taches = {executeur.submit(resoudre_fichier, f, args.methode, args.temps_limite,
+                                       threads, args.solutions): f
+                      for f in fichiers}
+            for tache in as_completed(taches):
+                try:
+                    ligne = tache.result()
+                except Exception as e:
+                    # Processus de travail interrompu (mémoire, signal)
+                    ligne = {'fichier': taches[tache], 'scenario': '', 'methode': args.methode,
+                             'statut': f"erreur: {e}", 'temps_total': 0.0}
+                lignes.append(ligne)
+                afficher_ligne(ligne)
+                if writer:
+                    writer.writerow(ligne)
+                    sortie.flush()
+    finally:
+        if sortie:
+            sortie.close()
+    
+    resolus = sum(1 for ligne in lignes if ligne['statut'] == 'ok')
+    print("-" * 80)
+    print(f"{resolus}/{len(lignes)} scénario(s) résolu(s) en {time.time() - debut:.2f} s")
+    if args.resultats:
+        print(f"Résultats enregistrés dans {args.resultats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Comparaison des moteurs de résolution sur les scénarios, les instances .IN2
+et des lignes synthétiques: PLNE Gurobi, moteur exact SALBP-2 et heuristique
+Les résultats sont enregistrés dans un fichier CSV
+
+Usage:
+    python benchmark.py [scenario.json ...] [--temps-limite 60]
+    python benchmark.py --in2 SCHOLL/ --postes 5 8 --resultats resultats.csv
+    python benchmark.py --generer 100:10:0.3:0 200:15:0.6:1
+    python benchmark.py --formulations [scenario.json ...]
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+# Ajouter le répertoire courant au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver.optimizer import AssemblyLineOptimizer, FORMULATIONS
+from solver.heuristics import HeuristicLineBalancer
+from solver.salbp2 import ExactSALBP2Solver
+from solver.benchmarks import lire_in2, generer_ligne, force_ordre
+
+
+MOTEURS = {
+    'PLNE': lambda d, tl: AssemblyLineOptimizer(d).solve(tl),
+    'SALBP-2': lambda d, tl: ExactSALBP2Solver(d).solve(tl),
+    'Heuristique': lambda d, tl: HeuristicLineBalancer(d).solve(),
+}
+
+COLONNES = ['instance', 'moteur', 'n_taches', 'n_postes', 'force_ordre', 'statut',
+            'temps_cycle', 'gap', 'efficacite', 'temps_construction',
+            'temps_resolution', 'temps_total']
+
+
+def executer(moteur, data, temps_limite):
+    """
+    Résout une instance avec un moteur
+
+    Returns:
+        dict: ligne de résultats (voir COLONNES)
+    """
+    debut = time.time()
+    try:
+        solution = MOTEURS[moteur](data, temps_limite)
+        statut = 'ok' if solution is not None else 'sans solution'
+    except Exception as e:
+        solution, statut = None, f"erreur: {e}"
+    ligne = {
+        'instance': data.get('nom_scenario', 'Sans nom'),
+        'moteur': moteur,
+        'n_taches': len(data['taches']),
+        'n_postes': data['nombre_postes'],
+        'force_ordre': round(force_ordre(data), 4),
+        'statut': statut,
+        'temps_total': round(time.time() - debut, 4)
+    }
+    if solution is not None:
+        ligne.update({
+            'temps_cycle': solution['temps_cycle'],
+            'gap': round(solution['gap'], 6),
+            'efficacite': round(solution['efficacite'], 3),
+            'temps_construction': round(solution.get('temps_construction', 0.0), 4),
+            'temps_resolution': round(solution['temps_resolution'], 4)
+        })
+    return ligne
+
+
+def charger_instances(args):
+    """Scénarios JSON, instances .IN2 et lignes générées demandés en ligne de commande"""
+    instances = []
+    fichiers = list(args.scenarios)
+    if not (args.scenarios or args.in2 or args.generer):
+        fichiers = sorted(glob.glob(os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'data', '*.json')))
+        args.generer = ['20:4:0.3:0', '40:6:0.3:1', '60:8:0.3:2', '80:10:0.3:3']
+    for f in fichiers:
+        with open(f, 'r', encoding='utf-8') as fp:
+            instances.append(json.load(fp))
+    
+    for chemin in args.in2:
+        chemins = (sorted(glob.glob(os.path.join(chemin, '*.IN2')) + glob.glob(os.path.join(chemin, '*.in2')))
+                   if os.path.isdir(chemin) else [chemin])
+        for c in chemins:
+            for m in args.postes:
+                nom = f"{os.path.splitext(os.path.basename(c))[0]} m={m}"
+                instances.append(lire_in2(c, m, nom=nom))
+    
+    for spec in args.generer:
+        n, m, force, graine = spec.split(':')
+        instances.append(generer_ligne(int(n), int(m), float(force), int(graine)))
+    return instances
+
+
+def comparer_formulations(instances, temps_limite):
+    """
+    Compare les formulations PLNE, avec et sans coupes de symétrie
+    (objectif d'origine de chaque scénario, y compris multi-critères)
+    """
+    print(f"{'Instance':<45} {'Formulation':<14} {'Objectif':>10} {'Gap %':>7} "
+          f"{'Var':>6} {'NZ':>7} {'Temps (s)':>10}")
+    print("-" * 104)
+    for data in instances:
+        nom = data.get('nom_scenario', 'Sans nom')[:45]
+        for formulation in FORMULATIONS:
+            for coupes in (False, True):
+                optimiseur = AssemblyLineOptimizer(data, formulation, coupes)
+                debut = time.time()
+                solution = optimiseur.solve(temps_limite)
+                duree = time.time() - debut
+                libelle = formulation + (" +sym" if coupes else "")
+                if solution is None:
+                    print(f"{nom:<45} {libelle:<14} {'-':>10} {'-':>7} {'-':>6} {'-':>7} {duree:>10.3f}")
+                    continue
+                print(f"{nom:<45} {libelle:<14} {solution['objectif']:>10.4f} "
+                      f"{solution['gap'] * 100:>7.2f} {optimiseur.model.NumVars:>6} "
+                      f"{optimiseur.model.NumNZs:>7} {duree:>10.3f}")
+        print(f"{'':<45} auto -> {AssemblyLineOptimizer(data).choisir_formulation()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PLNE / SALBP-2 exact / heuristique")
+    parser.add_argument('scenarios', nargs='*', help="fichiers JSON (par défaut: data/*.json)")
+    parser.add_argument('--in2', nargs='*', default=[],
+                        help="fichiers ou dossiers d'instances .IN2")
+    parser.add_argument('--postes', nargs='*', type=int, default=[5],
+                        help="nombres de postes pour les instances .IN2")
+    parser.add_argument('--generer', nargs='*', default=[],
+                        help="lignes synthétiques n:postes:force_ordre:graine")
+    parser.add_argument('--moteurs', nargs='*', default=list(MOTEURS), choices=list(MOTEURS))
+    parser.add_argument('--temps-limite', type=float, default=60)
+    parser.add_argument('--resultats', default='benchmark_resultats.csv',
+                        help="fichier CSV des résultats")
+    parser.add_argument('--formulations', action='store_true',
+                        help="compare les formulations PLNE au lieu des moteurs")
+    args = parser.parse_args()
+    
+    instances = charger_instances(args)
+    
+    if args.formulations:
+        comparer_formulations(instances, args.temps_limite)
+        return
+    
+    print(f"{'Instance':<45} {'Moteur':<12} {'Cycle':>8} {'Gap %':>7} {'Eff. %':>7} "
+          f"{'Constr.':>8} {'Résol.':>8}")
+    print("-" * 100)
+    with open(args.resultats, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLONNES)
+        writer.writeheader()
+        for data in instances:
+            # Le benchmark compare le temps de cycle: objectif simple pour le PLNE
+            data = {k: v for k, v in data.items() if k != 'objectifs_multiples'}
+            for moteur in args.moteurs:
+                ligne = executer(moteur, data, args.temps_limite)
+                writer.writerow(ligne)
+                f.flush()
+                
+                def champ(cle, fmt, facteur=1):
+                    return format(ligne[cle] * facteur, fmt) if cle in ligne else "-"
+                print(f"{ligne['instance'][:45]:<45} {moteur:<12} {champ('temps_cycle', '.1f'):>8} "
+                      f"{champ('gap', '.2f', 100):>7} {champ('efficacite', '.1f'):>7} "
+                      f"{champ('temps_construction', '.3f'):>8} {champ('temps_resolution', '.3f'):>8}")
+    print(f"\nRésultats enregistrés dans {args.resultats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,9 @@ import json
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
                              QLabel, QSpinBox, QDoubleSpinBox, QTextEdit, QFileDialog,
-                             QMessageBox, QGroupBox, QTabWidget, QProgressBar)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                             QMessageBox, QGroupBox, QTabWidget, QProgressBar,
+                             QComboBox, QCheckBox)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
 import os
 import sys
@@ -17,22 +18,54 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from solver.optimizer import AssemblyLineOptimizer
+from solver.heuristics import HeuristicLineBalancer
+from solver.salbp2 import ExactSALBP2Solver
+from solver.pareto import ParetoFrontExplorer
+from solver.sweep import StationSweep
+from solver.instance import LineInstance
 from gui.visualization import SolutionVisualizer
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 
 
 class OptimizationThread(QThread):
     """Thread pour exécuter l'optimisation sans bloquer l'UI"""
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
+    # Solution courante du PLNE (émise à chaque amélioration)
+    incumbent = pyqtSignal(dict)
     
-    def __init__(self, optimizer, time_limit):
+    def __init__(self, optimizer, time_limit, heuristique=None, depart=None):
         super().__init__()
         self.optimizer = optimizer
         self.time_limit = time_limit
-        
+        self.heuristique = heuristique
+        # Solution de départ déjà connue (solution précédente réparée)
+        self.depart = depart
+    
+    def stop(self):
+        """Arrête le PLNE en cours: la meilleure solution trouvée est conservée"""
+        if isinstance(self.optimizer, AssemblyLineOptimizer):
+            self.optimizer.stop()
+    
+    def _on_incumbent(self, solution, borne, gap):
+        solution['borne'] = borne
+        self.incumbent.emit(solution)
+    
     def run(self):
         try:
-            solution = self.optimizer.solve(self.time_limit)
+            if isinstance(self.optimizer, HeuristicLineBalancer):
+                solution = self.optimizer.solve()
+            elif isinstance(self.optimizer, ExactSALBP2Solver):
+                solution = self.optimizer.solve(self.time_limit)
+            else:
+                # Solution réparée ou heuristique comme point de départ du PLNE
+                depart = self.depart
+                if depart is None and self.heuristique:
+                    depart = self.heuristique.solve()
+                if depart:
+                    self.incumbent.emit(depart)
+                solution = self.optimizer.solve(self.time_limit, mip_start=depart,
+                                                on_incumbent=self._on_incumbent)
             if solution:
                 self.finished.emit(solution)
             else:
@@ -41,18 +74,71 @@ class OptimizationThread(QThread):
             self.error.emit(f"Erreur: {str(e)}")
 
 
+class ParetoThread(QThread):
+    """Thread pour le calcul du front de Pareto"""
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+    
+    def __init__(self, explorer, n_points):
+        super().__init__()
+        self.explorer = explorer
+        self.n_points = n_points
+    
+    def run(self):
+        try:
+            with self.explorer:
+                front = self.explorer.solve(self.n_points)
+            if front:
+                self.finished.emit(front)
+            else:
+                self.error.emit("Aucun point du front trouvé")
+        except Exception as e:
+            self.error.emit(f"Erreur: {str(e)}")
+
+
+class SweepThread(QThread):
+    """Thread pour le balayage du nombre de postes"""
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+    
+    def __init__(self, sweep, m_min, m_max):
+        super().__init__()
+        self.sweep = sweep
+        self.m_min = m_min
+        self.m_max = m_max
+    
+    def run(self):
+        try:
+            self.finished.emit(self.sweep.solve(self.m_min, self.m_max))
+        except Exception as e:
+            self.error.emit(f"Erreur: {str(e)}")
+
+
 class MainWindow(QMainWindow):
     """Fenêtre principale de l'application"""
     
+    INTERVALLE_REDESSIN = 500
+    
     def __init__(self):
         super().__init__()
         self.optimizer = None
         self.solution = None
         self.data = None
         self.opt_thread = None
+        self.pareto_thread = None
+        self.sweep_thread = None
+        self.pareto_front = []
+        
+        # Solutions courantes du PLNE: affichage limité à un rafraîchissement
+        # toutes les INTERVALLE_REDESSIN ms (la dernière reçue l'emporte)
+        self.incumbent_pending = None
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.setInterval(self.INTERVALLE_REDESSIN)
+        self.redraw_timer.timeout.connect(self.flush_incumbent)
         
         self.init_ui()
-        
+    
     def init_ui(self):
         """Initialise l'interface utilisateur"""
         self.setWindowTitle("Équilibrage de Chaîne de Montage - Agroalimentaire")
@@ -101,6 +187,11 @@ class MainWindow(QMainWindow):
         self.btn_solve.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; }")
         control_layout.addWidget(self.btn_solve)
         
+        self.btn_stop = QPushButton("Arrêter")
+        self.btn_stop.clicked.connect(self.stop_optimization)
+        self.btn_stop.setEnabled(False)
+        control_layout.addWidget(self.btn_stop)
+        
         self.btn_export = QPushButton("Exporter Solution")
         self.btn_export.clicked.connect(self.export_solution)
         self.btn_export.setEnabled(False)
@@ -116,7 +207,7 @@ class MainWindow(QMainWindow):
         
         # Barre de statut
         self.statusBar().showMessage("Prêt")
-        
+    
     def create_data_tab(self):
         """Crée l'onglet de saisie des données"""
         widget = QWidget()
@@ -143,6 +234,8 @@ class MainWindow(QMainWindow):
             ["ID", "Nom Tâche", "Durée (s)", "Prérequis", "Pénibilité"]
         )
         self.tasks_table.horizontalHeader().setStretchLastSection(True)
+        # Les modifications (durée, prérequis, pénibilité) sont reportées dans le scénario
+        self.tasks_table.itemChanged.connect(self.on_task_edited)
         tasks_layout.addWidget(self.tasks_table)
         
         tasks_group.setLayout(tasks_layout)
@@ -186,6 +279,38 @@ class MainWindow(QMainWindow):
         solver_group = QGroupBox("Paramètres du Solveur Gurobi")
         solver_layout = QVBoxLayout()
         
+        # Méthode de résolution
+        method_layout = QHBoxLayout()
+        method_layout.addWidget(QLabel("Méthode de résolution:"))
+        self.combo_methode = QComboBox()
+        self.combo_methode.addItem("PLNE Gurobi", "plne")
+        self.combo_methode.addItem("Heuristique (RPW + COMSOAL + tabou)", "heuristique")
+        self.combo_methode.addItem("Exact SALBP-2 (bissection + séparation et évaluation)", "salbp2")
+        method_layout.addWidget(self.combo_methode)
+        method_layout.addStretch()
+        solver_layout.addLayout(method_layout)
+        
+        # Formulation PLNE
+        form_layout = QHBoxLayout()
+        form_layout.addWidget(QLabel("Formulation PLNE:"))
+        self.combo_formulation = QComboBox()
+        self.combo_formulation.addItem("Automatique (selon la taille)", "auto")
+        self.combo_formulation.addItem("Affectation, précédence cumulée", "cumul")
+        self.combo_formulation.addItem("Variables d'étape", "etapes")
+        self.combo_formulation.addItem("Indice de poste", "indice")
+        form_layout.addWidget(self.combo_formulation)
+        form_layout.addStretch()
+        solver_layout.addLayout(form_layout)
+        
+        self.check_symetrie = QCheckBox("Coupes de symétrie et de borne inférieure")
+        self.check_symetrie.setChecked(True)
+        solver_layout.addWidget(self.check_symetrie)
+        
+        # Démarrage à chaud
+        self.check_warm_start = QCheckBox("Démarrer le PLNE depuis la solution heuristique")
+        self.check_warm_start.setChecked(True)
+        solver_layout.addWidget(self.check_warm_start)
+        
         # Temps limite
         time_layout = QHBoxLayout()
         time_layout.addWidget(QLabel("Temps limite d'optimisation (s):"))
@@ -199,6 +324,44 @@ class MainWindow(QMainWindow):
         solver_group.setLayout(solver_layout)
         layout.addWidget(solver_group)
         
+        # Front de Pareto
+        pareto_group = QGroupBox("Front de Pareto (epsilon-contrainte)")
+        pareto_layout = QHBoxLayout()
+        pareto_layout.addWidget(QLabel("Valeurs d'epsilon par critère:"))
+        self.spin_pareto_points = QSpinBox()
+        self.spin_pareto_points.setRange(2, 10)
+        self.spin_pareto_points.setValue(4)
+        pareto_layout.addWidget(self.spin_pareto_points)
+        self.btn_pareto = QPushButton("Calculer le front de Pareto")
+        self.btn_pareto.clicked.connect(self.run_pareto)
+        self.btn_pareto.setEnabled(False)
+        pareto_layout.addWidget(self.btn_pareto)
+        pareto_layout.addStretch()
+        pareto_group.setLayout(pareto_layout)
+        layout.addWidget(pareto_group)
+        
+        # Balayage du nombre de postes
+        sweep_group = QGroupBox("Balayage du nombre de postes")
+        sweep_layout = QHBoxLayout()
+        sweep_layout.addWidget(QLabel("De"))
+        self.spin_sweep_min = QSpinBox()
+        self.spin_sweep_min.setRange(1, 20)
+        self.spin_sweep_min.setValue(2)
+        sweep_layout.addWidget(self.spin_sweep_min)
+        sweep_layout.addWidget(QLabel("à"))
+        self.spin_sweep_max = QSpinBox()
+        self.spin_sweep_max.setRange(1, 20)
+        self.spin_sweep_max.setValue(10)
+        sweep_layout.addWidget(self.spin_sweep_max)
+        sweep_layout.addWidget(QLabel("postes"))
+        self.btn_sweep = QPushButton("Tracer la courbe")
+        self.btn_sweep.clicked.connect(self.run_sweep)
+        self.btn_sweep.setEnabled(False)
+        sweep_layout.addWidget(self.btn_sweep)
+        sweep_layout.addStretch()
+        sweep_group.setLayout(sweep_layout)
+        layout.addWidget(sweep_group)
+        
         layout.addStretch()
         return widget
     
@@ -229,10 +392,28 @@ class MainWindow(QMainWindow):
         affectation_group.setLayout(affectation_layout)
         layout.addWidget(affectation_group)
         
+        # Front de Pareto
+        self.pareto_group = QGroupBox("Front de Pareto (cliquer sur un point pour l'afficher)")
+        pareto_layout = QVBoxLayout()
+        self.pareto_table = QTableWidget()
+        self.pareto_table.setColumnCount(4)
+        self.pareto_table.setHorizontalHeaderLabels(
+            ["Temps de cycle (s)", "Déséquilibre (s)", "Pénibilité max", "Efficacité (%)"]
+        )
+        self.pareto_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.pareto_table.itemSelectionChanged.connect(self.on_pareto_selected)
+        self.pareto_table.setMaximumHeight(150)
+        pareto_layout.addWidget(self.pareto_table)
+        self.pareto_group.setLayout(pareto_layout)
+        self.pareto_group.setVisible(False)
+        layout.addWidget(self.pareto_group)
+        
         # Visualisation
         viz_group = QGroupBox("Visualisation Graphique")
         viz_layout = QVBoxLayout()
         self.viz_canvas = SolutionVisualizer()
+        # Zoom sur le Gantt: les étiquettes suivent le niveau de détail
+        viz_layout.addWidget(NavigationToolbar(self.viz_canvas, widget))
         viz_layout.addWidget(self.viz_canvas)
         viz_group.setLayout(viz_layout)
         layout.addWidget(viz_group)
@@ -250,14 +431,39 @@ class MainWindow(QMainWindow):
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     self.data = json.load(f)
+                # Identifiants, prérequis et absence de cycle vérifiés au chargement
+                LineInstance.compiler(self.data['taches'], self.data.get('modeles_mixtes'))
+                # Nouveau scénario: le modèle précédent n'est plus réutilisable
+                self.optimizer = None
+                self.solution = None
                 
                 self.display_scenario_data()
                 self.btn_solve.setEnabled(True)
+                self.btn_pareto.setEnabled(True)
+                self.btn_sweep.setEnabled(True)
                 self.statusBar().showMessage(f"Scénario chargé: {file_path}")
-                
+            
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur de chargement: {str(e)}")
     
+    def _reutiliser_modele(self, data):
+        """
+        Le PLNE précédent (même formulation, mêmes coupes) peut-il être mis à
+        jour avec les données modifiées au lieu d'être reconstruit ?
+        """
+        optimiseur = self.optimizer
+        if not isinstance(optimiseur, AssemblyLineOptimizer) or optimiseur.model is None:
+            return False
+        if (optimiseur.formulation != self.combo_formulation.currentData()
+                or optimiseur.coupes_symetrie != self.check_symetrie.isChecked()):
+            return False
+        try:
+            return optimiseur.update_data(data)
+        except Exception as e:
+            # Modèle peut-être modifié en partie: reconstruit par l'appelant
+            print(f"Mise à jour du modèle impossible, reconstruction: {e}")
+            return False
+    
     def display_scenario_data(self):
         """Affiche les données du scénario chargé"""
         # Info
@@ -270,10 +476,13 @@ class MainWindow(QMainWindow):
         
         # Tableau des tâches
         taches = self.data['taches']
+        self.tasks_table.blockSignals(True)
         self.tasks_table.setRowCount(len(taches))
         
         for i, tache in enumerate(taches):
-            self.tasks_table.setItem(i, 0, QTableWidgetItem(str(tache['id'])))
+            identifiant = QTableWidgetItem(str(tache['id']))
+            identifiant.setFlags(identifiant.flags() & ~Qt.ItemIsEditable)
+            self.tasks_table.setItem(i, 0, identifiant)
             self.tasks_table.setItem(i, 1, QTableWidgetItem(tache['nom']))
             self.tasks_table.setItem(i, 2, QTableWidgetItem(str(tache['duree'])))
             
@@ -283,8 +492,47 @@ class MainWindow(QMainWindow):
             penibilite = str(tache.get('penibilite', 0))
             self.tasks_table.setItem(i, 4, QTableWidgetItem(penibilite))
         
+        self.tasks_table.blockSignals(False)
         self.tasks_table.resizeColumnsToContents()
     
+    def on_task_edited(self, item):
+        """
+        Reporte la modification d'une cellule du tableau des tâches dans le
+        scénario. La liste des tâches est remplacée (et non modifiée sur place)
+        pour que l'optimiseur garde l'ancienne version et puisse mettre son
+        modèle à jour par différence.
+        """
+        ligne, colonne = item.row(), item.column()
+        taches = [dict(t) for t in self.data['taches']]
+        tache = taches[ligne]
+        texte = item.text().strip()
+        try:
+            if colonne == 1:
+                tache['nom'] = texte
+            elif colonne == 2:
+                tache['duree'] = self._nombre(texte)
+            elif colonne == 3:
+                tache['prerequis'] = ([] if texte in ("", "-") else
+                                      [int(p) for p in texte.replace(';', ',').split(',') if p.strip()])
+            elif colonne == 4:
+                tache['penibilite'] = self._nombre(texte)
+            if colonne in (2, 4) and tache['duree' if colonne == 2 else 'penibilite'] < 0:
+                raise ValueError("valeur négative")
+            LineInstance.compiler(taches, self.data.get('modeles_mixtes'))
+        except ValueError as e:
+            QMessageBox.warning(self, "Attention", f"Modification refusée: {e}")
+            self.display_scenario_data()
+            return
+        
+        self.data['taches'] = taches
+        self.statusBar().showMessage(f"Tâche {tache['id']} modifiée")
+    
+    @staticmethod
+    def _nombre(texte):
+        """Durée ou pénibilité saisie: entier si possible"""
+        valeur = float(texte.replace(',', '.'))
+        return int(valeur) if valeur.is_integer() else valeur
+    
     def run_optimization(self):
         """Lance l'optimisation dans un thread séparé"""
         if not self.data:
@@ -302,17 +550,70 @@ class MainWindow(QMainWindow):
         self.progress_bar.setRange(0, 0)  # Mode indéterminé
         self.statusBar().showMessage("Optimisation en cours...")
         
-        # Créer l'optimiseur
-        self.optimizer = AssemblyLineOptimizer(self.data)
+        # Créer l'optimiseur (copie du scénario: les modifications suivantes du
+        # tableau ne touchent pas les données de l'optimiseur)
+        data = dict(self.data)
+        heuristique = None
+        depart = None
+        if self.combo_methode.currentData() == "heuristique":
+            self.optimizer = HeuristicLineBalancer(data)
+        elif self.combo_methode.currentData() == "salbp2":
+            self.optimizer = ExactSALBP2Solver(data)
+        elif self._reutiliser_modele(data):
+            # Modèle mis à jour sur place: la solution précédente, réparée,
+            # sert de point de départ
+            if self.solution and self.check_warm_start.isChecked():
+                depart = self.optimizer.repair_solution(self.solution)
+            self.statusBar().showMessage("Optimisation en cours (modèle mis à jour)...")
+        else:
+            self.optimizer = AssemblyLineOptimizer(data,
+                                                   self.combo_formulation.currentData(),
+                                                   self.check_symetrie.isChecked())
+            if self.check_warm_start.isChecked():
+                heuristique = HeuristicLineBalancer(data)
         
         # Lancer dans un thread
-        self.opt_thread = OptimizationThread(self.optimizer, self.spin_time.value())
+        self.opt_thread = OptimizationThread(self.optimizer, self.spin_time.value(),
+                                             heuristique, depart)
         self.opt_thread.finished.connect(self.on_optimization_finished)
         self.opt_thread.error.connect(self.on_optimization_error)
+        self.opt_thread.incumbent.connect(self.on_incumbent)
+        self.btn_stop.setEnabled(isinstance(self.optimizer, AssemblyLineOptimizer))
         self.opt_thread.start()
     
+    def stop_optimization(self):
+        """Arrête le PLNE en cours et garde la meilleure affectation trouvée"""
+        if self.opt_thread is not None and self.opt_thread.isRunning():
+            self.btn_stop.setEnabled(False)
+            self.statusBar().showMessage("Arrêt demandé...")
+            self.opt_thread.stop()
+    
+    def on_incumbent(self, solution):
+        """Nouvelle solution courante: affichage différé (voir flush_incumbent)"""
+        self.incumbent_pending = solution
+        if not self.redraw_timer.isActive():
+            self.redraw_timer.start()
+    
+    def flush_incumbent(self):
+        """Affiche la dernière solution courante reçue"""
+        solution, self.incumbent_pending = self.incumbent_pending, None
+        if solution is None or not (self.opt_thread and self.opt_thread.isRunning()):
+            return
+        self.solution = solution
+        self.display_solution(solution)
+        self.btn_export.setEnabled(True)
+        if 'borne' in solution:
+            self.statusBar().showMessage(
+                f"Optimisation en cours... temps de cycle {solution['temps_cycle']:.1f}s, "
+                f"borne {solution['borne']:.4g}, gap {solution['gap'] * 100:.2f}%")
+        else:
+            self.statusBar().showMessage(
+                f"Optimisation en cours... départ heuristique {solution['temps_cycle']:.1f}s")
+    
     def on_optimization_finished(self, solution):
         """Callback quand l'optimisation est terminée"""
+        self.redraw_timer.stop()
+        self.incumbent_pending = None
         self.solution = solution
         self.display_solution(solution)
         
@@ -320,8 +621,12 @@ class MainWindow(QMainWindow):
         self.btn_solve.setEnabled(True)
         self.btn_load.setEnabled(True)
         self.btn_export.setEnabled(True)
+        self.btn_stop.setEnabled(False)
         self.progress_bar.setVisible(False)
-        self.statusBar().showMessage("Optimisation terminée avec succès ✓")
+        if solution.get('interrompu'):
+            self.statusBar().showMessage("Optimisation arrêtée: meilleure solution conservée")
+        else:
+            self.statusBar().showMessage("Optimisation terminée avec succès ✓")
         
         QMessageBox.information(self, "Succès", 
                                f"Optimisation terminée!\n"
@@ -330,6 +635,9 @@ class MainWindow(QMainWindow):
     
     def on_optimization_error(self, error_msg):
         """Callback en cas d'erreur"""
+        self.redraw_timer.stop()
+        self.incumbent_pending = None
+        self.btn_stop.setEnabled(False)
         self.btn_solve.setEnabled(True)
         self.btn_load.setEnabled(True)
         self.progress_bar.setVisible(False)
@@ -337,6 +645,110 @@ class MainWindow(QMainWindow):
         
         QMessageBox.critical(self, "Erreur", error_msg)
     
+    def run_pareto(self):
+        """Lance le calcul du front de Pareto dans un thread séparé"""
+        if not self.data:
+            QMessageBox.warning(self, "Attention", "Veuillez d'abord charger un scénario")
+            return
+        
+        self.data['nombre_postes'] = self.spin_postes.value()
+        self.data['temps_cycle_max'] = self.spin_cycle.value()
+        
+        self.btn_solve.setEnabled(False)
+        self.btn_pareto.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.statusBar().showMessage("Calcul du front de Pareto...")
+        
+        # Les points déjà résolus pour ce scénario sont repris du cache
+        explorer = ParetoFrontExplorer(self.data, time_limit=self.spin_time.value())
+        self.pareto_thread = ParetoThread(explorer, self.spin_pareto_points.value())
+        self.pareto_thread.finished.connect(self.on_pareto_finished)
+        self.pareto_thread.error.connect(self.on_pareto_error)
+        self.pareto_thread.start()
+    
+    def on_pareto_finished(self, front):
+        """Affiche les points non dominés"""
+        self.pareto_front = front
+        self.pareto_table.setRowCount(len(front))
+        for row, solution in enumerate(front):
+            valeurs = [f"{solution['temps_cycle']:.1f}", f"{solution['desequilibre']:.1f}",
+                       f"{solution['penibilite_max']:g}", f"{solution['efficacite']:.1f}"]
+            for col, valeur in enumerate(valeurs):
+                self.pareto_table.setItem(row, col, QTableWidgetItem(valeur))
+        self.pareto_table.resizeColumnsToContents()
+        self.pareto_group.setVisible(True)
+        self.pareto_table.selectRow(0)
+        
+        self.btn_solve.setEnabled(True)
+        self.btn_pareto.setEnabled(True)
+        self.btn_export.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.statusBar().showMessage(f"Front de Pareto: {len(front)} points non dominés")
+    
+    def on_pareto_error(self, error_msg):
+        """Callback en cas d'erreur du front de Pareto"""
+        self.btn_solve.setEnabled(True)
+        self.btn_pareto.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.statusBar().showMessage("Erreur du front de Pareto")
+        
+        QMessageBox.critical(self, "Erreur", error_msg)
+    
+    def on_pareto_selected(self):
+        """Affiche la solution du point de Pareto sélectionné"""
+        rows = self.pareto_table.selectionModel().selectedRows()
+        if rows and rows[0].row() < len(self.pareto_front):
+            self.solution = self.pareto_front[rows[0].row()]
+            self.display_solution(self.solution)
+    
+    def run_sweep(self):
+        """Lance le balayage du nombre de postes dans un thread séparé"""
+        if not self.data:
+            QMessageBox.warning(self, "Attention", "Veuillez d'abord charger un scénario")
+            return
+        m_min, m_max = self.spin_sweep_min.value(), self.spin_sweep_max.value()
+        if m_min > m_max:
+            QMessageBox.warning(self, "Attention", "Intervalle de postes invalide")
+            return
+        
+        self.data['temps_cycle_max'] = self.spin_cycle.value()
+        
+        self.btn_solve.setEnabled(False)
+        self.btn_sweep.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.statusBar().showMessage("Balayage du nombre de postes...")
+        
+        sweep = StationSweep(self.data, time_limit=self.spin_time.value())
+        self.sweep_thread = SweepThread(sweep, m_min, m_max)
+        self.sweep_thread.finished.connect(self.on_sweep_finished)
+        self.sweep_thread.error.connect(self.on_sweep_error)
+        self.sweep_thread.start()
+    
+    def on_sweep_finished(self, courbe):
+        """Affiche la courbe temps de cycle / nombre de postes"""
+        lignes = [f"{'Postes':>6}  {'Temps de cycle':>14}  {'Borne inf.':>10}  Statut"]
+        for p in courbe:
+            cycle = f"{p['temps_cycle']:.1f}" if p['temps_cycle'] is not None else "-"
+            lignes.append(f"{p['n_postes']:>6}  {cycle:>14}  {p['borne_inferieure']:>10.1f}  {p['statut']}")
+        self.stats_text.setPlainText("\n".join(lignes))
+        self.viz_canvas.plot_sweep(courbe, self.data.get('temps_cycle_max'))
+        
+        self.btn_solve.setEnabled(True)
+        self.btn_sweep.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.statusBar().showMessage("Balayage terminé ✓")
+    
+    def on_sweep_error(self, error_msg):
+        """Callback en cas d'erreur du balayage"""
+        self.btn_solve.setEnabled(True)
+        self.btn_sweep.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.statusBar().showMessage("Erreur du balayage")
+        
+        QMessageBox.critical(self, "Erreur", error_msg)
+    
     def display_solution(self, solution):
         """Affiche la solution obtenue"""
         # Statistiques
@@ -350,8 +762,25 @@ Efficacité de la ligne: {solution['efficacite']:.2f} %
 Valeur objectif: {solution['objectif']:.4f}
 Gap d'optimalité: {solution['gap']*100:.2f} %
 Temps de résolution: {solution['temps_resolution']:.2f} secondes
+Temps de construction du modèle: {solution.get('temps_construction', 0):.3f} secondes
 Nombre de postes: {solution['n_postes']}
+Méthode: {solution.get('methode', 'PLNE Gurobi (' + solution.get('formulation', '') + ')')}
         """
+        if 'charges_variantes' in solution:
+            stats += f"\nMulti-modèles: temps de cycle pire variante {solution['temps_cycle_pire']:.2f} s\n"
+            for variante, charges_v in solution['charges_variantes'].items():
+                stats += f"  {variante}: charge max {max(charges_v.values()):.1f} s\n"
+        if 'stochastique' in solution:
+            sto = solution['stochastique']
+            # Pas de quantile modèle pour les affectations sur durées nominales
+            modele = (f" (modèle: {sto['cycle_quantile_modele']:.2f} s)"
+                      if 'cycle_quantile_modele' in sto else " (durées nominales)")
+            stats += (f"\nDurées aléatoires ({len(sto['cycles'])} scénarios hors échantillon):\n"
+                      f"  Temps de cycle au quantile {sto['quantile']:.0%}: {sto['cycle_quantile']:.2f} s"
+                      f"{modele}\n"
+                      f"  Temps de cycle moyen: {sto['cycle_moyen']:.2f} s, maximal: {sto['cycle_max']:.2f} s\n"
+                      f"  Probabilité de dépasser le temps de cycle max: "
+                      f"{sto.get('probabilite_depassement', 0):.1%}\n")
         self.stats_text.setPlainText(stats)
         
         # Tableau d'affectation
@@ -367,7 +796,7 @@ Nombre de postes: {solution['n_postes']}
                 QTableWidgetItem(f"Poste {poste}"))
             
             # Tâches
-            taches_str = "\n".join([f"• {t['nom']} ({t['duree']}s)" 
+            taches_str = "\n".join([f"• {t['nom']} ({t['duree']:g}s)" 
                                    for t in taches])
             self.affectation_table.setItem(idx, 1, 
                 QTableWidgetItem(taches_str))
@@ -410,7 +839,7 @@ Nombre de postes: {solution['n_postes']}
                 
                 QMessageBox.information(self, "Succès", 
                                        f"Solution exportée vers:\n{file_path}")
-                
+            
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", 
                                     f"Erreur d'export: {str(e)}")
@@ -6,17 +6,35 @@ import matplotlib
 matplotlib.use('Qt5Agg')
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 class SolutionVisualizer(FigureCanvas):
-    """Canvas Matplotlib intégré dans PyQt5 pour visualiser la solution"""
+    """
+    Canvas Matplotlib intégré dans PyQt5 pour visualiser la solution
+    
+    Les artistes (barres de charge, collection unique du Gantt, étiquettes)
+    sont créés une fois puis mis à jour sur place pour chaque nouvelle
+    solution; la figure n'est reconstruite que si les postes changent.
+    """
+    
+    # Niveaux de détail des étiquettes du Gantt: largeur d'une tâche à l'écran
+    # (pixels) à partir de laquelle afficher le nom et la durée, puis la durée
+    LARGEUR_NOM = 70
+    LARGEUR_DUREE = 22
+    # Largeur minimale d'une barre de charge pour l'annoter
+    LARGEUR_CHARGE = 30
+    MAX_ETIQUETTES = 300
     
     def __init__(self, parent=None, width=12, height=6, dpi=100):
         self.fig = Figure(figsize=(width, height), dpi=dpi)
         super().__init__(self.fig)
         self.setParent(parent)
-        
+        self._vue = None
+        self.mpl_connect('resize_event', lambda event: self._update_labels())
+    
     def plot_solution(self, solution):
         """
         Visualise la solution d'équilibrage
@@ -24,101 +42,231 @@ class SolutionVisualizer(FigureCanvas):
         Args:
             solution: dictionnaire contenant la solution
         """
-        self.fig.clear()
-        
-        # Créer 2 subplots
-        ax1 = self.fig.add_subplot(121)
-        ax2 = self.fig.add_subplot(122)
+        postes = sorted(solution['charges'])
+        stochastique = 'stochastique' in solution
+        nouvelle = (self._vue is None or self._vue['postes'] != postes
+                    or self._vue['stochastique'] != stochastique)
+        if nouvelle:
+            self._build_solution_view(postes, stochastique)
         
         # Graphique 1: Charge par poste
-        self._plot_workload(ax1, solution)
+        self._plot_workload(solution)
         
         # Graphique 2: Diagramme de Gantt
-        self._plot_gantt(ax2, solution)
+        self._plot_gantt(solution)
         
-        self.fig.tight_layout()
-        self.draw()
+        # Graphique 3: distribution hors échantillon du temps de cycle
+        if stochastique:
+            self._plot_distribution(solution)
+        
+        if nouvelle:
+            self.fig.tight_layout()
+        self._update_labels()
+        self.draw_idle()
     
-    def _plot_workload(self, ax, solution):
+    def _build_solution_view(self, postes, stochastique=False):
+        """Crée les axes et les artistes réutilisés d'une solution à l'autre"""
+        self.fig.clear()
+        
+        # Créer 2 subplots (3 avec la distribution des durées aléatoires)
+        colonnes = 3 if stochastique else 2
+        ax1 = self.fig.add_subplot(1, colonnes, 1)
+        ax2 = self.fig.add_subplot(1, colonnes, 2)
+        ax3 = self.fig.add_subplot(1, colonnes, 3) if stochastique else None
+        
+        # Barres de charge et ligne de temps de cycle
+        barres = ax1.bar(postes, [0] * len(postes), color='#2196F3', alpha=0.7)
+        ligne = ax1.axhline(y=0, color='red', linestyle='--', linewidth=2)
+        legende = ax1.legend([barres, ligne], ['Charge', 'Temps de cycle'])
+        ax1.set_xlabel('Poste de Travail', fontsize=12, fontweight='bold')
+        ax1.set_ylabel('Temps (secondes)', fontsize=12, fontweight='bold')
+        ax1.set_title('Charge de Travail par Poste', fontsize=14, fontweight='bold')
+        ax1.grid(axis='y', alpha=0.3)
+        # Au plus une quinzaine de graduations lisibles
+        pas = -(-len(postes) // 15)
+        ax1.set_xticks(postes[::pas])
+        ax1.set_xticklabels([f'P{p}' for p in postes[::pas]])
+        etiquettes_charge = [ax1.text(p, 0, '', ha='center', va='bottom', fontsize=9)
+                             for p in postes]
+        
+        # Diagramme de Gantt: une seule collection de rectangles
+        blocs = PolyCollection([], edgecolors='black', linewidths=1, alpha=0.8)
+        ax2.add_collection(blocs)
+        ax2.set_xlabel('Temps (secondes)', fontsize=12, fontweight='bold')
+        ax2.set_title('Diagramme de Gantt - Affectation des Tâches', 
+                     fontsize=14, fontweight='bold')
+        ax2.grid(axis='x', alpha=0.3)
+        # Zoom ou déplacement: niveau de détail des étiquettes recalculé
+        ax2.callbacks.connect('xlim_changed', lambda ax: self._update_labels())
+        
+        self._vue = {
+            'postes': postes,
+            'stochastique': stochastique,
+            'axes': (ax1, ax2),
+            'distribution': ax3,
+            'barres': barres,
+            'ligne': ligne,
+            'legende': legende,
+            'etiquettes_charge': etiquettes_charge,
+            'blocs': blocs,
+            'segments': [],
+            'etiquettes': [],
+            'solution': None
+        }
+    
+    def _plot_workload(self, solution):
         """Graphique en barres de la charge par poste"""
+        vue = self._vue
+        ax = vue['axes'][0]
         charges = solution['charges']
         temps_cycle = solution['temps_cycle']
         
-        postes = list(charges.keys())
-        charges_values = list(charges.values())
-        
-        # Barres de charge
-        bars = ax.bar(postes, charges_values, color='#2196F3', alpha=0.7, 
-                     label='Charge')
+        for barre, poste in zip(vue['barres'], vue['postes']):
+            barre.set_height(charges[poste])
         
         # Ligne de temps de cycle
-        ax.axhline(y=temps_cycle, color='red', linestyle='--', 
-                  linewidth=2, label=f'Temps de cycle ({temps_cycle:.1f}s)')
-        
-        # Style
-        ax.set_xlabel('Poste de Travail', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Temps (secondes)', fontsize=12, fontweight='bold')
-        ax.set_title('Charge de Travail par Poste', fontsize=14, fontweight='bold')
-        ax.legend()
-        ax.grid(axis='y', alpha=0.3)
-        
-        # Ajouter les valeurs sur les barres
-        for bar, charge in zip(bars, charges_values):
-            height = bar.get_height()
-            utilisation = (charge / temps_cycle) * 100
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{charge:.1f}s\n({utilisation:.0f}%)',
-                   ha='center', va='bottom', fontsize=9)
+        vue['ligne'].set_ydata([temps_cycle, temps_cycle])
+        vue['legende'].get_texts()[1].set_text(f'Temps de cycle ({temps_cycle:.1f}s)')
         
         # Ajuster les limites
         ax.set_ylim(0, temps_cycle * 1.2)
-        ax.set_xticks(postes)
-        ax.set_xticklabels([f'P{p}' for p in postes])
+        vue['solution'] = solution
     
-    def _plot_gantt(self, ax, solution):
-        """Diagramme de Gantt des affectations"""
-        affectations = solution['affectations']
-        
-        colors = plt.cm.Set3(range(len(affectations)))
+    def _plot_gantt(self, solution):
+        """Diagramme de Gantt des affectations (rectangles d'une seule collection)"""
+        vue = self._vue
+        ax = vue['axes'][1]
+        cmap = plt.cm.Set3
         
-        y_pos = 0
-        y_labels = []
-        
-        for poste, taches in sorted(affectations.items()):
-            if not taches:
-                continue
-            
-            y_labels.append(f'Poste {poste}')
-            
+        lignes = [(poste, taches) for poste, taches in sorted(solution['affectations'].items())
+                  if taches]
+        rectangles, couleurs, segments = [], [], []
+        for y_pos, (poste, taches) in enumerate(lignes):
             # Position de départ pour ce poste
             start = 0
-            
             for tache in taches:
                 duree = tache['duree']
-                
-                # Dessiner la tâche
-                ax.barh(y_pos, duree, left=start, height=0.6, 
-                       color=colors[poste-1], alpha=0.8,
-                       edgecolor='black', linewidth=1)
-                
-                # Ajouter le texte (nom de la tâche)
-                ax.text(start + duree/2, y_pos, 
-                       f"{tache['nom']}\n{duree}s",
-                       ha='center', va='center', fontsize=8,
-                       fontweight='bold')
-                
+                rectangles.append([(start, y_pos - 0.3), (start, y_pos + 0.3),
+                                   (start + duree, y_pos + 0.3), (start + duree, y_pos - 0.3)])
+                couleurs.append(cmap((poste - 1) % cmap.N))
+                segments.append((start, duree, y_pos, tache['nom']))
                 start += duree
-            
-            y_pos += 1
-        
-        # Style
-        ax.set_xlabel('Temps (secondes)', fontsize=12, fontweight='bold')
-        ax.set_title('Diagramme de Gantt - Affectation des Tâches', 
-                    fontsize=14, fontweight='bold')
-        ax.set_yticks(range(len(y_labels)))
-        ax.set_yticklabels(y_labels)
-        ax.grid(axis='x', alpha=0.3)
+        
+        vue['blocs'].set_verts(np.array(rectangles).reshape(-1, 4, 2))
+        vue['blocs'].set_facecolor(couleurs)
+        vue['segments'] = segments
+        
+        ax.set_yticks(range(len(lignes)))
+        ax.set_yticklabels([f'Poste {poste}' for poste, _ in lignes])
+        # Poste 1 en haut
+        ax.set_ylim(len(lignes) - 0.5, -0.5)
         ax.set_xlim(0, solution['temps_cycle'] * 1.1)
+    
+    def _plot_distribution(self, solution):
+        """Histogramme des temps de cycle simulés hors échantillon"""
+        ax = self._vue['distribution']
+        stats = solution['stochastique']
+        ax.cla()
+        ax.hist(stats['cycles'], bins=50, color='#2196F3', alpha=0.7)
+        ax.axvline(stats['cycle_quantile'], color='red', linestyle='--', linewidth=2,
+                   label=f"Quantile {stats['quantile']:.0%} ({stats['cycle_quantile']:.1f}s)")
+        ax.axvline(stats['cycle_moyen'], color='black', linestyle=':', linewidth=1.5,
+                   label=f"Moyenne ({stats['cycle_moyen']:.1f}s)")
+        ax.axvline(solution['temps_cycle'], color='gray', linewidth=1.5,
+                   label=f"Durées nominales ({solution['temps_cycle']:.1f}s)")
+        ax.set_xlabel('Temps de cycle (secondes)', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Scénarios', fontsize=12, fontweight='bold')
+        ax.set_title('Temps de Cycle Hors Échantillon', fontsize=12, fontweight='bold')
+        ax.legend(fontsize=8)
+        ax.grid(axis='y', alpha=0.3)
+    
+    def _update_labels(self):
+        """
+        Étiquettes selon le niveau de détail: seules les tâches visibles assez
+        larges à l'écran sont annotées (nom et durée, ou durée seule); les
+        objets texte sont réutilisés
+        """
+        vue = self._vue
+        if vue is None or vue['solution'] is None:
+            return
+        ax1, ax2 = vue['axes']
+        
+        x0, x1 = ax2.get_xlim()
+        echelle = ax2.bbox.width / (x1 - x0) if x1 > x0 else 0.0
+        visibles = []
+        for start, duree, y_pos, nom in vue['segments']:
+            if start + duree < x0 or start > x1:
+                continue
+            largeur = duree * echelle
+            if largeur >= self.LARGEUR_NOM:
+                # Nom tronqué à la largeur de la barre (~7 pixels par caractère)
+                longueur = int(largeur / 7)
+                texte = nom if len(nom) <= longueur else nom[:max(longueur - 1, 1)] + '…'
+                visibles.append((start + duree / 2, y_pos, f"{texte}\n{duree:g}s"))
+            elif largeur >= self.LARGEUR_DUREE:
+                visibles.append((start + duree / 2, y_pos, f"{duree:g}"))
+            if len(visibles) >= self.MAX_ETIQUETTES:
+                break
+        
+        etiquettes = vue['etiquettes']
+        while len(etiquettes) < len(visibles):
+            etiquettes.append(ax2.text(0, 0, '', ha='center', va='center', fontsize=8,
+                                       fontweight='bold', clip_on=True))
+        for texte, (x, y, contenu) in zip(etiquettes, visibles):
+            texte.set_position((x, y))
+            texte.set_text(contenu)
+            texte.set_visible(True)
+        for texte in etiquettes[len(visibles):]:
+            texte.set_visible(False)
+        
+        # Valeurs sur les barres de charge, si elles sont assez larges
+        solution = vue['solution']
+        temps_cycle = solution['temps_cycle']
+        largeur_barre = 0.8 * ax1.bbox.width / max(len(vue['postes']), 1)
+        afficher = largeur_barre >= self.LARGEUR_CHARGE
+        for texte, poste in zip(vue['etiquettes_charge'], vue['postes']):
+            charge = solution['charges'][poste]
+            texte.set_visible(afficher)
+            if afficher:
+                utilisation = (charge / temps_cycle) * 100 if temps_cycle > 0 else 0
+                texte.set_position((poste, charge))
+                texte.set_text(f'{charge:.1f}s\n({utilisation:.0f}%)')
+    
+    def plot_sweep(self, courbe, temps_cycle_max=None):
+        """
+        Courbe temps de cycle / nombre de postes d'un balayage
         
-        # Inverser l'axe Y pour avoir Poste 1 en haut
-        ax.invert_yaxis()
\ No newline at end of file
+        Args:
+            courbe: liste de points renvoyée par StationSweep.solve
+            temps_cycle_max: temps de cycle maximum autorisé (ligne horizontale)
+        """
+        self.fig.clear()
+        self._vue = None
+        ax = self.fig.add_subplot(111)
+        
+        resolus = [p for p in courbe if p['temps_cycle'] is not None]
+        postes = [p['n_postes'] for p in courbe]
+        
+        ax.plot([p['n_postes'] for p in resolus], [p['temps_cycle'] for p in resolus],
+                marker='o', color='#2196F3', linewidth=2, label='Temps de cycle')
+        ax.plot(postes, [p['borne_inferieure'] for p in courbe], linestyle=':',
+                color='gray', label='Borne inférieure')
+        if temps_cycle_max is not None:
+            ax.axhline(y=temps_cycle_max, color='red', linestyle='--',
+                      linewidth=2, label=f'Temps de cycle max ({temps_cycle_max}s)')
+        
+        # Nombres de postes élagués ou infaisables
+        for p in courbe:
+            if p['temps_cycle'] is None:
+                ax.annotate(p['statut'], (p['n_postes'], p['borne_inferieure']),
+                            ha='center', va='bottom', fontsize=8, color='gray')
+        
+        ax.set_xlabel('Nombre de postes', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Temps de cycle (secondes)', fontsize=12, fontweight='bold')
+        ax.set_title('Temps de Cycle selon le Nombre de Postes', fontsize=14, fontweight='bold')
+        ax.set_xticks(postes)
+        ax.legend()
+        ax.grid(alpha=0.3)
+        
+        self.fig.tight_layout()
+        self.draw()
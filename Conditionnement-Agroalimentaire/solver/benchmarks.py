@@ -0,0 +1,165 @@
+"""
+Instances de référence pour l'équilibrage de chaîne de montage
+Lecture/écriture du format .IN2 (jeux de Scholl) et générateur de lignes
+synthétiques à force d'ordre contrôlée
+"""
+
+import os
+import random
+
+from solver.instance import LineInstance
+
+
+def lire_in2(chemin, n_postes, temps_cycle_max=None, nom=None):
+    """
+    Lit une instance au format .IN2
+    
+    Format: nombre de tâches, puis une durée par ligne, puis les arcs de
+    précédence "i,j" (1-indexés) terminés par "-1,-1".
+    
+    Args:
+        chemin: fichier .IN2
+        n_postes: nombre de postes du scénario (absent du format)
+        temps_cycle_max: temps de cycle maximum (par défaut: durée totale)
+        nom: nom du scénario (par défaut: nom du fichier)
+    
+    Returns:
+        dict: scénario au format des fichiers JSON de data/
+    """
+    with open(chemin, 'r', encoding='utf-8') as f:
+        lignes = [l.strip() for l in f if l.strip()]
+    
+    n = int(lignes[0])
+    durees = [float(l) for l in lignes[1:n + 1]]
+    prerequis = [[] for _ in range(n)]
+    for ligne in lignes[n + 1:]:
+        i, j = (int(v) for v in ligne.replace(' ', '').split(','))
+        if i == -1 and j == -1:
+            break
+        if not (1 <= i <= n and 1 <= j <= n):
+            raise ValueError(f"Arc invalide dans {chemin}: {ligne}")
+        prerequis[j - 1].append(i)
+    
+    taches = [{
+        'id': k + 1,
+        'nom': f"Tâche {k + 1}",
+        'duree': int(d) if d.is_integer() else d,
+        'prerequis': prerequis[k]
+    } for k, d in enumerate(durees)]
+    
+    return {
+        'nom_scenario': nom or os.path.splitext(os.path.basename(chemin))[0],
+        'description': f"Instance {os.path.basename(chemin)} ({n} tâches)",
+        'taches': taches,
+        'nombre_postes': n_postes,
+        'temps_cycle_max': temps_cycle_max or sum(t['duree'] for t in taches)
+    }
+
+
+def ecrire_in2(data, chemin):
+    """
+    Écrit les durées et précédences d'un scénario au format .IN2
+    
+    Les identifiants de tâches sont renumérotés de 1 à n dans l'ordre du scénario.
+    """
+    index = {t['id']: k + 1 for k, t in enumerate(data['taches'])}
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.write(f"{len(data['taches'])}\n")
+        for t in data['taches']:
+            f.write(f"{t['duree']}\n")
+        for t in data['taches']:
+            for p in t['prerequis']:
+                f.write(f"{index[p]},{index[t['id']]}\n")
+        f.write("-1,-1\n")
+
+
+def force_ordre(data):
+    """
+    Force d'ordre (order strength): part des paires de tâches ordonnées par
+    la fermeture transitive du graphe de précédence
+    """
+    n = len(data['taches'])
+    if n < 2:
+        return 0.0
+    inst = LineInstance.compiler(data['taches'])
+    return inst.nombre_paires_ordonnees() / (n * (n - 1) / 2)
+
+
+def generer_ligne(n_taches, n_postes, force=0.5, graine=0, duree_min=5, duree_max=40,
+                  penibilite_max=5, marge_cycle=None):
+    """
+    Génère une ligne synthétique dont la force d'ordre atteint `force`
+    
+    Les arcs sont tirés au hasard entre une tâche et une tâche de rang
+    supérieur; les arcs déjà impliqués par la fermeture transitive sont
+    ignorés. La fermeture est tenue à jour par masques de bits (entiers),
+    ce qui permet des graphes de plusieurs milliers de tâches.
+    
+    Args:
+        n_taches: nombre de tâches
+        n_postes: nombre de postes du scénario
+        force: force d'ordre visée, entre 0 et 1
+        graine: graine du générateur aléatoire
+        duree_min, duree_max: intervalle des durées (entiers)
+        penibilite_max: pénibilité maximale d'une tâche (1 à penibilite_max)
+        marge_cycle: si fourni, temps_cycle_max = marge * durée totale / postes
+            (par défaut: durée totale, sans contrainte)
+    
+    Returns:
+        dict: scénario au format des fichiers JSON de data/
+    """
+    if not 0 <= force <= 1:
+        raise ValueError(f"Force d'ordre hors de [0, 1]: {force}")
+    rnd = random.Random(graine)
+    n = n_taches
+    cible = force * n * (n - 1) / 2
+    succ = [0] * n   # succ[i]: masque des successeurs transitifs de i
+    pred = [0] * n   # pred[i]: masque des prédécesseurs transitifs de i
+    paires = 0
+    prerequis = [[] for _ in range(n)]
+    
+    # Arc de i vers une tâche de rang supérieur proche (écart exponentiel):
+    # graphes en chaînes plutôt qu'en étoile
+    while paires < cible:
+        i = rnd.randrange(n - 1)
+        ecart = 1 + int(rnd.expovariate(3.0 / n))
+        j = min(n - 1, i + ecart)
+        if (succ[i] >> j) & 1:
+            continue
+        prerequis[j].append(i + 1)
+        
+        # Tous les prédécesseurs de i (et i) précèdent j et ses successeurs
+        amont = pred[i] | (1 << i)
+        aval = succ[j] | (1 << j)
+        k = amont
+        while k:
+            b = k & -k
+            a = b.bit_length() - 1
+            nouveaux = aval & ~succ[a]
+            succ[a] |= nouveaux
+            paires += bin(nouveaux).count('1')
+            k ^= b
+        k = aval
+        while k:
+            b = k & -k
+            a = b.bit_length() - 1
+            pred[a] |= amont
+            k ^= b
+    
+    taches = [{
+        'id': k + 1,
+        'nom': f"Tâche {k + 1}",
+        'duree': rnd.randint(duree_min, duree_max),
+        'prerequis': sorted(prerequis[k]),
+        'penibilite': rnd.randint(1, penibilite_max)
+    } for k in range(n)]
+    total = sum(t['duree'] for t in taches)
+    temps_cycle_max = total if marge_cycle is None else int(marge_cycle * total / n_postes)
+    
+    return {
+        'nom_scenario': f"Synthétique n={n} m={n_postes} OS={force:.2f} graine={graine}",
+        'description': "Ligne générée aléatoirement (benchmark)",
+        'taches': taches,
+        'nombre_postes': n_postes,
+        'temps_cycle_max': temps_cycle_max
+    }
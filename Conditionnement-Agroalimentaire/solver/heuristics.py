@@ -0,0 +1,449 @@
+"""
+Heuristiques pour l'équilibrage de chaîne de montage (SALBP-2)
+Sans licence Gurobi: poids positionnel (RPW), COMSOAL randomisé et recherche tabou
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from solver.instance import LineInstance
+from solver.stochastic import StochasticDurations
+
+
+def _comsoal_worker(args):
+    """
+    Exécute une série de COMSOAL dans un processus séparé
+    
+    Args:
+        args: (données du scénario, graine, nombre d'exécutions, essais par palier)
+    
+    Returns:
+        (temps de cycle, postes) de la meilleure exécution
+    """
+    data, graine, n_runs, essais = args
+    balancer = HeuristicLineBalancer(data)
+    return balancer._comsoal_serie(graine, n_runs, essais)
+
+
+class HeuristicLineBalancer:
+    """
+    Équilibrage heuristique de la ligne pour un nombre de postes fixé
+    
+    Renvoie une solution au même format que AssemblyLineOptimizer.solve
+    (affectations, charges, temps_cycle, ...), utilisable telle quelle dans
+    l'interface ou comme solution de départ du PLNE.
+    
+    Avec 'durees_stochastiques', l'équilibrage porte sur les durées
+    nominales; la distribution du temps de cycle de l'affectation obtenue
+    est jointe à la solution (clé 'stochastique').
+    """
+    
+    def __init__(self, data):
+        """
+        Initialise l'heuristique avec les données du problème
+        
+        Args:
+            data: dictionnaire contenant les tâches, postes, contraintes
+        """
+        self.data = data
+        self.taches = data['taches']
+        self.n_postes = data['nombre_postes']
+        self.temps_cycle_max = data.get('temps_cycle_max', 100)
+        self.instance = LineInstance.compiler(self.taches, data.get('modeles_mixtes'))
+        
+        inst = self.instance
+        self.durees = inst.durees.tolist()
+        self.penibilites = inst.penibilites.tolist()
+        self.preds = [inst.predecesseurs(k).tolist() for k in range(inst.n)]
+        self.succs = [inst.successeurs(k).tolist() for k in range(inst.n)]
+        self.entiers = all(float(d).is_integer() for d in self.durees)
+        
+        # Contraintes d'ergonomie (mêmes règles que le PLNE)
+        ergo = data.get('contraintes_ergonomie', {})
+        self.pen_max = ergo.get('penibilite_max_par_poste', math.inf)
+        self.incompatibles = [set() for _ in range(inst.n)]
+        for t1, t2 in ergo.get('taches_incompatibles', []):
+            k1, k2 = inst.index[t1], inst.index[t2]
+            self.incompatibles[k1].add(k2)
+            self.incompatibles[k2].add(k1)
+        
+        # Poids positionnel: durée propre + durées de tous les successeurs
+        self.poids_positionnel = inst.poids_positionnels.tolist()
+        
+        # Durées aléatoires: évaluation seulement, pas d'optimisation du quantile
+        self.stochastique = None
+        if 'durees_stochastiques' in data:
+            self.stochastique = StochasticDurations(self.taches, data['durees_stochastiques'])
+        self.solution = None
+    
+    def borne_inferieure(self):
+        """Borne inférieure simple du temps de cycle"""
+        return max(sum(self.durees) / self.n_postes, max(self.durees, default=0))
+    
+    def _charger(self, C, priorite=None, rng=None):
+        """
+        Chargement des postes un par un avec un temps de cycle C
+        
+        La tâche ajoutée est, parmi les tâches disponibles qui tiennent dans le
+        poste courant, celle de plus forte priorité (ou tirée au hasard si rng
+        est fourni).
+        
+        Returns:
+            liste des postes (listes d'indices de tâches) ou None si plus de
+            n_postes postes sont nécessaires
+        """
+        n = self.instance.n
+        restants = [len(p) for p in self.preds]
+        disponibles = [k for k in range(n) if restants[k] == 0]
+        postes = []
+        courant, charge, pen = [], 0.0, 0.0
+        limite = C + 1e-9
+        
+        for _ in range(n):
+            while True:
+                candidats = [
+                    k for k in disponibles
+                    if charge + self.durees[k] <= limite
+                    and pen + self.penibilites[k] <= self.pen_max
+                    and not self.incompatibles[k].intersection(courant)
+                ]
+                if candidats:
+                    break
+                if not courant or len(postes) + 1 >= self.n_postes:
+                    return None
+                postes.append(courant)
+                courant, charge, pen = [], 0.0, 0.0
+            
+            if rng is not None:
+                k = candidats[rng.integers(len(candidats))]
+            else:
+                k = max(candidats, key=lambda c: priorite[c])
+            
+            courant.append(k)
+            charge += self.durees[k]
+            pen += self.penibilites[k]
+            disponibles.remove(k)
+            for s in self.succs[k]:
+                restants[s] -= 1
+                if restants[s] == 0:
+                    disponibles.append(s)
+        
+        postes.append(courant)
+        return postes
+    
+    def _temps_cycle(self, postes):
+        """Charge maximale d'une liste de postes"""
+        return max((sum(self.durees[k] for k in p) for p in postes), default=0.0)
+    
+    def _bissection(self, essai, haut=None):
+        """
+        Plus petit temps de cycle accepté par la procédure de chargement `essai`
+        
+        Args:
+            essai: fonction C -> postes ou None
+            haut: temps de cycle déjà atteint (borne supérieure de départ)
+        
+        Returns:
+            (temps de cycle, postes) ou (None, None) si aucun chargement n'aboutit
+        """
+        bas = self.borne_inferieure()
+        if self.entiers:
+            bas = math.ceil(bas - 1e-9)
+        meilleur = None
+        
+        # Borne supérieure: premier chargement admissible
+        if haut is None:
+            haut = bas
+            total = sum(self.durees)
+            while meilleur is None:
+                meilleur = essai(haut)
+                if meilleur is None:
+                    if haut >= total:
+                        return None, None
+                    haut = min(total, 2 * haut)
+            haut = self._temps_cycle(meilleur)
+        
+        precision = 1 if self.entiers else 1e-3 * max(bas, 1)
+        while haut - bas > (precision - 1e-9 if self.entiers else precision):
+            milieu = (bas + haut) // 2 if self.entiers else (bas + haut) / 2
+            postes = essai(milieu)
+            if postes is None:
+                bas = milieu + 1 if self.entiers else milieu
+            else:
+                meilleur, haut = postes, self._temps_cycle(postes)
+        
+        if meilleur is None and self.entiers:
+            meilleur = essai(haut)
+        return (haut, meilleur) if meilleur is not None else (None, None)
+    
+    def rpw(self):
+        """
+        Heuristique du poids positionnel (Ranked Positional Weight)
+        
+        Returns:
+            (temps de cycle, postes)
+        """
+        return self._bissection(lambda C: self._charger(C, priorite=self.poids_positionnel))
+    
+    def _comsoal_serie(self, graine, n_runs, essais=5, haut=None):
+        """Série d'exécutions COMSOAL avec un générateur aléatoire dédié"""
+        rng = np.random.default_rng(graine)
+        
+        def essai(C):
+            for _ in range(essais):
+                postes = self._charger(C, rng=rng)
+                if postes is not None:
+                    return postes
+            return None
+        
+        meilleur_tc, meilleur = None, None
+        for _ in range(n_runs):
+            tc, postes = self._bissection(essai, haut)
+            if postes is not None and (meilleur_tc is None or tc < meilleur_tc):
+                meilleur_tc, meilleur = tc, postes
+                haut = tc
+        return meilleur_tc, meilleur
+    
+    def comsoal(self, n_runs=40, n_workers=1, graine=0, essais=5):
+        """
+        COMSOAL: chargements aléatoires répétés, répartis sur un pool de processus
+        
+        Args:
+            n_runs: nombre total d'exécutions
+            n_workers: nombre de processus (1 = dans le processus courant)
+            graine: graine du générateur aléatoire
+            essais: tirages aléatoires par temps de cycle testé
+        
+        Returns:
+            (temps de cycle, postes)
+        """
+        if n_workers <= 1:
+            return self._comsoal_serie(graine, n_runs, essais)
+        
+        parts = [n_runs // n_workers + (1 if w < n_runs % n_workers else 0)
+                 for w in range(n_workers)]
+        taches = [(self.data, graine + w, r, essais) for w, r in enumerate(parts) if r > 0]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            resultats = [r for r in executor.map(_comsoal_worker, taches) if r[1] is not None]
+        if not resultats:
+            return None, None
+        return min(resultats, key=lambda r: r[0])
+    
+    def _admissible(self, k, poste, station, contenu):
+        """Vérifie si la tâche k peut être placée au poste `poste`"""
+        if any(station[p] > poste for p in self.preds[k]):
+            return False
+        if any(station[s] < poste for s in self.succs[k]):
+            return False
+        return not self.incompatibles[k].intersection(contenu[poste])
+    
+    def tabu_search(self, postes, n_iter=200, tenure=7):
+        """
+        Amélioration par recherche tabou
+        
+        Voisinage: déplacement d'une tâche d'un poste critique (charge maximale)
+        vers un autre poste, ou échange avec une tâche d'un autre poste.
+        Critère lexicographique: charge maximale puis somme des carrés des charges.
+        
+        Args:
+            postes: solution de départ (liste de postes)
+            n_iter: nombre maximal d'itérations
+            tenure: durée d'interdiction d'un retour (tâche, poste)
+        
+        Returns:
+            (temps de cycle, postes) de la meilleure solution rencontrée
+        """
+        m = self.n_postes
+        d, pn = self.durees, self.penibilites
+        station = [0] * self.instance.n
+        contenu = [set() for _ in range(m)]
+        for j, p in enumerate(postes):
+            for k in p:
+                station[k] = j
+                contenu[j].add(k)
+        charges = [sum(d[k] for k in c) for c in contenu]
+        pens = [sum(pn[k] for k in c) for c in contenu]
+        
+        def cout(ch):
+            return (max(ch), sum(c * c for c in ch))
+        
+        courant = cout(charges)
+        meilleur, meilleure_station = courant, list(station)
+        tabou = {}
+        borne = self.borne_inferieure()
+        
+        for it in range(n_iter):
+            if meilleur[0] <= borne + 1e-9:
+                break
+            cmax = max(charges)
+            critiques = [j for j in range(m) if charges[j] >= cmax - 1e-9]
+            choix = None
+            
+            for j in critiques:
+                for k in contenu[j]:
+                    for t in range(m):
+                        if t == j:
+                            continue
+                        # Déplacement k: j -> t
+                        if pens[t] + pn[k] <= self.pen_max and self._admissible(k, t, station, contenu):
+                            ch = list(charges)
+                            ch[j] -= d[k]
+                            ch[t] += d[k]
+                            valeur = cout(ch)
+                            if (tabou.get((k, t), -1) < it or valeur < meilleur) and (choix is None or valeur < choix[0]):
+                                choix = (valeur, [(k, j, t)])
+                        
+                        # Échange k (j -> t) avec l (t -> j)
+                        for l in contenu[t]:
+                            if d[l] >= d[k]:
+                                continue
+                            if (pens[t] - pn[l] + pn[k] > self.pen_max
+                                    or pens[j] - pn[k] + pn[l] > self.pen_max):
+                                continue
+                            station[k], station[l] = t, j
+                            contenu[j].discard(k)
+                            contenu[t].discard(l)
+                            ok = (self._admissible(k, t, station, contenu)
+                                  and self._admissible(l, j, station, contenu))
+                            station[k], station[l] = j, t
+                            contenu[j].add(k)
+                            contenu[t].add(l)
+                            if not ok:
+                                continue
+                            ch = list(charges)
+                            ch[j] += d[l] - d[k]
+                            ch[t] += d[k] - d[l]
+                            valeur = cout(ch)
+                            interdit = tabou.get((k, t), -1) >= it or tabou.get((l, j), -1) >= it
+                            if (not interdit or valeur < meilleur) and (choix is None or valeur < choix[0]):
+                                choix = (valeur, [(k, j, t), (l, t, j)])
+            
+            if choix is None:
+                break
+            
+            valeur, mouvements = choix
+            for k, de, vers in mouvements:
+                station[k] = vers
+                contenu[de].discard(k)
+                contenu[vers].add(k)
+                charges[de] -= d[k]
+                charges[vers] += d[k]
+                pens[de] -= pn[k]
+                pens[vers] += pn[k]
+                tabou[(k, de)] = it + tenure
+            courant = valeur
+            if courant < meilleur:
+                meilleur, meilleure_station = courant, list(station)
+        
+        resultat = [[] for _ in range(m)]
+        for k in self.instance.ordre_topo:
+            resultat[meilleure_station[k]].append(int(k))
+        return meilleur[0], resultat
+    
+    def solve(self, n_runs=40, n_workers=1, n_iter_tabu=200, graine=0):
+        """
+        Enchaîne RPW, COMSOAL et recherche tabou
+        
+        Args:
+            n_runs: nombre d'exécutions COMSOAL (0 pour les désactiver)
+            n_workers: nombre de processus pour COMSOAL
+            n_iter_tabu: itérations de recherche tabou (0 pour la désactiver)
+            graine: graine du générateur aléatoire
+        
+        Returns:
+            dict: solution au format de AssemblyLineOptimizer.solve, ou None
+        """
+        debut = time.time()
+        try:
+            tc, postes = self.rpw()
+            methode = 'RPW'
+            if n_runs > 0:
+                tc_c, postes_c = self.comsoal(n_runs, n_workers, graine)
+                if postes_c is not None and (postes is None or tc_c < tc):
+                    tc, postes, methode = tc_c, postes_c, 'COMSOAL'
+            if postes is None:
+                print("Heuristique: aucune affectation admissible trouvée")
+                return None
+            if n_iter_tabu > 0:
+                tc_t, postes_t = self.tabu_search(postes, n_iter_tabu)
+                if tc_t < tc - 1e-9:
+                    methode += ' + tabou'
+                tc, postes = tc_t, postes_t
+        except Exception as e:
+            print(f"Erreur heuristique: {e}")
+            return None
+        
+        if tc > self.temps_cycle_max + 1e-9:
+            print(f"Heuristique: temps de cycle {tc} supérieur au maximum {self.temps_cycle_max}")
+            return None
+        
+        solution = self.solution_from_postes(postes, time.time() - debut)
+        solution['methode'] = methode + self.suffixe_methode()
+        self.solution = solution
+        return solution
+    
+    def evaluer_objectif(self, charges, pen_totale):
+        """Valeur de la fonction objectif du PLNE pour des charges données"""
+        temps_cycle = max(charges.values())
+        if 'objectifs_multiples' not in self.data:
+            return temps_cycle
+        obj = self.data['objectifs_multiples']
+        w1 = obj.get('poids_temps_cycle', 0.5)
+        w2 = obj.get('poids_equilibrage', 0.3)
+        w3 = obj.get('poids_ergonomie', 0.2)
+        temps_total = sum(self.durees)
+        charge_moyenne = temps_total / self.n_postes
+        ecarts = sum(abs(c - charge_moyenne) for c in charges.values())
+        return (w1 * temps_cycle / temps_total
+                + w2 * ecarts / (self.n_postes * temps_total)
+                + w3 * pen_totale / max(sum(self.penibilites), 1))
+    
+    def suffixe_methode(self):
+        """Précise que le temps de cycle optimisé est celui des durées nominales"""
+        return ' (durées nominales)' if self.stochastique is not None else ''
+    
+    def solution_from_postes(self, postes, temps_resolution=0.0):
+        """
+        Construit le dictionnaire de solution à partir d'une liste de postes
+        """
+        affectations = {}
+        charges = {}
+        for j in range(1, self.n_postes + 1):
+            taches_j = postes[j - 1] if j - 1 < len(postes) else []
+            affectations[j] = [{
+                'id': self.taches[k]['id'],
+                'nom': self.taches[k]['nom'],
+                'duree': self.taches[k]['duree'],
+                'penibilite': self.taches[k].get('penibilite', 0)
+            } for k in taches_j]
+            charges[j] = float(sum(self.durees[k] for k in taches_j))
+        
+        temps_cycle = max(charges.values())
+        borne = self.borne_inferieure()
+        charge_moyenne = sum(self.durees) / self.n_postes
+        solution = {
+            'affectations': affectations,
+            'temps_cycle': temps_cycle,
+            'charges': charges,
+            'objectif': self.evaluer_objectif(charges, sum(self.penibilites)),
+            'gap': (temps_cycle - borne) / temps_cycle if temps_cycle > 0 else 0,
+            'temps_resolution': temps_resolution,
+            'temps_construction': 0.0,
+            'n_postes': self.n_postes,
+            'desequilibre': sum(abs(c - charge_moyenne) for c in charges.values()),
+            'penibilite_max': max(sum(t['penibilite'] for t in taches)
+                                  for taches in affectations.values()),
+            'efficacite': (sum(charges.values()) / (self.n_postes * temps_cycle)) * 100 if temps_cycle > 0 else 0
+        }
+        
+        # Durées aléatoires: distribution hors échantillon du temps de cycle
+        if self.stochastique is not None:
+            poste_tache = np.empty(len(self.taches), dtype=int)
+            for j, taches_j in enumerate(postes, start=1):
+                poste_tache[taches_j] = j
+            solution['stochastique'] = self.stochastique.evaluer(poste_tache, self.n_postes,
+                                                                 self.temps_cycle_max)
+        return solution
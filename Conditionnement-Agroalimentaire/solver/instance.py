@@ -0,0 +1,361 @@
+"""
+Représentation compilée d'une instance d'équilibrage de chaîne de montage
+Construite une seule fois à partir de la liste de tâches du scénario
+"""
+
+import hashlib
+import json
+import math
+from collections import Counter
+
+import numpy as np
+
+
+class LineInstance:
+    """
+    Instance compilée: tableaux NumPy des durées et pénibilités, index des
+    identifiants de tâches, adjacence de précédence au format CSR et ordre
+    topologique. Les tâches sont désignées par leur indice k (0..n-1).
+    
+    Les fermetures transitives sont des masques de bits compacts
+    (pred_bits[k] et succ_bits[k]: n/64 mots uint64); les durées cumulées
+    amont/aval qui en découlent (fenêtres, poids positionnels) sont
+    calculées une seule fois. LineInstance.compiler() réutilise l'instance
+    déjà compilée pour les mêmes tâches.
+    
+    En mode multi-modèles, toutes les variantes partagent le graphe de
+    précédence; durees est alors la durée moyenne pondérée par les parts de
+    demande et durees_variantes la matrice (variantes x tâches).
+    """
+    
+    # Instances compilées récemment: clé des tâches -> LineInstance
+    _cache = {}
+    TAILLE_CACHE = 8
+    
+    def __init__(self, taches, modeles_mixtes=None):
+        """
+        Compile la liste de tâches
+        
+        Args:
+            taches: liste de dictionnaires (id, nom, duree, prerequis, ...)
+            modeles_mixtes: section 'modeles_mixtes' du scénario (optionnel)
+        
+        Raises:
+            ValueError: identifiant dupliqué, prérequis inconnu ou cycle de
+                précédence (les tâches du cycle sont citées)
+        """
+        self.taches = taches
+        self.n = len(taches)
+        self.ids = [t['id'] for t in taches]
+        self._valider()
+        self.index = {tid: k for k, tid in enumerate(self.ids)}
+        self.noms = [t['nom'] for t in taches]
+        self.durees = np.array([t['duree'] for t in taches], dtype=float)
+        self.penibilites = np.array([t.get('penibilite', 0) for t in taches], dtype=float)
+        self.variantes, self.parts, self.durees_variantes = [], None, None
+        if modeles_mixtes:
+            self._compile_variantes(modeles_mixtes['variantes'])
+        
+        # Adjacence CSR: prédécesseurs directs de k = pred_idx[pred_ptr[k]:pred_ptr[k+1]]
+        preds = [[self.index[p] for p in t.get('prerequis', [])] for t in taches]
+        self.pred_ptr = np.zeros(self.n + 1, dtype=int)
+        self.pred_ptr[1:] = np.cumsum([len(p) for p in preds])
+        self.pred_idx = np.array([p for ps in preds for p in ps], dtype=int)
+        
+        # Successeurs directs (transposée de la matrice CSR)
+        ordre = np.argsort(self.pred_idx, kind='stable')
+        cibles = np.repeat(np.arange(self.n), np.diff(self.pred_ptr))
+        self.succ_ptr = np.zeros(self.n + 1, dtype=int)
+        self.succ_ptr[1:] = np.cumsum(np.bincount(self.pred_idx, minlength=self.n))
+        self.succ_idx = cibles[ordre]
+        
+        self.ordre_topo = self._topological_order()
+        self.pred_bits, self.succ_bits = self._transitive_closure()
+        
+        # Durées cumulées: tâche et prédécesseurs (resp. successeurs) transitifs
+        self.cumul_amont = self.durees + self._somme_masques(self.pred_bits, self.durees)
+        self.cumul_aval = self.durees + self._somme_masques(self.succ_bits, self.durees)
+        # Poids positionnel (RPW): durée de la tâche et de tous ses successeurs
+        self.poids_positionnels = self.cumul_aval
+    
+    @classmethod
+    def compiler(cls, taches, modeles_mixtes=None):
+        """
+        Instance compilée pour ces tâches, reprise du cache si les mêmes
+        tâches ont déjà été compilées (résolutions répétées, balayages,
+        heuristique de départ du PLNE)
+        """
+        cle = hashlib.sha1(json.dumps([taches, modeles_mixtes], sort_keys=True,
+                                      default=str).encode('utf-8')).hexdigest()
+        instance = cls._cache.pop(cle, None)
+        if instance is None:
+            instance = cls(taches, modeles_mixtes)
+        cls._cache[cle] = instance
+        while len(cls._cache) > cls.TAILLE_CACHE:
+            del cls._cache[next(iter(cls._cache))]
+        return instance
+    
+    def _valider(self):
+        """Identifiants uniques et prérequis existants"""
+        doublons = sorted((tid for tid, nb in Counter(self.ids).items() if nb > 1), key=str)
+        if doublons:
+            raise ValueError(f"Identifiants de tâches dupliqués: {doublons}")
+        connus = set(self.ids)
+        inconnus = [(t['id'], p) for t in self.taches for p in t.get('prerequis', []) if p not in connus]
+        if inconnus:
+            details = ", ".join(f"{tid} -> {p}" for tid, p in inconnus[:10])
+            raise ValueError(f"Prérequis inconnus (tâche -> prérequis): {details}")
+    
+    def _compile_variantes(self, variantes):
+        """
+        Durées par variante de produit
+        
+        Une tâche compte pour la variante v si son type_produit est neutre
+        (ou absent) ou fait partie des types de v (par défaut: [v]); sa durée
+        est alors durees_variantes[v] si fourni, sinon duree. Les parts de
+        demande sont normalisées (parts égales si absentes).
+        """
+        self.variantes = list(variantes)
+        if not self.variantes:
+            raise ValueError("Mode multi-modèles sans variante")
+        parts = np.array([variantes[v].get('part', 1.0) for v in self.variantes], dtype=float)
+        if (parts < 0).any() or parts.sum() <= 0:
+            raise ValueError("Parts de demande des variantes invalides")
+        self.parts = parts / parts.sum()
+        
+        self.durees_variantes = np.zeros((len(self.variantes), self.n))
+        for v, nom in enumerate(self.variantes):
+            types = set(variantes[nom].get('types', [nom]))
+            for k, t in enumerate(self.taches):
+                propres = t.get('durees_variantes', {})
+                if nom in propres:
+                    self.durees_variantes[v, k] = propres[nom]
+                elif t.get('type_produit', 'neutre') in types | {'neutre', None}:
+                    self.durees_variantes[v, k] = t['duree']
+        self.durees = self.parts @ self.durees_variantes
+    
+    def variantes_critiques(self):
+        """
+        Variantes non dominées: une variante dont chaque durée est inférieure
+        ou égale à celle d'une autre n'impose jamais la charge maximale
+        
+        Returns:
+            liste d'indices de variantes
+        """
+        D = self.durees_variantes
+        critiques = []
+        for v in range(len(self.variantes)):
+            domine = any((D[v] <= D[w]).all() and ((D[v] < D[w]).any() or w < v)
+                         for w in range(len(self.variantes)) if w != v)
+            if not domine:
+                critiques.append(v)
+        return critiques
+    
+    def predecesseurs(self, k):
+        """Prédécesseurs directs de la tâche d'indice k"""
+        return self.pred_idx[self.pred_ptr[k]:self.pred_ptr[k + 1]]
+    
+    def successeurs(self, k):
+        """Successeurs directs de la tâche d'indice k"""
+        return self.succ_idx[self.succ_ptr[k]:self.succ_ptr[k + 1]]
+    
+    def arcs(self):
+        """Itère sur les arcs de précédence (pred, succ) en indices"""
+        for k in range(self.n):
+            for p in self.predecesseurs(k):
+                yield int(p), k
+    
+    def _topological_order(self):
+        """Ordre topologique (Kahn) en O(n + arcs)"""
+        nb_pred = np.diff(self.pred_ptr).copy()
+        ordre = [k for k in range(self.n) if nb_pred[k] == 0]
+        for k in ordre:
+            for s in self.successeurs(k):
+                nb_pred[s] -= 1
+                if nb_pred[s] == 0:
+                    ordre.append(int(s))
+        if len(ordre) < self.n:
+            cycle = self._trouver_cycle(nb_pred > 0)
+            raise ValueError("Le graphe de précédence contient un cycle: "
+                             + " -> ".join(str(self.ids[k]) for k in cycle))
+        return np.array(ordre, dtype=int)
+    
+    def _trouver_cycle(self, restantes):
+        """
+        Un cycle parmi les tâches restantes après Kahn: chacune a un
+        prédécesseur restant, remonter les prédécesseurs finit par boucler
+        """
+        k = int(np.flatnonzero(restantes)[0])
+        vus = {}
+        chemin = []
+        while k not in vus:
+            vus[k] = len(chemin)
+            chemin.append(k)
+            k = next(int(p) for p in self.predecesseurs(k) if restantes[p])
+        cycle = chemin[vus[k]:][::-1]
+        return cycle + [cycle[0]]
+    
+    def _transitive_closure(self):
+        """
+        Prédécesseurs et successeurs transitifs en masques de bits compacts
+        (tableaux n x ceil(n/64) de uint64), en O(arcs * n/64)
+        """
+        mots = max(1, (self.n + 63) // 64)
+        un = np.uint64(1)
+        
+        def fermeture(ordre, voisins):
+            bits = np.zeros((self.n, mots), dtype=np.uint64)
+            for k in ordre:
+                v = voisins(k)
+                if len(v) == 0:
+                    continue
+                bits[k] = np.bitwise_or.reduce(bits[v], axis=0)
+                np.bitwise_or.at(bits[k], v >> 6, un << (v & 63).astype(np.uint64))
+            return bits
+        
+        return (fermeture(self.ordre_topo, self.predecesseurs),
+                fermeture(self.ordre_topo[::-1], self.successeurs))
+    
+    def _matrice(self, bits, debut=0, fin=None):
+        """Lignes debut..fin d'une fermeture en matrice booléenne dense"""
+        octets = bits[debut:fin].astype('<u8').view(np.uint8)
+        return np.unpackbits(octets, axis=1, bitorder='little')[:, :self.n].astype(bool)
+    
+    def _somme_masques(self, bits, valeurs, bloc=1024):
+        """Σ valeurs sur chaque masque (par blocs de lignes pour limiter la mémoire)"""
+        sommes = np.zeros(self.n)
+        for debut in range(0, self.n, bloc):
+            sommes[debut:debut + bloc] = self._matrice(bits, debut, debut + bloc) @ valeurs
+        return sommes
+    
+    def predecesseurs_transitifs(self, k):
+        """Indices des prédécesseurs transitifs de la tâche k"""
+        return np.flatnonzero(self._matrice(self.pred_bits, k, k + 1)[0])
+    
+    def successeurs_transitifs(self, k):
+        """Indices des successeurs transitifs de la tâche k"""
+        return np.flatnonzero(self._matrice(self.succ_bits, k, k + 1)[0])
+    
+    def precede(self, a, b):
+        """La tâche a précède-t-elle (transitivement) la tâche b ?"""
+        return bool((int(self.succ_bits[a, b >> 6]) >> (b & 63)) & 1)
+    
+    def nombre_paires_ordonnees(self):
+        """Nombre de paires (a, b) telles que a précède transitivement b"""
+        return int(np.unpackbits(self.succ_bits.astype('<u8').view(np.uint8)).sum())
+    
+    def fenetres(self, n_postes, temps_cycle_max):
+        """
+        Fenêtre de postes admissibles [E_k, L_k] de chaque tâche
+        
+        Avec C = temps_cycle_max et m postes:
+            E_k = ceil((d_k + Σ durées des prédécesseurs transitifs) / C)
+            L_k = m + 1 - ceil((d_k + Σ durées des successeurs transitifs) / C)
+        
+        Returns:
+            (E, L): tableaux d'entiers indexés par tâche
+        """
+        C = float(temps_cycle_max)
+        E = np.maximum(1, np.ceil(self.cumul_amont / C - 1e-9)).astype(int)
+        L = np.minimum(n_postes, n_postes + 1 - np.ceil(self.cumul_aval / C - 1e-9)).astype(int)
+        return E, L
+    
+    def bornes_inferieures(self, n_postes):
+        """
+        Bornes inférieures du temps de cycle pour n_postes postes
+        
+        Returns:
+            dict: 'LB1' (durée totale / postes), 'LB2' (durée maximale),
+            'LB3' (bin-packing: parmi les k*m+1 plus longues tâches, k+1
+            partagent un poste) et 'LB' (maximum, arrondi si durées entières)
+        """
+        d = np.sort(self.durees)[::-1].tolist()
+        m = n_postes
+        lb1 = sum(d) / m
+        lb2 = d[0] if d else 0
+        lb3 = 0
+        k = 1
+        while k * m < len(d):
+            lb3 = max(lb3, sum(d[k * m - i] for i in range(k + 1)))
+            k += 1
+        lb = max(lb1, lb2, lb3)
+        if all(float(x).is_integer() for x in d):
+            lb = math.ceil(lb - 1e-9)
+        return {'LB1': lb1, 'LB2': lb2, 'LB3': lb3, 'LB': lb}
+    
+    def graphe_conflits(self, incompatibles=(), penibilite_max=None, temps_cycle_max=None):
+        """
+        Graphe de conflits: deux tâches adjacentes ne peuvent pas partager un poste
+        
+        Arêtes: paires incompatibles, paires dont la pénibilité cumulée dépasse
+        penibilite_max et paires dont la durée cumulée dépasse temps_cycle_max.
+        
+        Returns:
+            liste de masques de bits (entiers): bit b de adjacence[k] si b et k
+            sont en conflit
+        """
+        adjacence = [0] * self.n
+        for t1, t2 in incompatibles:
+            a, b = self.index[t1], self.index[t2]
+            if a != b:
+                adjacence[a] |= 1 << b
+                adjacence[b] |= 1 << a
+        
+        seuils = [(self.penibilites, penibilite_max), (self.durees, temps_cycle_max)]
+        for valeurs, seuil in seuils:
+            if seuil is None:
+                continue
+            # Tâches triées par valeur décroissante: les partenaires en conflit
+            # de la tâche r forment un préfixe de l'ordre
+            ordre = np.argsort(-valeurs, kind='stable').tolist()
+            tries = valeurs[ordre]
+            masques = [0] * (self.n + 1)
+            for r, k in enumerate(ordre):
+                masques[r + 1] = masques[r] | (1 << k)
+            for k in range(self.n):
+                reste = seuil - valeurs[k]
+                # Nombre de tâches de valeur > reste
+                prefixe = int(np.searchsorted(-tries, -reste, side='left'))
+                adjacence[k] |= masques[prefixe] & ~(1 << k)
+        return adjacence
+    
+    def cliques_conflits(self, incompatibles=(), penibilite_max=None, temps_cycle_max=None):
+        """
+        Couverture des arêtes du graphe de conflits par des cliques maximales
+        
+        Glouton sur masques de bits: une arête non couverte est étendue en
+        clique maximale en ajoutant d'abord les sommets qui couvrent le plus
+        d'arêtes encore non couvertes. Chaque arête appartient à au moins une
+        clique; une contrainte Σ_{k∈Q} x[k,j] <= 1 par clique et par poste
+        remplace les contraintes par paire.
+        
+        Returns:
+            liste de cliques (listes d'indices de tâches, au moins 2)
+        """
+        adjacence = self.graphe_conflits(incompatibles, penibilite_max, temps_cycle_max)
+        non_couvertes = list(adjacence)
+        cliques = []
+        for u in range(self.n):
+            while non_couvertes[u]:
+                v = (non_couvertes[u] & -non_couvertes[u]).bit_length() - 1
+                clique = [u, v]
+                masque = (1 << u) | (1 << v)
+                candidats = adjacence[u] & adjacence[v]
+                while candidats:
+                    meilleur, cle_meilleure = None, None
+                    c = candidats
+                    while c:
+                        b = c & -c
+                        w = b.bit_length() - 1
+                        cle = (bin(non_couvertes[w] & masque).count('1'),
+                               bin(adjacence[w] & candidats).count('1'))
+                        if cle_meilleure is None or cle > cle_meilleure:
+                            meilleur, cle_meilleure = w, cle
+                        c ^= b
+                    clique.append(meilleur)
+                    masque |= 1 << meilleur
+                    candidats &= adjacence[meilleur]
+                for a in clique:
+                    non_couvertes[a] &= ~masque
+                cliques.append(sorted(clique))
+        return cliques
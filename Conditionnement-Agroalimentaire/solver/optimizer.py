@@ -6,6 +6,21 @@ Utilise Gurobi pour résoudre le problème PLNE
 import gurobipy as gp
 from gurobipy import GRB
 import json
+import time
+
+import numpy as np
+
+from solver.instance import LineInstance
+from solver.stochastic import StochasticDurations
+
+
+# Formulations disponibles pour build_model
+#   cumul:  x[i,j] binaires, précédence par sommes cumulées (une ligne par poste)
+#   etapes: variables d'étape y[i,j] = 1 si la tâche i est à un poste <= j,
+#           x[i,j] = y[i,j] - y[i,j-1], précédence y[i,j] <= y[pred,j]
+#   indice: x[i,j] binaires, précédence sur l'indice de poste Σ j x[i,j]
+#           (une seule ligne par arc, relaxation plus faible)
+FORMULATIONS = ('cumul', 'etapes', 'indice')
 
 
 class AssemblyLineOptimizer:
@@ -13,40 +28,104 @@ class AssemblyLineOptimizer:
     Optimiseur pour l'équilibrage de chaîne de montage
     """
     
-    def __init__(self, data):
+    def __init__(self, data, formulation='auto', coupes_symetrie=True, instance=None):
         """
         Initialise l'optimiseur avec les données du problème
         
         Args:
             data: dictionnaire contenant les tâches, postes, contraintes
+            formulation: 'auto' ou l'une de FORMULATIONS
+            coupes_symetrie: ajoute les coupes de symétrie et de borne
+            instance: LineInstance déjà compilée pour ces tâches (optionnel)
         """
+        if formulation != 'auto' and formulation not in FORMULATIONS:
+            raise ValueError(f"Formulation inconnue: {formulation}")
         self.data = data
+        self.formulation = formulation
+        self.coupes_symetrie = coupes_symetrie
         self.taches = data['taches']
         self.n_postes = data['nombre_postes']
         self.temps_cycle_max = data.get('temps_cycle_max', 100)
         self.model = None
         self.solution = None
+        self.fenetres = {}
+        self.temps_construction = 0
+        self.arret_demande = False
+        
+        # Instance compilée une seule fois (tableaux, CSR, ordre topologique)
+        self.instance = instance if instance is not None else LineInstance.compiler(self.taches, data.get('modeles_mixtes'))
+        self.n_postes_modele = self.n_postes
+        self.formulation_utilisee = self.choisir_formulation()
+        
+        # Durées aléatoires: le PLNE minimise un quantile du temps de cycle
+        self.stochastique = None
+        self.scenarios = None
+        if 'durees_stochastiques' in data:
+            if self.instance.variantes:
+                raise ValueError("Durées stochastiques et multi-modèles ne peuvent être combinés")
+            self.stochastique = StochasticDurations(self.taches, data['durees_stochastiques'])
+    
+    def choisir_formulation(self):
+        """
+        Formulation retenue pour l'instance (voir benchmark.py --formulations)
         
+        Les petites lignes se résolvent au nœud racine avec la forme cumulée;
+        au-delà, les variables d'étape donnent la même relaxation avec deux
+        coefficients par ligne de précédence au lieu de O(postes).
+        """
+        if self.formulation != 'auto':
+            return self.formulation
+        return 'cumul' if self.instance.n <= 30 else 'etapes'
+    
     def build_model(self):
         """
         Construit le modèle PLNE
         """
         try:
+            debut = time.time()
+            
             # Créer le modèle
             self.model = gp.Model("EquilibrageChaine")
             self.model.setParam('OutputFlag', 0)  # Désactiver les logs
             
-            n_taches = len(self.taches)
-            taches_ids = [t['id'] for t in self.taches]
+            inst = self.instance
+            ids = inst.ids
+            durees = inst.durees.tolist()
             postes = range(1, self.n_postes + 1)
             
+            # Fenêtres de postes admissibles (précédences + temps de cycle max)
+            E, L = inst.fenetres(self.n_postes, self.temps_cycle_max)
+            E, L = E.tolist(), L.tolist()
+            self.fenetres = {ids[k]: (E[k], L[k]) for k in range(inst.n)}
+            self.fenetres_modele = (E, L)
+            self.temps_cycle_max_modele = self.temps_cycle_max
+            self.lignes_precedence = {}
+            self.lignes_symetrie = {}
+            self.lignes_conflits = []
+            self.cliques = []
+            self.constantes_non_vide = {}
+            vides = [ids[k] for k in range(inst.n) if E[k] > L[k]]
+            if vides:
+                raise ValueError(f"Aucun poste admissible pour les tâches {vides} "
+                                 f"(temps de cycle max ou nombre de postes insuffisant)")
+            
             # Variables de décision
-            # x[i,j] = 1 si la tâche i est assignée au poste j
-            x = {}
-            for i in taches_ids:
-                for j in postes:
-                    x[i, j] = self.model.addVar(vtype=GRB.BINARY, 
-                                               name=f"x_{i}_{j}")
+            # x[i,j] = 1 si la tâche i est assignée au poste j (j dans la fenêtre de i)
+            self.formulation_utilisee = self.choisir_formulation()
+            taches_poste = {j: [] for j in postes}  # indices des tâches admissibles
+            for k in range(inst.n):
+                for j in range(E[k], L[k] + 1):
+                    taches_poste[j].append(k)
+            
+            y = {}
+            if self.formulation_utilisee == 'etapes':
+                x, y = self._build_step_variables(E, L)
+            else:
+                x = {}
+                for k in range(inst.n):
+                    for j in range(E[k], L[k] + 1):
+                        x[ids[k], j] = self.model.addVar(vtype=GRB.BINARY, 
+                                                        name=f"x_{ids[k]}_{j}")
             
             # Variable pour le temps de cycle (temps max sur tous les postes)
             temps_cycle = self.model.addVar(vtype=GRB.CONTINUOUS, 
@@ -63,19 +142,21 @@ class AssemblyLineOptimizer:
             # CONTRAINTES
             
             # 1. Chaque tâche est assignée à exactement un poste
-            for i in taches_ids:
-                self.model.addConstr(
-                    gp.quicksum(x[i, j] for j in postes) == 1,
-                    name=f"assign_tache_{i}"
-                )
+            # (implicite avec les variables d'étape: la somme est télescopique)
+            if self.formulation_utilisee != 'etapes':
+                for k in range(inst.n):
+                    i = ids[k]
+                    self.model.addConstr(
+                        gp.quicksum(x[i, j] for j in range(E[k], L[k] + 1)) == 1,
+                        name=f"assign_tache_{i}"
+                    )
             
             # 2. Calcul de la charge de chaque poste
             for j in postes:
-                tache_dict = {t['id']: t for t in self.taches}
                 self.model.addConstr(
                     charge_poste[j] == gp.quicksum(
-                        x[i, j] * tache_dict[i]['duree'] 
-                        for i in taches_ids
+                        x[ids[k], j] * durees[k] 
+                        for k in taches_poste[j]
                     ),
                     name=f"charge_poste_{j}"
                 )
@@ -88,16 +169,7 @@ class AssemblyLineOptimizer:
                 )
             
             # 4. Contraintes de précédence
-            for tache in self.taches:
-                i = tache['id']
-                for pred_id in tache['prerequis']:
-                    # Si tâche i au poste j, alors pred doit être à un poste <= j
-                    for j in postes:
-                        self.model.addConstr(
-                            gp.quicksum(x[pred_id, k] for k in postes if k <= j) 
-                            >= x[i, j],
-                            name=f"precedence_{pred_id}_{i}_{j}"
-                        )
+            self._add_precedence(x, y, E, L, inst.arcs())
             
             # 5. Contrainte de temps de cycle maximum
             self.model.addConstr(
@@ -105,62 +177,403 @@ class AssemblyLineOptimizer:
                 name="temps_cycle_max"
             )
             
+            # Multi-modèles: temps de cycle de la variante la plus lourde
+            critere_cycle = temps_cycle
+            temps_cycle_pire = None
+            temps_cycle_quantile = None
+            if inst.variantes:
+                temps_cycle_pire, critere_cycle = self._add_mixed_model_constraints(
+                    x, postes, taches_poste, temps_cycle)
+            elif self.stochastique is not None:
+                # Durées aléatoires: quantile du temps de cycle sur les scénarios
+                temps_cycle_quantile = self._add_stochastic_constraints(x, postes, taches_poste)
+                critere_cycle = temps_cycle_quantile
+            
             # CONTRAINTES AVANCÉES (si présentes)
             if 'contraintes_ergonomie' in self.data:
-                self._add_ergonomie_constraints(x, postes, taches_ids)
+                self._add_ergonomie_constraints(x, postes, taches_poste)
+            
+            if self.coupes_symetrie:
+                self._add_symmetry_cuts(x, temps_cycle, charge_poste, postes,
+                                        taches_poste, E, L)
             
             # FONCTION OBJECTIF
             if 'objectifs_multiples' in self.data:
-                self._set_multi_objective(x, temps_cycle, charge_poste, 
-                                         postes, taches_ids)
+                self._set_multi_objective(x, critere_cycle, charge_poste, 
+                                         postes, taches_poste)
             else:
                 # Objectif simple : minimiser le temps de cycle
-                self.model.setObjective(temps_cycle, GRB.MINIMIZE)
+                self.model.setObjective(critere_cycle, GRB.MINIMIZE)
             
             self.variables = {
                 'x': x,
+                'y': y,
                 'temps_cycle': temps_cycle,
-                'charge_poste': charge_poste
+                'temps_cycle_pire': temps_cycle_pire,
+                'temps_cycle_quantile': temps_cycle_quantile,
+                'charge_poste': charge_poste,
+                'taches_poste': taches_poste
             }
             
+            self.model.update()
+            self.n_postes_modele = self.n_postes
+            self.temps_construction = time.time() - debut
             return True
-            
+        
         except Exception as e:
             print(f"Erreur construction modèle: {e}")
             return False
     
-    def _add_ergonomie_constraints(self, x, postes, taches_ids):
+    def _build_step_variables(self, E, L):
+        """
+        Variables d'étape y[i,j] (j de E_i à L_i - 1, y[i,L_i] = 1 implicite)
+        
+        Returns:
+            (x, y): x[i,j] est l'expression y[i,j] - y[i,j-1]
+        """
+        ids = self.instance.ids
+        x, y = {}, {}
+        for k in range(self.instance.n):
+            i = ids[k]
+            for j in range(E[k], L[k]):
+                y[i, j] = self.model.addVar(vtype=GRB.BINARY, name=f"y_{i}_{j}")
+            precedent = None
+            for j in range(E[k], L[k] + 1):
+                courant = y.get((i, j), 1.0)
+                if precedent is None:
+                    x[i, j] = gp.LinExpr(courant)
+                else:
+                    x[i, j] = courant - precedent
+                    if j < L[k]:
+                        self.model.addConstr(precedent <= courant,
+                                             name=f"etape_{i}_{j}")
+                precedent = courant
+        return x, y
+    
+    def _add_mixed_model_constraints(self, x, postes, taches_poste, temps_cycle):
+        """
+        Mode multi-modèles (section 'modeles_mixtes' du scénario)
+        
+        Les variantes partagent les variables x: charge_poste porte déjà la
+        charge moyenne pondérée par la demande (durées moyennes de l'instance).
+        Seule une variable temps_cycle_pire est ajoutée, bornée par la charge
+        de chaque variante non dominée à chaque poste; la taille du modèle ne
+        dépend pas du nombre de variantes dominées.
+        
+        critere: 'moyen' (temps de cycle moyen), 'pire' (variante la plus
+        lourde) ou 'pondere' (par défaut: (1 - poids_pire) * moyen +
+        poids_pire * pire). temps_cycle_pire_max borne la charge de chaque
+        variante (capacité de tampon entre postes).
+        
+        Returns:
+            (temps_cycle_pire, expression du critère de temps de cycle)
+        """
+        config = self.data['modeles_mixtes']
+        inst = self.instance
+        ids = inst.ids
+        D = inst.durees_variantes.tolist()
+        
+        pire_max = config.get('temps_cycle_pire_max', GRB.INFINITY)
+        temps_cycle_pire = self.model.addVar(
+            vtype=GRB.CONTINUOUS, name="temps_cycle_pire", ub=pire_max,
+            # La charge maximale d'une variante majore la charge moyenne
+            lb=inst.bornes_inferieures(self.n_postes)['LB'] if self.coupes_symetrie else 0.0
+        )
+        for v in inst.variantes_critiques():
+            for j in postes:
+                self.model.addConstr(
+                    temps_cycle_pire >= gp.quicksum(
+                        x[ids[k], j] * D[v][k] for k in taches_poste[j] if D[v][k]),
+                    name=f"charge_variante_{inst.variantes[v]}_{j}"
+                )
+        
+        critere = config.get('critere', 'pondere')
+        if critere == 'moyen':
+            return temps_cycle_pire, gp.LinExpr(temps_cycle)
+        if critere == 'pire':
+            return temps_cycle_pire, gp.LinExpr(temps_cycle_pire)
+        if critere != 'pondere':
+            raise ValueError(f"Critère multi-modèles inconnu: {critere}")
+        poids = config.get('poids_pire', 0.5)
+        return temps_cycle_pire, (1 - poids) * temps_cycle + poids * temps_cycle_pire
+    
+    def _add_stochastic_constraints(self, x, postes, taches_poste):
+        """
+        Mode durées aléatoires (section 'durees_stochastiques' du scénario)
+        
+        Approximation par la moyenne d'échantillon (SAA) sur un jeu réduit de
+        scenarios_modele scénarios (voir StochasticDurations.scenarios_reduits):
+        une variable temps_cycle_quantile majore la charge de chaque poste dans
+        chaque scénario, sauf dans au plus (1 - quantile) * K scénarios
+        désignés par des binaires de dépassement (grand M = durée totale du
+        scénario). Les durées nominales gardent les contraintes de charge et
+        de temps de cycle max, et donc les fenêtres.
+        
+        Returns:
+            variable temps_cycle_quantile (critère de temps de cycle)
+        """
+        config = self.data['durees_stochastiques']
+        ids = self.instance.ids
+        D = self.stochastique.scenarios_reduits(config.get('scenarios_modele', 30))
+        self.scenarios = D
+        K = len(D)
+        depassements = int(np.floor((1 - self.stochastique.quantile) * K + 1e-9))
+        
+        temps_cycle_quantile = self.model.addVar(vtype=GRB.CONTINUOUS,
+                                                 name="temps_cycle_quantile")
+        z = {}
+        if depassements > 0:
+            for s in range(K):
+                z[s] = self.model.addVar(vtype=GRB.BINARY, name=f"depassement_{s}")
+        
+        for s in range(K):
+            grand_m = float(D[s].sum())
+            for j in postes:
+                self.model.addConstr(
+                    gp.quicksum(x[ids[k], j] * D[s, k] for k in taches_poste[j])
+                    <= temps_cycle_quantile + (grand_m * z[s] if z else 0),
+                    name=f"charge_scenario_{s}_{j}"
+                )
+        
+        if z:
+            self.model.addConstr(gp.quicksum(z.values()) <= depassements,
+                                 name="depassements_quantile")
+            if self.coupes_symetrie:
+                # Un scénario dominé (durées toutes inférieures) ne dépasse que
+                # si le scénario dominant dépasse aussi
+                domine = (D[:, None, :] <= D[None, :, :]).all(axis=2)
+                for s in range(K):
+                    for t in range(K):
+                        if s != t and domine[s, t] and not (domine[t, s] and t < s):
+                            self.model.addConstr(z[s] <= z[t],
+                                                 name=f"dominance_scenario_{s}_{t}")
+        return temps_cycle_quantile
+    
+    def _add_precedence(self, x, y, E, L, arcs):
+        """
+        Contraintes de précédence des arcs (pred, succ) donnés en indices,
+        selon la formulation; les lignes de chaque arc sont mémorisées dans
+        lignes_precedence pour pouvoir le retirer (voir update_data)
+        """
+        ids = self.instance.ids
+        for p, k in arcs:
+            if self.formulation_utilisee == 'etapes':
+                lignes = self._add_step_precedence(y, E, L, p, k)
+            elif self.formulation_utilisee == 'indice':
+                lignes = self._add_index_precedence(x, E, L, p, k)
+            else:
+                lignes = self._add_cumulative_precedence(x, E, L, p, k)
+            self.lignes_precedence[ids[p], ids[k]] = lignes
+    
+    def _add_cumulative_precedence(self, x, E, L, p, k):
+        """
+        Précédence en forme cumulée
+        poste(pred) <= poste(i) <=> pour tout j:
+          Σ_{k<=j} x[i,k] <= Σ_{k<=j} x[pred,k]
+        Seuls les postes j de [E_i, L_pred - 1] donnent une contrainte utile:
+        avant E_i le membre gauche est nul, à partir de L_pred le droit vaut 1.
+        Un arc ajouté par update_data est posé sur les fenêtres du modèle, où
+        E_i peut précéder E_pred (et L_pred dépasser L_i): les postes sans
+        variable, hors fenêtre, comptent pour 0.
+        """
+        ids = self.instance.ids
+        i, pred_id = ids[k], ids[p]
+        lignes = []
+        cumul_i = gp.LinExpr()
+        cumul_p = gp.quicksum(x[pred_id, j] for j in range(E[p], min(E[k], L[p] + 1)))
+        for j in range(E[k], L[p]):
+            if (i, j) in x:
+                cumul_i += x[i, j]
+            if (pred_id, j) in x:
+                cumul_p += x[pred_id, j]
+            lignes.append(self.model.addConstr(
+                cumul_i <= cumul_p,
+                name=f"precedence_{pred_id}_{i}_{j}"
+            ))
+        return lignes
+    
+    def _add_step_precedence(self, y, E, L, p, k):
+        """
+        Précédence avec variables d'étape: y[i,j] <= y[pred,j] sur [E_i, L_pred - 1]
+        (hors fenêtre: y[i,j] = 1 au-delà de L_i, y[pred,j] = 0 avant E_pred)
+        """
+        ids = self.instance.ids
+        i, pred_id = ids[k], ids[p]
+        return [self.model.addConstr(
+                    y.get((i, j), 1.0) <= y.get((pred_id, j), 0.0),
+                    name=f"precedence_{pred_id}_{i}_{j}"
+                ) for j in range(E[k], L[p])]
+    
+    def _add_index_precedence(self, x, E, L, p, k):
+        """Précédence sur l'indice de poste: Σ j x[pred,j] <= Σ j x[i,j]"""
+        ids = self.instance.ids
+        i, pred_id = ids[k], ids[p]
+        return [self.model.addConstr(
+            gp.quicksum(j * x[pred_id, j] for j in range(E[p], L[p] + 1))
+            <= gp.quicksum(j * x[i, j] for j in range(E[k], L[k] + 1)),
+            name=f"precedence_{pred_id}_{i}"
+        )]
+    
+    def _add_symmetry_cuts(self, x, temps_cycle, charge_poste, postes,
+                           taches_poste, E, L):
+        """
+        Coupes de symétrie et de borne (valides pour tous les objectifs)
+        
+        - temps de cycle >= meilleure borne inférieure (LB1, LB2, LB3)
+        - aucun poste vide si n_taches >= n_postes: déplacer une tâche vers un
+          poste vide ne dégrade ni le temps de cycle, ni l'écart de charge
+        - tâches identiques et indépendantes: ordre imposé sur leurs postes
+        - sans aucune précédence, les postes sont interchangeables: charges
+          décroissantes
+        """
+        inst = self.instance
+        ids = inst.ids
+        
+        self.model.addConstr(
+            temps_cycle >= inst.bornes_inferieures(self.n_postes)['LB'],
+            name="borne_temps_cycle"
+        )
+        
+        if inst.n >= self.n_postes:
+            for j in postes:
+                occupation = gp.quicksum(x[ids[k], j] for k in taches_poste[j])
+                # Avec les variables d'étape, la constante passe au second membre
+                self.constantes_non_vide[j] = occupation.getConstant()
+                self.model.addConstr(
+                    occupation >= 1,
+                    name=f"poste_non_vide_{j}"
+                )
+        
+        incompatibles = set()
+        for t1, t2 in self.data.get('contraintes_ergonomie', {}).get('taches_incompatibles', []):
+            incompatibles.update((t1, t2))
+        groupes = {}
+        for k in range(inst.n):
+            t = self.taches[k]
+            if t['prerequis'] or len(inst.successeurs(k)) or ids[k] in incompatibles:
+                continue
+            cle = (t['duree'], t.get('penibilite', 0), t.get('type_produit'),
+                   None if inst.durees_variantes is None else tuple(inst.durees_variantes[:, k]),
+                   None if self.scenarios is None else tuple(self.scenarios[:, k]))
+            groupes.setdefault(cle, []).append(k)
+        for groupe in groupes.values():
+            for a, b in zip(groupe, groupe[1:]):
+                self.lignes_symetrie[ids[a], ids[b]] = self.model.addConstr(
+                    gp.quicksum(j * x[ids[a], j] for j in range(E[a], L[a] + 1))
+                    <= gp.quicksum(j * x[ids[b], j] for j in range(E[b], L[b] + 1)),
+                    name=f"symetrie_{ids[a]}_{ids[b]}"
+                )
+        
+        if len(inst.pred_idx) == 0:
+            for j in postes:
+                if j + 1 in charge_poste:
+                    self.lignes_symetrie['ordre_charges', j] = self.model.addConstr(
+                        charge_poste[j] >= charge_poste[j + 1],
+                        name=f"ordre_charges_{j}"
+                    )
+    
+    def _add_ergonomie_constraints(self, x, postes, taches_poste):
         """
         Ajoute les contraintes d'ergonomie
+        
+        - pénibilité maximale par poste (sac à dos), renforcée par des
+          inégalités de couverture étendues
+        - tâches incompatibles: une contrainte par clique du graphe de
+          conflits et par poste (voir LineInstance.cliques_conflits)
         """
         contraintes = self.data['contraintes_ergonomie']
+        ids = self.instance.ids
+        pen_max = contraintes.get('penibilite_max_par_poste')
         
         # Pénibilité maximale par poste
-        if 'penibilite_max_par_poste' in contraintes:
-            pen_max = contraintes['penibilite_max_par_poste']
-            tache_dict = {t['id']: t for t in self.taches}
+        if pen_max is not None:
+            penibilites = self.instance.penibilites.tolist()
             
             for j in postes:
                 penibilite_poste = gp.quicksum(
-                    x[i, j] * tache_dict[i].get('penibilite', 0)
-                    for i in taches_ids
+                    x[ids[k], j] * penibilites[k]
+                    for k in taches_poste[j]
                 )
                 self.model.addConstr(
                     penibilite_poste <= pen_max,
                     name=f"penibilite_max_{j}"
                 )
         
-        # Tâches incompatibles (ne peuvent pas être au même poste)
-        if 'taches_incompatibles' in contraintes:
-            for t1, t2 in contraintes['taches_incompatibles']:
-                for j in postes:
-                    self.model.addConstr(
-                        x[t1, j] + x[t2, j] <= 1,
-                        name=f"incompatible_{t1}_{t2}_{j}"
-                    )
+        self._add_conflict_rows(x, postes, taches_poste)
+    
+    def _cliques(self):
+        """Cliques du graphe de conflits des données courantes"""
+        contraintes = self.data.get('contraintes_ergonomie', {})
+        return self.instance.cliques_conflits(
+            contraintes.get('taches_incompatibles', []),
+            contraintes.get('penibilite_max_par_poste'), self.temps_cycle_max
+        )
+    
+    def _add_conflict_rows(self, x, postes, taches_poste):
+        """
+        Couvertures de pénibilité et cliques de conflits (lignes mémorisées
+        dans lignes_conflits: elles dépendent des durées et pénibilités)
+        """
+        ids = self.instance.ids
+        pen_max = self.data['contraintes_ergonomie'].get('penibilite_max_par_poste')
+        if pen_max is not None:
+            penibilites = self.instance.penibilites.tolist()
+            for j in postes:
+                for r, (couverture, rhs) in enumerate(
+                        self._couvertures(taches_poste[j], penibilites, pen_max)):
+                    self.lignes_conflits.append(self.model.addConstr(
+                        gp.quicksum(x[ids[k], j] for k in couverture) <= rhs,
+                        name=f"couverture_penibilite_{j}_{r}"
+                    ))
+        
+        # Tâches incompatibles (ne peuvent pas être au même poste), auxquelles
+        # s'ajoutent les paires dont la pénibilité ou la durée cumulée dépasse
+        # la limite du poste
+        self.cliques = self._cliques()
+        for q, clique in enumerate(self.cliques):
+            for j in postes:
+                membres = [ids[k] for k in clique if (ids[k], j) in x]
+                if len(membres) < 2:
+                    continue
+                self.lignes_conflits.append(self.model.addConstr(
+                    gp.quicksum(x[t, j] for t in membres) <= 1,
+                    name=f"clique_conflits_{q}_{j}"
+                ))
+    
+    @staticmethod
+    def _couvertures(taches, penibilites, pen_max):
+        """
+        Inégalités de couverture étendues de la contrainte de pénibilité
+        
+        Tâches triées par pénibilité décroissante p_1 >= p_2 >= ...: si
+        p_s + ... + p_{s+r-1} > pen_max (r minimal), ces r tâches forment une
+        couverture minimale, étendue aux tâches plus pénibles qui la précèdent:
+        au plus r-1 des s+r premières tâches partagent le poste. Pour chaque r
+        seule l'extension la plus longue est gardée (elle domine les autres);
+        r <= 2 est déjà couvert par les cliques du graphe de conflits.
+        
+        Returns:
+            liste de (tâches, second membre)
+        """
+        triees = sorted((k for k in taches if penibilites[k] > 0), key=lambda k: -penibilites[k])
+        p = [penibilites[k] for k in triees]
+        meilleures = {}
+        fin, somme = 0, 0.0
+        for s in range(len(p)):
+            # Fenêtre glissante [s, fin): plus petite couverture commençant en s
+            while fin < len(p) and somme <= pen_max + 1e-9:
+                somme += p[fin]
+                fin += 1
+            if somme <= pen_max + 1e-9:
+                break
+            r = fin - s
+            if r > 2:
+                meilleures[r] = fin
+            somme -= p[s]
+        return [(triees[:e], r - 1) for r, e in sorted(meilleures.items())]
     
     def _set_multi_objective(self, x, temps_cycle, charge_poste, 
-                            postes, taches_ids):
+                            postes, taches_poste):
         """
         Définit une fonction objectif multi-critères
         """
@@ -170,7 +583,7 @@ class AssemblyLineOptimizer:
         w3 = obj.get('poids_ergonomie', 0.2)
         
         # Normalisation approximative
-        temps_total = sum(t['duree'] for t in self.taches)
+        temps_total = float(self.instance.durees.sum())
         
         # Critère 1: Minimiser temps de cycle (normalisé)
         obj1 = temps_cycle / temps_total
@@ -181,62 +594,437 @@ class AssemblyLineOptimizer:
         for j in postes:
             ecart = self.model.addVar(vtype=GRB.CONTINUOUS, 
                                      name=f"ecart_{j}")
-            self.model.addConstr(ecart >= charge_poste[j] - charge_moyenne)
-            self.model.addConstr(ecart >= charge_moyenne - charge_poste[j])
+            self.model.addConstr(ecart >= charge_poste[j] - charge_moyenne,
+                                 name=f"ecart_sup_{j}")
+            self.model.addConstr(ecart >= charge_moyenne - charge_poste[j],
+                                 name=f"ecart_inf_{j}")
             ecarts.append(ecart)
         
         obj2 = gp.quicksum(ecarts) / (self.n_postes * temps_total)
         
         # Critère 3: Minimiser pénibilité totale
-        tache_dict = {t['id']: t for t in self.taches}
+        ids = self.instance.ids
+        penibilites = self.instance.penibilites.tolist()
         penibilite_totale = gp.quicksum(
-            x[i, j] * tache_dict[i].get('penibilite', 0)
-            for i in taches_ids for j in postes
+            x[ids[k], j] * penibilites[k]
+            for j in postes for k in taches_poste[j]
         )
-        pen_max_possible = sum(t.get('penibilite', 0) for t in self.taches)
+        pen_max_possible = float(self.instance.penibilites.sum())
         obj3 = penibilite_totale / max(pen_max_possible, 1)
         
         # Objectif combiné
         objectif = w1 * obj1 + w2 * obj2 + w3 * obj3
         self.model.setObjective(objectif, GRB.MINIMIZE)
     
-    def solve(self, time_limit=300):
+    def add_pareto_criteria(self):
+        """
+        Ajoute les critères du front de Pareto et leurs contraintes epsilon
+        (second membre infini tant qu'elles ne sont pas resserrées)
+        
+        La pénibilité totale ne dépend pas de l'affectation: le critère
+        ergonomique retenu est la pénibilité du poste le plus pénible.
+        
+        Returns:
+            dict: expressions 'temps_cycle', 'desequilibre', 'penibilite_max'
+            et contraintes 'eps_desequilibre', 'eps_penibilite'
+        """
+        if self.model is None and not self.build_model():
+            return None
+        
+        x = self.variables['x']
+        charge_poste = self.variables['charge_poste']
+        taches_poste = self.variables['taches_poste']
+        ids = self.instance.ids
+        penibilites = self.instance.penibilites.tolist()
+        postes = range(1, self.n_postes + 1)
+        charge_moyenne = float(self.instance.durees.sum()) / self.n_postes
+        
+        ecarts = []
+        for j in postes:
+            ecart = self.model.addVar(vtype=GRB.CONTINUOUS, name=f"ecart_pareto_{j}")
+            self.model.addConstr(ecart >= charge_poste[j] - charge_moyenne)
+            self.model.addConstr(ecart >= charge_moyenne - charge_poste[j])
+            ecarts.append(ecart)
+        desequilibre = gp.quicksum(ecarts)
+        
+        penibilite_max = self.model.addVar(vtype=GRB.CONTINUOUS, name="penibilite_max")
+        for j in postes:
+            self.model.addConstr(
+                penibilite_max >= gp.quicksum(x[ids[k], j] * penibilites[k]
+                                              for k in taches_poste[j]),
+                name=f"penibilite_poste_{j}"
+            )
+        
+        criteres = {
+            'temps_cycle': gp.LinExpr(self.variables['temps_cycle']),
+            'desequilibre': desequilibre,
+            'penibilite_max': gp.LinExpr(penibilite_max),
+            'eps_desequilibre': self.model.addConstr(desequilibre <= GRB.INFINITY,
+                                                     name="eps_desequilibre"),
+            'eps_penibilite': self.model.addConstr(penibilite_max <= GRB.INFINITY,
+                                                   name="eps_penibilite")
+        }
+        self.variables['criteres'] = criteres
+        return criteres
+    
+    def set_active_stations(self, n_postes):
+        """
+        Restreint le modèle déjà construit aux n_postes premiers postes
+        
+        Le modèle est construit une fois pour le plus grand nombre de postes;
+        seuls les bornes des variables et les seconds membres changent. Réservé
+        à l'objectif de temps de cycle (sans objectifs_multiples, dont la
+        normalisation dépend du nombre de postes).
+        
+        Returns:
+            bool: False si une tâche n'a plus aucun poste admissible
+        """
+        if self.model is None and not self.build_model():
+            return False
+        if n_postes > self.n_postes_modele:
+            raise ValueError(f"Le modèle n'a que {self.n_postes_modele} postes")
+        
+        inst = self.instance
+        ids = inst.ids
+        E, L = inst.fenetres(n_postes, self.temps_cycle_max)
+        if (E > L).any():
+            return False
+        E, L = E.tolist(), L.tolist()
+        
+        # Postes au-delà de la nouvelle fenêtre interdits
+        self._appliquer_fenetres(E, L)
+        
+        for j in range(1, self.n_postes_modele + 1):
+            non_vide = self.model.getConstrByName(f"poste_non_vide_{j}")
+            if non_vide is not None:
+                actif = 1.0 if j <= n_postes and inst.n >= n_postes else 0.0
+                non_vide.RHS = actif - self.constantes_non_vide[j]
+        borne = self.model.getConstrByName("borne_temps_cycle")
+        if borne is not None:
+            borne.RHS = inst.bornes_inferieures(n_postes)['LB']
+        
+        self.n_postes = n_postes
+        self.fenetres = {ids[k]: (E[k], L[k]) for k in range(inst.n)}
+        return True
+    
+    def _appliquer_fenetres(self, E, L):
+        """
+        Restreint par leurs bornes les variables aux fenêtres [E_k, L_k]
+        (incluses dans les fenêtres du modèle construit)
+        """
+        index = self.instance.index
+        if self.variables['y']:
+            for (i, j), var in self.variables['y'].items():
+                k = index[i]
+                var.LB = 1.0 if j >= L[k] else 0.0
+                var.UB = 0.0 if j < E[k] else 1.0
+        else:
+            for (i, j), var in self.variables['x'].items():
+                k = index[i]
+                var.UB = 1.0 if E[k] <= j <= L[k] else 0.0
+    
+    def _modifier_coefficients(self, ligne, expr, delta):
+        """Ajoute delta * expr (variable ou expression d'étapes) au membre gauche d'une ligne"""
+        if not isinstance(expr, gp.LinExpr):
+            expr = gp.LinExpr(expr)
+        for t in range(expr.size()):
+            var = expr.getVar(t)
+            self.model.chgCoeff(ligne, var, self.model.getCoeff(ligne, var) + delta * expr.getCoeff(t))
+    
+    def update_data(self, data):
+        """
+        Adapte le modèle construit à des données modifiées, sans le reconstruire
+        
+        - durée ou pénibilité d'une tâche: coefficients des lignes de charge et
+          de pénibilité modifiés en place (chgCoeff)
+        - précédence ajoutée ou retirée: seules les lignes de l'arc sont
+          ajoutées ou supprimées
+        - temps de cycle max et nombre de postes (au plus celui du modèle):
+          seconds membres et bornes des variables
+        Les coupes devenues invalides (symétrie des tâches modifiées, cliques
+        et couvertures si les conflits changent) sont retirées ou recalculées.
+        
+        Returns:
+            bool: False si une reconstruction est nécessaire (tâches ajoutées
+            ou supprimées, fenêtres élargies au-delà du modèle, autre
+            contrainte ou objectif modifié, nombre de postes modifié avec
+            objectifs_multiples, multi-modèles, critères de Pareto); le
+            modèle n'est alors pas modifié
+        """
+        if self.model is None:
+            return False
+        anciennes, nouvelles = self.taches, data['taches']
+        if [t['id'] for t in anciennes] != [t['id'] for t in nouvelles]:
+            return False
+        for cle in ('contraintes_ergonomie', 'objectifs_multiples', 'modeles_mixtes',
+                    'durees_stochastiques'):
+            if data.get(cle) != self.data.get(cle):
+                return False
+        if self.instance.variantes or self.stochastique is not None or 'criteres' in self.variables:
+            return False
+        n_postes = data['nombre_postes']
+        temps_cycle_max = data.get('temps_cycle_max', 100)
+        if n_postes > self.n_postes_modele or temps_cycle_max > self.temps_cycle_max_modele:
+            return False
+        # Normalisation multi-critères calculée pour le nombre de postes du modèle
+        if 'objectifs_multiples' in data and n_postes != self.n_postes:
+            return False
+        
+        # Toutes les vérifications avant la première modification du modèle:
+        # un refus laisse l'optimiseur intact
+        instance = LineInstance.compiler(nouvelles)
+        E, L = instance.fenetres(n_postes, temps_cycle_max)
+        E0, L0 = self.fenetres_modele
+        if (E > L).any() or (E < E0).any() or (L > L0).any():
+            return False
+        
+        x, y = self.variables['x'], self.variables['y']
+        charge_poste = self.variables['charge_poste']
+        ids = instance.ids
+        ancienne_instance = self.instance
+        
+        # Durées et pénibilités: coefficients en place
+        modifiees = set()
+        for k in range(instance.n):
+            delta_d = instance.durees[k] - ancienne_instance.durees[k]
+            delta_p = instance.penibilites[k] - ancienne_instance.penibilites[k]
+            if delta_d == 0 and delta_p == 0:
+                continue
+            modifiees.add(ids[k])
+            for j in range(E0[k], L0[k] + 1):
+                if delta_d:
+                    ligne = self.model.getConstrByName(f"charge_poste_{j}")
+                    signe = -self.model.getCoeff(ligne, charge_poste[j])
+                    self._modifier_coefficients(ligne, x[ids[k], j], signe * delta_d)
+                ligne = self.model.getConstrByName(f"penibilite_max_{j}")
+                if delta_p and ligne is not None:
+                    self._modifier_coefficients(ligne, x[ids[k], j], delta_p)
+        
+        # Précédences: seules les lignes des arcs modifiés
+        arcs_avant = {(ids[p], ids[k]) for p, k in ancienne_instance.arcs()}
+        arcs_apres = {(ids[p], ids[k]) for p, k in instance.arcs()}
+        for arc in arcs_avant - arcs_apres:
+            for ligne in self.lignes_precedence.pop(arc):
+                self.model.remove(ligne)
+        self.instance = instance
+        ajoutes = [(instance.index[a], instance.index[b]) for a, b in arcs_apres - arcs_avant]
+        self._add_precedence(x, y, E0, L0, ajoutes)
+        
+        # Coupes de symétrie des tâches modifiées ou dont les arcs ont changé
+        touchees = modifiees | {t for arc in arcs_avant ^ arcs_apres for t in arc}
+        for cle, ligne in list(self.lignes_symetrie.items()):
+            invalide = bool(arcs_apres) if cle[0] == 'ordre_charges' else touchees.intersection(cle)
+            if invalide:
+                self.model.remove(ligne)
+                del self.lignes_symetrie[cle]
+        
+        temps_cycle_modifie = temps_cycle_max != self.temps_cycle_max
+        self.data = data
+        self.taches = nouvelles
+        self.temps_cycle_max = temps_cycle_max
+        
+        # Cliques et couvertures recalculées si les conflits ont changé (les
+        # paires trop longues pour un poste dépendent du temps de cycle max)
+        if 'contraintes_ergonomie' in data and (modifiees or temps_cycle_modifie):
+            if (instance.penibilites != ancienne_instance.penibilites).any() or self._cliques() != self.cliques:
+                for ligne in self.lignes_conflits:
+                    self.model.remove(ligne)
+                self.lignes_conflits = []
+                self._add_conflict_rows(x, range(1, self.n_postes_modele + 1),
+                                        self.variables['taches_poste'])
+        
+        # Objectif multi-critères: normalisations et pénibilités recalculées
+        if 'objectifs_multiples' in data and modifiees:
+            for j in range(1, self.n_postes_modele + 1):
+                for nom in (f"ecart_sup_{j}", f"ecart_inf_{j}"):
+                    self.model.remove(self.model.getConstrByName(nom))
+                self.model.remove(self.model.getVarByName(f"ecart_{j}"))
+            self.model.update()
+            self._set_multi_objective(x, self.variables['temps_cycle'], charge_poste,
+                                      range(1, self.n_postes_modele + 1),
+                                      self.variables['taches_poste'])
+        
+        self.model.getConstrByName("temps_cycle_max").RHS = temps_cycle_max
+        self.model.update()
+        self.n_postes = self.n_postes_modele
+        # Fenêtres vérifiées plus haut (E <= L): ne peut pas échouer
+        self.set_active_stations(n_postes)
+        return True
+    
+    def repair_solution(self, solution):
+        """
+        Répare une affectation (antérieure à une modification des données) en
+        solution de départ admissible pour le modèle courant
+        
+        Les tâches sont parcourues dans l'ordre topologique et gardent leur
+        ancien poste, décalé si nécessaire vers l'aval (précédence, fenêtre,
+        temps de cycle max, pénibilité, incompatibilités).
+        
+        Returns:
+            dict: solution de départ (clé 'affectations'), ou None
+        """
+        inst = self.instance
+        ancien = {t['id']: j for j, taches in solution['affectations'].items() for t in taches}
+        ergo = self.data.get('contraintes_ergonomie', {})
+        pen_max = ergo.get('penibilite_max_par_poste', float('inf'))
+        incompatibles = {frozenset(p) for p in ergo.get('taches_incompatibles', [])}
+        
+        charges = {j: 0.0 for j in range(1, self.n_postes + 1)}
+        penibilites = dict(charges)
+        contenus = {j: [] for j in charges}
+        poste = {}
+        for k in inst.ordre_topo.tolist():
+            i = inst.ids[k]
+            E, L = self.fenetres[i]
+            j = max([E, min(ancien.get(i, E), L)] + [poste[p] for p in inst.predecesseurs(k).tolist()])
+            while j <= L and (charges[j] + inst.durees[k] > self.temps_cycle_max + 1e-9
+                              or penibilites[j] + inst.penibilites[k] > pen_max + 1e-9
+                              or any(frozenset((i, t)) in incompatibles for t in contenus[j])):
+                j += 1
+            if j > L:
+                return None
+            poste[k] = j
+            charges[j] += inst.durees[k]
+            penibilites[j] += inst.penibilites[k]
+            contenus[j].append(i)
+        return {'affectations': {j: [{'id': i} for i in contenus[j]] for j in contenus}}
+    
+    def set_mip_start(self, solution):
+        """
+        Utilise une solution (heuristique ou précédente) comme point de départ
+        
+        Args:
+            solution: dictionnaire au format de solve() (clé 'affectations')
+        """
+        if self.model is None and not self.build_model():
+            return False
+        
+        x = self.variables['x']
+        poste_tache = {t['id']: j for j, taches in solution['affectations'].items()
+                       for t in taches}
+        if self.variables['y']:
+            for (i, j), var in self.variables['y'].items():
+                var.Start = 1.0 if poste_tache.get(i, j + 1) <= j else 0.0
+            return True
+        for (i, j), var in x.items():
+            var.Start = 1.0 if poste_tache.get(i) == j else 0.0
+        return True
+    
+    def solve(self, time_limit=300, mip_start=None, on_incumbent=None):
         """
         Résout le modèle
         
         Args:
             time_limit: temps limite en secondes
-            
+            mip_start: solution de départ optionnelle (voir set_mip_start)
+            on_incumbent: fonction appelée à chaque nouvelle meilleure solution
+                avec (solution, borne, gap), depuis le thread de résolution
+        
         Returns:
-            dict: solution avec affectations et statistiques
+            dict: solution avec affectations et statistiques ('interrompu'
+            vaut True si la résolution a été arrêtée par stop())
         """
         if self.model is None:
             success = self.build_model()
             if not success:
                 return None
         
+        if mip_start is not None:
+            self.set_mip_start(mip_start)
+        
         try:
             # Paramètres du solveur
             self.model.setParam('TimeLimit', time_limit)
             self.model.setParam('MIPGap', 0.01)  # Gap de 1%
             
-            # Résolution
-            self.model.optimize()
+            # Résolution (arrêt déjà demandé: la meilleure solution connue est
+            # celle du point de départ)
+            if self.arret_demande:
+                self.model.setParam('SolutionLimit', 1)
+            if on_incumbent is not None:
+                self.model.optimize(self._callback_incumbent(on_incumbent))
+            else:
+                self.model.optimize()
+            self.model.setParam('SolutionLimit', GRB.MAXINT)
+            # Le modèle peut être mis à jour et résolu à nouveau (update_data)
+            self.arret_demande = False
             
-            if self.model.status == GRB.OPTIMAL or self.model.status == GRB.TIME_LIMIT:
-                return self._extract_solution()
+            arretes = (GRB.TIME_LIMIT, GRB.INTERRUPTED, GRB.SOLUTION_LIMIT)
+            if self.model.status == GRB.OPTIMAL or (self.model.status in arretes
+                                                    and self.model.SolCount > 0):
+                solution = self._extract_solution()
+                solution['interrompu'] = self.model.status in (GRB.INTERRUPTED, GRB.SOLUTION_LIMIT)
+                return solution
             else:
                 print(f"Statut: {self.model.status}")
                 return None
-                
+        
         except Exception as e:
             print(f"Erreur résolution: {e}")
             return None
     
+    def stop(self):
+        """
+        Demande l'arrêt de la résolution en cours (appelable depuis un autre
+        thread); solve() renvoie alors la meilleure solution trouvée
+        """
+        self.arret_demande = True
+        if self.model is not None:
+            self.model.terminate()
+    
+    def _callback_incumbent(self, on_incumbent):
+        """
+        Callback Gurobi: chaque nouvelle solution entière est convertie au
+        format de solve() et transmise à on_incumbent avec la borne et le gap
+        """
+        variables = self.model.getVars()
+        
+        def callback(model, where):
+            if where != GRB.Callback.MIPSOL:
+                return
+            valeurs = model.cbGetSolution(variables)
+            
+            def valeur(expr):
+                if isinstance(expr, gp.LinExpr):
+                    return expr.getConstant() + sum(expr.getCoeff(i) * valeurs[expr.getVar(i).index]
+                                                    for i in range(expr.size()))
+                return valeurs[expr.index]
+            
+            objectif = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+            borne = model.cbGet(GRB.Callback.MIPSOL_OBJBND)
+            gap = (abs(objectif - borne) / max(abs(objectif), 1e-10)
+                   if abs(borne) < GRB.INFINITY else float('inf'))
+            solution = self._build_solution(valeur, objectif, gap,
+                                            model.cbGet(GRB.Callback.RUNTIME))
+            on_incumbent(solution, borne, gap)
+        
+        return callback
+    
+    @staticmethod
+    def _valeur(expr):
+        """Valeur d'une variable ou d'une expression linéaire (variables d'étape)"""
+        return expr.getValue() if isinstance(expr, gp.LinExpr) else expr.X
+    
     def _extract_solution(self):
         """
         Extrait la solution du modèle résolu
         """
+        solution = self._build_solution(
+            self._valeur, self.model.ObjVal,
+            self.model.MIPGap if hasattr(self.model, 'MIPGap') else 0,
+            self.model.Runtime
+        )
+        self.solution = solution
+        return solution
+    
+    def _build_solution(self, valeur, objectif, gap, temps_resolution):
+        """
+        Solution au format de solve() à partir des valeurs des variables
+        
+        Args:
+            valeur: fonction donnant la valeur d'une variable ou expression
+            objectif, gap, temps_resolution: statistiques de la résolution
+        """
         x = self.variables['x']
         temps_cycle = self.variables['temps_cycle']
         charge_poste = self.variables['charge_poste']
@@ -246,35 +1034,71 @@ class AssemblyLineOptimizer:
         for j in range(1, self.n_postes + 1):
             affectations[j] = []
         
-        tache_dict = {t['id']: t for t in self.taches}
+        inst = self.instance
         
-        for i in [t['id'] for t in self.taches]:
-            for j in range(1, self.n_postes + 1):
-                if x[i, j].X > 0.5:  # Variable binaire = 1
-                    affectations[j].append({
-                        'id': i,
-                        'nom': tache_dict[i]['nom'],
-                        'duree': tache_dict[i]['duree'],
-                        'penibilite': tache_dict[i].get('penibilite', 0)
-                    })
+        for (i, j), var in x.items():
+            if valeur(var) > 0.5:  # Variable binaire = 1
+                k = inst.index[i]
+                affectations[j].append({
+                    'id': i,
+                    'nom': inst.noms[k],
+                    'duree': self.taches[k]['duree'] if not inst.variantes else float(inst.durees[k]),
+                    'penibilite': self.taches[k].get('penibilite', 0)
+                })
         
         # Statistiques
         charges = {}
         for j in range(1, self.n_postes + 1):
-            charges[j] = charge_poste[j].X
+            charges[j] = valeur(charge_poste[j])
+        
+        # Critères du front de Pareto (voir add_pareto_criteria)
+        charge_moyenne = float(inst.durees.sum()) / self.n_postes
+        desequilibre = sum(abs(c - charge_moyenne) for c in charges.values())
+        penibilite_max = max(sum(t['penibilite'] for t in taches)
+                             for taches in affectations.values())
+        
+        # En multi-modèles ou durées aléatoires, le temps de cycle nominal
+        # n'est pas toujours minimisé
+        if inst.variantes or self.stochastique is not None:
+            cycle = max(charges.values())
+        else:
+            cycle = valeur(temps_cycle)
         
         solution = {
             'affectations': affectations,
-            'temps_cycle': temps_cycle.X,
+            'temps_cycle': cycle,
             'charges': charges,
-            'objectif': self.model.ObjVal,
-            'gap': self.model.MIPGap if hasattr(self.model, 'MIPGap') else 0,
-            'temps_resolution': self.model.Runtime,
+            'objectif': objectif,
+            'gap': gap,
+            'temps_resolution': temps_resolution,
+            'temps_construction': self.temps_construction,
             'n_postes': self.n_postes,
-            'efficacite': (sum(charges.values()) / (self.n_postes * temps_cycle.X)) * 100
+            'formulation': self.formulation_utilisee,
+            'desequilibre': desequilibre,
+            'penibilite_max': penibilite_max,
+            'efficacite': (sum(charges.values()) / (self.n_postes * cycle)) * 100
         }
         
-        self.solution = solution
+        # Multi-modèles: charge de chaque variante à chaque poste
+        if inst.variantes:
+            poste_tache = {t['id']: j for j, taches in affectations.items() for t in taches}
+            solution['charges_variantes'] = {
+                nom: {j: sum(float(inst.durees_variantes[v, k])
+                             for k in range(inst.n) if poste_tache[inst.ids[k]] == j)
+                      for j in affectations}
+                for v, nom in enumerate(inst.variantes)
+            }
+            solution['temps_cycle_pire'] = max(max(c.values())
+                                               for c in solution['charges_variantes'].values())
+        
+        # Durées aléatoires: distribution hors échantillon du temps de cycle
+        if self.stochastique is not None:
+            poste_tache = {t['id']: j for j, taches in affectations.items() for t in taches}
+            stats = self.stochastique.evaluer([poste_tache[i] for i in inst.ids], self.n_postes,
+                                              self.temps_cycle_max)
+            stats['cycle_quantile_modele'] = valeur(self.variables['temps_cycle_quantile'])
+            solution['stochastique'] = stats
+        
         return solution
     
     @staticmethod
@@ -0,0 +1,230 @@
+"""
+Front de Pareto (temps de cycle, déséquilibre, pénibilité) par epsilon-contrainte
+Sous-problèmes résolus en parallèle, démarrage à chaud et cache des points
+"""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+from gurobipy import GRB
+
+from solver.optimizer import AssemblyLineOptimizer
+
+
+CRITERES = ('temps_cycle', 'desequilibre', 'penibilite_max')
+
+# Modèles construits dans chaque processus: clé du scénario -> (optimiseur, critères)
+_MODELES = {}
+
+
+def _solve_epsilon(tache):
+    """
+    Résout un sous-problème epsilon-contrainte (exécuté dans un processus)
+    
+    Le modèle du scénario est construit une seule fois par processus du pool
+    de l'explorateur (conservé jusqu'à ParetoFrontExplorer.close); seuls les
+    seconds membres epsilon et l'objectif changent d'une tâche à l'autre.
+    
+    Args:
+        tache: dictionnaire (cle, data, objectif, eps, echelles, depart, time_limit)
+    
+    Returns:
+        ((objectif, eps), solution ou None)
+    """
+    cle = tache['cle']
+    if cle not in _MODELES:
+        optimiseur = AssemblyLineOptimizer(tache['data'])
+        criteres = optimiseur.add_pareto_criteria()
+        optimiseur.model.setParam('Threads', 1)
+        _MODELES[cle] = (optimiseur, criteres)
+    optimiseur, criteres = _MODELES[cle]
+    if criteres is None:
+        return (tache['objectif'], tache['eps']), None
+    
+    eps_desequilibre, eps_penibilite = tache['eps']
+    criteres['eps_desequilibre'].RHS = GRB.INFINITY if eps_desequilibre is None else eps_desequilibre
+    criteres['eps_penibilite'].RHS = GRB.INFINITY if eps_penibilite is None else eps_penibilite
+    
+    # Objectif augmenté: les autres critères départagent les solutions
+    # faiblement dominées
+    echelles = tache['echelles']
+    principal = tache['objectif']
+    objectif = criteres[principal] / echelles[principal]
+    for critere in CRITERES:
+        if critere != principal:
+            objectif += 1e-3 * criteres[critere] / echelles[critere]
+    optimiseur.model.setObjective(objectif, GRB.MINIMIZE)
+    
+    solution = optimiseur.solve(tache['time_limit'], mip_start=tache['depart'])
+    return (tache['objectif'], tache['eps']), solution
+
+
+class ParetoFrontExplorer:
+    """
+    Énumère les compromis non dominés (temps de cycle, déséquilibre,
+    pénibilité du poste le plus pénible) par la méthode epsilon-contrainte:
+    minimiser le temps de cycle sous déséquilibre <= e2 et pénibilité <= e3.
+    
+    Le pool de processus est créé au premier calcul et réutilisé (table des
+    gains puis grille epsilon) jusqu'à close(); utilisable avec with.
+    """
+    
+    # Points déjà résolus, partagés entre explorateurs:
+    # clé du scénario -> {(critère minimisé, (e2, e3)): solution}
+    _cache = {}
+    
+    def __init__(self, data, time_limit=30, max_workers=None):
+        """
+        Initialise l'explorateur
+        
+        Args:
+            data: dictionnaire du scénario (objectifs_multiples est ignoré)
+            time_limit: temps limite par sous-problème (secondes)
+            max_workers: nombre de processus (par défaut: un par cœur)
+        """
+        self.data = {k: v for k, v in data.items() if k != 'objectifs_multiples'}
+        self.time_limit = time_limit
+        self.max_workers = max_workers
+        self.cle = hashlib.sha1(json.dumps(self.data, sort_keys=True).encode('utf-8')).hexdigest()
+        self.points = self._cache.setdefault(self.cle, {})
+        self._executor = None
+        
+        durees = [t['duree'] for t in self.data['taches']]
+        penibilites = [t.get('penibilite', 0) for t in self.data['taches']]
+        self.echelles = {
+            'temps_cycle': max(sum(durees), 1),
+            'desequilibre': max(sum(durees), 1),
+            'penibilite_max': max(sum(penibilites), 1)
+        }
+    
+    def _depart(self, eps):
+        """
+        Solution résolue la plus proche de eps, de préférence admissible
+        pour ces seconds membres
+        """
+        candidats = [s for s in self.points.values() if s is not None]
+        if not candidats:
+            return None
+        
+        def distance(s):
+            return sum(abs(s[c] - e) / self.echelles[c]
+                       for c, e in zip(CRITERES[1:], eps) if e is not None)
+        
+        admissibles = [s for s in candidats
+                       if all(e is None or s[c] <= e + 1e-6 for c, e in zip(CRITERES[1:], eps))]
+        return min(admissibles or candidats, key=distance)
+    
+    def _pool(self):
+        """Pool de processus de l'explorateur, créé à la première utilisation"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def close(self):
+        """Arrête le pool de processus (et les modèles qu'ils conservent)"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _resoudre(self, taches):
+        """
+        Résout les sous-problèmes absents du cache dans un pool de processus
+        
+        Une tâche n'est soumise qu'au moment où un processus se libère, pour
+        qu'elle démarre depuis le point résolu le plus proche à cet instant.
+        """
+        en_attente = [t for t in taches if t not in self.points]
+        if not en_attente:
+            return
+        
+        executor = self._pool()
+        capacite = executor._max_workers
+        en_cours = set()
+        while en_attente or en_cours:
+            while en_attente and len(en_cours) < capacite:
+                objectif, eps = en_attente.pop(0)
+                en_cours.add(executor.submit(_solve_epsilon, {
+                    'cle': self.cle,
+                    'data': self.data,
+                    'objectif': objectif,
+                    'eps': eps,
+                    'echelles': self.echelles,
+                    'depart': self._depart(eps),
+                    'time_limit': self.time_limit
+                }))
+            termines, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+            for futur in termines:
+                cle, solution = futur.result()
+                self.points[cle] = solution
+    
+    def table_gains(self):
+        """
+        Table des gains: minimum de chaque critère pris seul
+        
+        Returns:
+            dict: critère -> solution correspondante (None si non résolue)
+        """
+        taches = [(c, (None, None)) for c in CRITERES]
+        self._resoudre(taches)
+        return {c: self.points.get((c, (None, None))) for c in CRITERES}
+    
+    def solve(self, n_points=4):
+        """
+        Calcule le front de Pareto
+        
+        Args:
+            n_points: nombre de valeurs d'epsilon par critère contraint
+        
+        Returns:
+            liste des solutions non dominées, triées par temps de cycle
+        """
+        gains = self.table_gains()
+        resolues = [s for s in gains.values() if s is not None]
+        if not resolues:
+            return []
+        
+        grilles = []
+        for critere in CRITERES[1:]:
+            ideal = min(s[critere] for s in resolues)
+            nadir = max(s[critere] for s in resolues)
+            valeurs = np.linspace(ideal, nadir, n_points)
+            if critere == 'penibilite_max' and self._penibilites_entieres():
+                # Scores entiers: pénibilité d'un poste entière, valeurs distinctes
+                # seulement (ideal et nadir sont déjà entiers)
+                valeurs = np.unique(np.round(valeurs))
+            grilles.append([round(float(v), 6) for v in valeurs])
+        
+        # Des seconds membres les plus lâches aux plus serrés
+        taches = [('temps_cycle', (e2, e3)) for e2 in reversed(grilles[0])
+                  for e3 in reversed(grilles[1])]
+        self._resoudre(taches)
+        return self.front()
+    
+    def _penibilites_entieres(self):
+        """Vrai si tous les scores de pénibilité sont entiers"""
+        return all(float(t.get('penibilite', 0)).is_integer() for t in self.data['taches'])
+    
+    def front(self):
+        """
+        Points non dominés parmi toutes les solutions en cache (sans nouvelle
+        résolution: permet de parcourir le front interactivement)
+        """
+        solutions = [s for s in self.points.values() if s is not None]
+        vecteurs = [tuple(round(s[c], 6) for c in CRITERES) for s in solutions]
+        front, vus = [], set()
+        for s, v in zip(solutions, vecteurs):
+            if v in vus:
+                continue
+            domine = any(all(w[c] <= v[c] for c in range(3)) and w != v for w in vecteurs)
+            if not domine:
+                vus.add(v)
+                front.append(s)
+        return sorted(front, key=lambda s: tuple(s[c] for c in CRITERES))
@@ -0,0 +1,219 @@
+"""
+Résolution exacte du SALBP-2 (nombre de postes fixé, temps de cycle minimal)
+Bornes inférieures, bissection sur le temps de cycle et oracle SALBP-1
+par séparation et évaluation (mémoïsation + dominance des charges maximales)
+"""
+
+import time
+
+from solver.heuristics import HeuristicLineBalancer
+
+
+class _TempsDepasse(Exception):
+    """Temps limite atteint pendant l'énumération des charges d'un poste"""
+
+
+class ExactSALBP2Solver:
+    """
+    Moteur exact alternatif au PLNE pour minimiser le temps de cycle
+    
+    Pour un temps de cycle candidat C, l'oracle cherche une affectation en au
+    plus n_postes postes (SALBP-1 de décision). La bissection entre la
+    meilleure borne inférieure et la solution heuristique donne le temps de
+    cycle optimal.
+    
+    Avec 'durees_stochastiques', l'optimalité porte sur les durées nominales
+    (voir HeuristicLineBalancer).
+    """
+    
+    def __init__(self, data):
+        """
+        Initialise le moteur exact
+        
+        Args:
+            data: dictionnaire contenant les tâches, postes, contraintes
+        """
+        self.data = data
+        self.heuristique = HeuristicLineBalancer(data)
+        self.n_postes = self.heuristique.n_postes
+        self.temps_cycle_max = self.heuristique.temps_cycle_max
+        self.instance = self.heuristique.instance
+        
+        # Rang topologique: chaque charge est énumérée dans l'ordre croissant des rangs
+        self.rang = [0] * self.instance.n
+        for r, k in enumerate(self.instance.ordre_topo):
+            self.rang[k] = r
+        
+        self.n_noeuds = 0
+        self.solution = None
+    
+    def bornes_inferieures(self):
+        """Bornes inférieures du temps de cycle (voir LineInstance.bornes_inferieures)"""
+        return self.instance.bornes_inferieures(self.n_postes)
+    
+    def _charges_maximales(self, C, affecte, disponibles, echeance=None):
+        """
+        Énumère les charges maximales d'un poste (aucune tâche disponible ne
+        peut plus y entrer), chaque ensemble une seule fois
+        
+        Returns:
+            liste de (charge, tâches) triée par charge décroissante
+        """
+        h = self.heuristique
+        d, pn = h.durees, h.penibilites
+        limite = C + 1e-9
+        charges = []
+        
+        def admissible(k, contenu, charge, pen):
+            return (charge + d[k] <= limite and pen + pn[k] <= h.pen_max
+                    and not h.incompatibles[k].intersection(contenu))
+        
+        def etendre(contenu, dispo, charge, pen, dernier):
+            if echeance is not None and time.time() > echeance:
+                raise _TempsDepasse()
+            extension = False
+            for k in dispo:
+                if not admissible(k, contenu, charge, pen):
+                    continue
+                extension = True
+                if self.rang[k] <= dernier:
+                    continue
+                nouveaux = [s for s in h.succs[k]
+                            if s not in affecte and all(p in affecte or p == k or p in contenu
+                                                        for p in h.preds[s])]
+                contenu.append(k)
+                etendre(contenu, [t for t in dispo if t != k] + nouveaux,
+                        charge + d[k], pen + pn[k], self.rang[k])
+                contenu.pop()
+            if not extension and contenu:
+                charges.append((charge, list(contenu)))
+        
+        etendre([], list(disponibles), 0.0, 0.0, -1)
+        charges.sort(key=lambda c: -c[0])
+        return charges
+    
+    def oracle(self, C, time_limit=None):
+        """
+        Existe-t-il une affectation en n_postes postes avec un temps de cycle C ?
+        
+        Séparation et évaluation orientée poste: chaque niveau remplit un poste
+        avec une charge maximale. Les ensembles de tâches déjà affectées qui
+        ont échoué sont mémorisés avec le nombre de postes utilisés.
+        
+        Returns:
+            (True, postes), (False, None), ou (None, None) si le temps limite
+            est atteint
+        """
+        h = self.heuristique
+        n, m = self.instance.n, self.n_postes
+        total = sum(h.durees)
+        if max(h.durees, default=0) > C + 1e-9 or total > m * C + 1e-9:
+            return False, None
+        
+        echecs = {}
+        limite = time.time() + time_limit if time_limit else None
+        inacheve = [False]
+        
+        def explorer(affecte, masque, reste, postes):
+            self.n_noeuds += 1
+            if len(affecte) == n:
+                return postes
+            utilises = len(postes)
+            if utilises >= m or reste > (m - utilises) * C + 1e-9:
+                return None
+            if echecs.get(masque, m + 1) <= utilises:
+                return None
+            if limite is not None and time.time() > limite:
+                inacheve[0] = True
+                return None
+            
+            disponibles = [k for k in range(n) if k not in affecte
+                           and all(p in affecte for p in h.preds[k])]
+            try:
+                charges = self._charges_maximales(C, affecte, disponibles, limite)
+            except _TempsDepasse:
+                inacheve[0] = True
+                return None
+            for charge, contenu in charges:
+                # Le temps mort cumulé ne peut dépasser m*C - durée totale
+                if reste - charge > (m - utilises - 1) * C + 1e-9:
+                    break
+                nouveau = affecte | set(contenu)
+                resultat = explorer(nouveau, masque | sum(1 << k for k in contenu),
+                                    reste - charge, postes + [contenu])
+                if resultat is not None:
+                    return resultat
+                if inacheve[0]:
+                    return None
+            echecs[masque] = min(echecs.get(masque, m + 1), utilises)
+            return None
+        
+        postes = explorer(set(), 0, total, [])
+        if postes is not None:
+            return True, postes
+        return (None, None) if inacheve[0] else (False, None)
+    
+    def solve(self, time_limit=300):
+        """
+        Bissection sur le temps de cycle avec l'oracle exact
+        
+        Args:
+            time_limit: temps limite global en secondes
+        
+        Returns:
+            dict: solution au format de AssemblyLineOptimizer.solve, ou None
+        """
+        debut = time.time()
+        self.n_noeuds = 0
+        try:
+            bornes = self.bornes_inferieures()
+            bas = bornes['LB']
+            # Borne supérieure: meilleure solution heuristique (RPW, COMSOAL, tabou)
+            depart = self.heuristique.solve()
+            postes = None
+            if depart is not None:
+                postes = [[self.instance.index[t['id']] for t in depart['affectations'][j]]
+                          for j in sorted(depart['affectations'])]
+                haut = depart['temps_cycle']
+            if postes is None:
+                # Aucune affectation heuristique: partir de la durée totale
+                haut = sum(self.heuristique.durees)
+                ok, postes = self.oracle(haut)
+                if not ok:
+                    print("SALBP-2: aucune affectation admissible")
+                    return None
+            prouve = True
+            entiers = self.heuristique.entiers
+            precision = 1 if entiers else 1e-3 * max(bas, 1)
+            
+            while haut - bas >= precision - (1e-9 if entiers else 0) and haut > bas:
+                milieu = (bas + haut) // 2 if entiers else (bas + haut) / 2
+                restant = time_limit - (time.time() - debut)
+                if restant <= 0:
+                    prouve = False
+                    break
+                ok, resultat = self.oracle(milieu, restant)
+                if ok:
+                    postes = resultat
+                    haut = self.heuristique._temps_cycle(resultat)
+                elif ok is None:
+                    prouve = False
+                    break
+                else:
+                    bas = milieu + 1 if entiers else milieu
+        except Exception as e:
+            print(f"Erreur SALBP-2: {e}")
+            return None
+        
+        if haut > self.temps_cycle_max + 1e-9:
+            print(f"SALBP-2: temps de cycle optimal {haut} supérieur au maximum {self.temps_cycle_max}")
+            return None
+        
+        solution = self.heuristique.solution_from_postes(postes, time.time() - debut)
+        solution['gap'] = 0.0 if prouve else (haut - bas) / haut
+        solution['methode'] = (('SALBP-2 exact' if prouve else 'SALBP-2 (temps limite)')
+                               + self.heuristique.suffixe_methode())
+        solution['bornes_inferieures'] = bornes
+        solution['n_noeuds'] = self.n_noeuds
+        self.solution = solution
+        return solution
@@ -0,0 +1,141 @@
+"""
+Durées de tâches aléatoires (section 'durees_stochastiques' du scénario)
+Échantillonnage des scénarios de durées, réduction pour le PLNE (SAA) et
+évaluation vectorisée des affectations sur des milliers de scénarios
+"""
+
+import numpy as np
+
+
+# Lois disponibles pour les durées
+#   lognormale:   moyenne = duree, coefficient de variation par tâche ou global
+#   triangulaire: mode = duree, bornes duree_min / duree_max par tâche
+#                 (par défaut duree * (1 -/+ variation))
+LOIS = ('lognormale', 'triangulaire')
+
+
+class StochasticDurations:
+    """
+    Modèle de durées aléatoires indépendantes d'une ligne
+    
+    Les paramètres de chaque loi sont compilés en tableaux (une entrée par
+    tâche, dans l'ordre de LineInstance) pour tirer tous les scénarios en
+    une seule opération.
+    """
+    
+    def __init__(self, taches, config):
+        """
+        Args:
+            taches: liste des tâches du scénario
+            config: section 'durees_stochastiques' (loi, coefficient_variation,
+                variation, quantile, scenarios_modele, scenarios_evaluation,
+                graine)
+        """
+        self.config = config
+        self.loi = config.get('loi', 'lognormale')
+        if self.loi not in LOIS:
+            raise ValueError(f"Loi de durée inconnue: {self.loi}")
+        self.quantile = config.get('quantile', 0.9)
+        if not 0 < self.quantile < 1:
+            raise ValueError(f"Quantile hors de ]0, 1[: {self.quantile}")
+        self.graine = config.get('graine', 0)
+        
+        self.durees = np.array([t['duree'] for t in taches], dtype=float)
+        cv = config.get('coefficient_variation', 0.15)
+        self.cv = np.array([t.get('coefficient_variation', cv) for t in taches], dtype=float)
+        variation = config.get('variation', 0.2)
+        self.bas = np.array([t.get('duree_min', t['duree'] * (1 - variation)) for t in taches],
+                            dtype=float)
+        self.haut = np.array([t.get('duree_max', t['duree'] * (1 + variation)) for t in taches],
+                             dtype=float)
+        if (self.bas > self.durees).any() or (self.haut < self.durees).any():
+            raise ValueError("duree_min <= duree <= duree_max requis pour chaque tâche")
+    
+    def echantillonner(self, n_scenarios, graine=None):
+        """
+        Tire n_scenarios scénarios de durées
+        
+        Returns:
+            ndarray (scénarios x tâches)
+        """
+        rng = np.random.default_rng(self.graine if graine is None else graine)
+        if self.loi == 'lognormale':
+            sigma = np.sqrt(np.log1p(self.cv ** 2))
+            normales = rng.standard_normal((n_scenarios, len(self.durees)))
+            # Moyenne exacte: exp(mu + sigma^2 / 2) = duree
+            return self.durees * np.exp(sigma * normales - sigma ** 2 / 2)
+        
+        # Triangulaire par inversion de la fonction de répartition
+        a, c, b = self.bas, self.durees, self.haut
+        u = rng.random((n_scenarios, len(c)))
+        largeur = b - a
+        with np.errstate(divide='ignore', invalid='ignore'):
+            seuil = np.where(largeur > 0, (c - a) / largeur, 0.0)
+        gauche = a + np.sqrt(u * largeur * (c - a))
+        droite = b - np.sqrt((1 - u) * largeur * (b - c))
+        return np.where(u < seuil, gauche, droite)
+    
+    def scenarios_reduits(self, n_scenarios, taille_echantillon=None):
+        """
+        Jeu réduit de scénarios pour le PLNE: un grand échantillon est trié
+        par durée totale et découpé en n_scenarios strates de même
+        probabilité; le scénario médian de chaque strate est retenu
+        
+        Returns:
+            ndarray (n_scenarios x tâches)
+        """
+        taille = taille_echantillon or max(20 * n_scenarios, 1000)
+        D = self.echantillonner(taille)
+        ordre = np.argsort(D.sum(axis=1))
+        rangs = ((np.arange(n_scenarios) + 0.5) * taille / n_scenarios).astype(int)
+        return D[ordre[rangs]]
+    
+    @staticmethod
+    def charges(D, postes, n_postes):
+        """
+        Charges des postes dans chaque scénario
+        
+        Args:
+            D: durées (scénarios x tâches)
+            postes: poste (1..n_postes) de chaque tâche, vecteur (tâches) ou
+                matrice (affectations x tâches)
+        
+        Returns:
+            ndarray (scénarios x postes), ou (affectations x scénarios x postes)
+        """
+        affectation = np.eye(n_postes)[np.asarray(postes) - 1]
+        if affectation.ndim == 2:
+            return D @ affectation
+        return np.einsum('sn,anm->asm', D, affectation)
+    
+    def evaluer(self, postes, n_postes, temps_cycle_max=None, n_scenarios=None, graine=None):
+        """
+        Distribution hors échantillon du temps de cycle d'une ou plusieurs
+        affectations (scénarios indépendants de ceux du PLNE)
+        
+        Returns:
+            dict (ou liste de dict): temps de cycle au quantile, moyen, maximal,
+            probabilité de dépasser temps_cycle_max et valeurs triées des temps
+            de cycle simulés
+        """
+        n_scenarios = n_scenarios or self.config.get('scenarios_evaluation', 5000)
+        graine = self.graine + 1 if graine is None else graine
+        D = self.echantillonner(n_scenarios, graine)
+        cycles = self.charges(D, postes, n_postes).max(axis=-1)
+        cycles.sort(axis=-1)
+        
+        def resume(c):
+            stats = {
+                'quantile': self.quantile,
+                'cycle_quantile': float(np.quantile(c, self.quantile)),
+                'cycle_moyen': float(c.mean()),
+                'cycle_max': float(c[-1]),
+                'cycles': c.tolist()
+            }
+            if temps_cycle_max is not None:
+                stats['probabilite_depassement'] = float((c > temps_cycle_max + 1e-9).mean())
+            return stats
+        
+        if cycles.ndim == 1:
+            return resume(cycles)
+        return [resume(c) for c in cycles]
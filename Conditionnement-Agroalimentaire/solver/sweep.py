@@ -0,0 +1,146 @@
+"""
+Balayage du nombre de postes: courbe temps de cycle / nombre de postes
+Un seul modèle PLNE (construit pour le plus grand nombre de postes) est
+restreint successivement; chaque résolution démarre de la précédente
+"""
+
+import time
+
+from solver.instance import LineInstance
+from solver.optimizer import AssemblyLineOptimizer
+
+
+class StationSweep:
+    """
+    Résout le SALBP-2 pour chaque nombre de postes d'un intervalle
+    """
+    
+    def __init__(self, data, time_limit=60):
+        """
+        Initialise le balayage
+        
+        Args:
+            data: dictionnaire du scénario (objectifs_multiples est ignoré:
+                la courbe porte sur le temps de cycle)
+            time_limit: temps limite par nombre de postes (secondes)
+        """
+        self.data = {k: v for k, v in data.items() if k != 'objectifs_multiples'}
+        self.time_limit = time_limit
+        self.temps_cycle_max = self.data.get('temps_cycle_max', 100)
+        self.instance = LineInstance.compiler(self.data['taches'], self.data.get('modeles_mixtes'))
+        self.rang = {self.instance.ids[k]: r for r, k in enumerate(self.instance.ordre_topo)}
+        
+        ergo = self.data.get('contraintes_ergonomie', {})
+        self.pen_max = ergo.get('penibilite_max_par_poste', float('inf'))
+        self.incompatibles = {frozenset(p) for p in ergo.get('taches_incompatibles', [])}
+        self.courbe = []
+    
+    def _diviser(self, postes):
+        """
+        Départ pour un poste de plus: le poste le plus chargé est coupé en deux
+        (ordre topologique, coupure qui minimise la plus grande des deux charges)
+        """
+        j = max(range(len(postes)), key=lambda p: sum(t['duree'] for t in postes[p]))
+        taches = sorted(postes[j], key=lambda t: self.rang[t['id']])
+        if len(taches) < 2:
+            return postes + [[]]
+        total = sum(t['duree'] for t in taches)
+        cumul, meilleure, coupure = 0, None, 1
+        for c in range(1, len(taches)):
+            cumul += taches[c - 1]['duree']
+            valeur = max(cumul, total - cumul)
+            if meilleure is None or valeur < meilleure:
+                meilleure, coupure = valeur, c
+        return postes[:j] + [taches[:coupure], taches[coupure:]] + postes[j + 1:]
+    
+    def _fusionner(self, postes):
+        """
+        Départ pour un poste de moins: fusion des deux postes adjacents de
+        plus faible charge cumulée qui respectent les contraintes d'ergonomie
+        """
+        candidats = []
+        for j in range(len(postes) - 1):
+            fusion = postes[j] + postes[j + 1]
+            ids = {t['id'] for t in fusion}
+            if sum(t['penibilite'] for t in fusion) > self.pen_max:
+                continue
+            if any(p <= ids for p in self.incompatibles):
+                continue
+            candidats.append((sum(t['duree'] for t in fusion), j))
+        if not candidats:
+            return None
+        _, j = min(candidats)
+        return postes[:j] + [postes[j] + postes[j + 1]] + postes[j + 2:]
+    
+    def _depart(self, precedente, n_postes):
+        """Solution de départ dérivée de la solution au nombre de postes voisin"""
+        if precedente is None:
+            return None
+        postes = [precedente['affectations'][j] for j in sorted(precedente['affectations'])]
+        postes = [p for p in postes if p]
+        while postes is not None and len(postes) < n_postes:
+            postes = self._diviser(postes)
+        while postes is not None and len(postes) > n_postes:
+            postes = self._fusionner(postes)
+        if postes is None:
+            return None
+        return {'affectations': {j + 1: p for j, p in enumerate(postes)}}
+    
+    def solve(self, m_min, m_max, decroissant=False):
+        """
+        Calcule la courbe temps de cycle / nombre de postes
+        
+        Args:
+            m_min, m_max: intervalle du nombre de postes
+            decroissant: parcourt les nombres de postes du plus grand au plus petit
+        
+        Returns:
+            liste de points (dict) triés par nombre de postes: 'n_postes',
+            'statut' ('optimal', 'limite', 'infaisable', 'elague', 'sature'),
+            'temps_cycle', 'borne_inferieure', 'temps_resolution', 'solution'
+        """
+        debut = time.time()
+        bornes = {m: self.instance.bornes_inferieures(m)['LB'] for m in range(m_min, m_max + 1)}
+        duree_max = float(self.instance.durees.max()) if self.instance.n else 0.0
+        
+        # Nombres de postes dont la borne inférieure dépasse déjà le temps de cycle max
+        admissibles = [m for m in range(m_min, m_max + 1) if bornes[m] <= self.temps_cycle_max + 1e-9]
+        points = {m: {'n_postes': m, 'statut': 'elague', 'temps_cycle': None,
+                      'borne_inferieure': bornes[m], 'temps_resolution': 0.0, 'solution': None}
+                  for m in range(m_min, m_max + 1)}
+        if not admissibles:
+            self.courbe = [points[m] for m in sorted(points)]
+            return self.courbe
+        
+        data = dict(self.data, nombre_postes=max(admissibles))
+        optimiseur = AssemblyLineOptimizer(data, instance=self.instance)
+        if not optimiseur.build_model():
+            self.courbe = [points[m] for m in sorted(points)]
+            return self.courbe
+        
+        precedente = None
+        for m in sorted(admissibles, reverse=decroissant):
+            point = points[m]
+            # Temps de cycle égal à la plus longue tâche: plus de postes n'y change rien
+            if (not decroissant and precedente is not None
+                    and precedente['temps_cycle'] <= duree_max + 1e-9):
+                point.update(statut='sature', temps_cycle=precedente['temps_cycle'],
+                             solution=precedente)
+                continue
+            
+            if not optimiseur.set_active_stations(m):
+                point['statut'] = 'infaisable'
+                continue
+            solution = optimiseur.solve(self.time_limit, mip_start=self._depart(precedente, m))
+            if solution is None:
+                point['statut'] = 'infaisable'
+                continue
+            point.update(statut='optimal' if solution['gap'] <= 0.01 + 1e-9 else 'limite',
+                         temps_cycle=solution['temps_cycle'],
+                         temps_resolution=solution['temps_resolution'],
+                         solution=solution)
+            precedente = solution
+        
+        self.temps_total = time.time() - debut
+        self.courbe = [points[m] for m in sorted(points)]
+        return self.courbe
@@ -0,0 +1,108 @@
+"""
+Mise à jour du PLNE sur place (AssemblyLineOptimizer.update_data)
+"""
+
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver.optimizer import AssemblyLineOptimizer, FORMULATIONS
+
+
+def scenario():
+    """A indépendante, chaîne B1 -> B2 -> B3 (une tâche B par poste au plus)"""
+    return {
+        'nombre_postes': 4,
+        'temps_cycle_max': 60,
+        'taches': [
+            {'id': 1, 'nom': 'A', 'duree': 10, 'prerequis': []},
+            {'id': 2, 'nom': 'B1', 'duree': 30, 'prerequis': []},
+            {'id': 3, 'nom': 'B2', 'duree': 30, 'prerequis': [2]},
+            {'id': 4, 'nom': 'B3', 'duree': 30, 'prerequis': [3]}
+        ]
+    }
+
+
+def poste_de(solution, tache_id):
+    """Poste d'une tâche dans la solution"""
+    for poste, taches in solution['affectations'].items():
+        if any(t['id'] == tache_id for t in taches):
+            return int(poste)
+    raise AssertionError(f"tâche {tache_id} non affectée")
+
+
+@pytest.mark.parametrize('formulation', FORMULATIONS)
+def test_precedence_ajoutee_hors_fenetre(formulation):
+    """
+    B3 devient prérequis de A: la fenêtre du modèle de A commence avant
+    celle de B3, les lignes de l'arc ajouté ne doivent lire que des
+    variables existantes
+    """
+    optimiseur = AssemblyLineOptimizer(scenario(), formulation)
+    assert optimiseur.solve(30) is not None
+    
+    data = copy.deepcopy(scenario())
+    data['taches'][0]['prerequis'] = [4]
+    assert optimiseur.update_data(data)
+    solution = optimiseur.solve(30)
+    
+    reference = AssemblyLineOptimizer(copy.deepcopy(data), formulation).solve(30)
+    assert solution['temps_cycle'] == pytest.approx(reference['temps_cycle'])
+    assert poste_de(solution, 1) >= poste_de(solution, 4)
+
+
+@pytest.mark.parametrize('formulation', FORMULATIONS)
+def test_cliques_recalculees_avec_temps_cycle(formulation):
+    """
+    Les paires de tâches trop longues pour un poste dépendent du temps de
+    cycle max: le remonter sans modifier de tâche doit relâcher les cliques
+    """
+    data = {
+        'nombre_postes': 2,
+        'temps_cycle_max': 100,
+        'contraintes_ergonomie': {'taches_incompatibles': []},
+        'taches': [
+            {'id': 1, 'nom': 'A', 'duree': 40, 'prerequis': []},
+            {'id': 2, 'nom': 'B', 'duree': 40, 'prerequis': []},
+            {'id': 3, 'nom': 'C', 'duree': 70, 'prerequis': []}
+        ]
+    }
+    optimiseur = AssemblyLineOptimizer(copy.deepcopy(data), formulation)
+    assert optimiseur.solve(30)['temps_cycle'] == pytest.approx(80)
+    
+    resserre = copy.deepcopy(data)
+    resserre['temps_cycle_max'] = 75
+    resserre['taches'][2]['duree'] = 71
+    assert optimiseur.update_data(resserre)
+    assert optimiseur.solve(30) is None
+    
+    # Durées inchangées: seul le temps de cycle max relâche la paire A-B
+    relache = copy.deepcopy(resserre)
+    relache['temps_cycle_max'] = 100
+    assert optimiseur.update_data(relache)
+    assert optimiseur.solve(30)['temps_cycle'] == pytest.approx(80)
+    assert AssemblyLineOptimizer(relache, formulation).solve(30)['temps_cycle'] == pytest.approx(80)
+
+
+def test_nombre_postes_multi_criteres_refuse():
+    """
+    Normalisation multi-critères liée au nombre de postes: reconstruction
+    demandée, optimiseur inchangé
+    """
+    chemin = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'data', 'scenario_complexe.json')
+    with open(chemin, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    optimiseur = AssemblyLineOptimizer(copy.deepcopy(data))
+    avant = optimiseur.solve(60)
+    
+    moins_de_postes = copy.deepcopy(data)
+    moins_de_postes['nombre_postes'] -= 1
+    assert not optimiseur.update_data(moins_de_postes)
+    assert optimiseur.data == data
+    assert optimiseur.solve(60)['objectif'] == pytest.approx(avant['objectif'])
@@ -16,9 +16,19 @@ class GraphCanvas(FigureCanvasQTAgg):
         self.axes = fig.add_subplot(111)
         super().__init__(fig)
         self.setParent(parent)
+    
+    def plot_graph(self, nodes, arcs, flows=None, sensitivity=None, overlay='flows'):
+        """
+        Dessine le graphe avec les flux
+        
+        Avec l'analyse de sensibilité (FlowSession.sensitivity), overlay
+        choisit la surcouche: 'flows' (flux seuls), 'potentials'
+        (potentiels des nœuds, coûts réduits des arcs hors base) ou
+        'ranging' (plages d'offre/demande et de coût)
+        """
+        if sensitivity is None:
+            overlay = 'flows'
         
-    def plot_graph(self, nodes, arcs, flows=None):
-        """Dessine le graphe avec les flux"""
         self.axes.clear()
         G = nx.DiGraph()
         
@@ -27,10 +37,17 @@ class GraphCanvas(FigureCanvasQTAgg):
         pos = {}
         labels = {}
         
-        for node in nodes:
+        for i, node in enumerate(nodes):
             G.add_node(node['id'])
             pos[node['id']] = (node.get('x', 0), node.get('y', 0))
             labels[node['id']] = f"{node['name']}\n({node['supply']:+.0f})"
+            if overlay == 'potentials':
+                labels[node['id']] += f"\nπ={sensitivity['potentials'][i]:+.2f}"
+            elif overlay == 'ranging' and node['id'] == sensitivity['reference']:
+                labels[node['id']] += "\nréférence"
+            elif overlay == 'ranging':
+                labels[node['id']] += "\n" + self._interval(sensitivity['supply_low'][i],
+                                                            sensitivity['supply_up'][i], '.0f')
             
             if node['type'] == 'source':
                 node_colors.append('#10B981')
@@ -56,6 +73,18 @@ class GraphCanvas(FigureCanvasQTAgg):
                 width = 1
                 color = '#9CA3AF'
             
+            if overlay == 'potentials':
+                reduced = sensitivity['reduced_costs'][idx]
+                if reduced < -1e-9:
+                    # Arc saturé: gain par unité de capacité supplémentaire
+                    label += f"\nrc={reduced:+.2f}"
+                    color = '#F59E0B'
+                elif reduced > 1e-9:
+                    label += f"\nrc={reduced:+.2f}"
+            elif overlay == 'ranging':
+                label += "\nc∈" + self._interval(sensitivity['cost_low'][idx],
+                                                 sensitivity['cost_up'][idx], '.2f')
+            
             edge_labels[(arc['from'], arc['to'])] = label
             edge_widths.append(width)
             edge_colors.append(color)
@@ -73,5 +102,12 @@ class GraphCanvas(FigureCanvasQTAgg):
         self.axes.set_title("Réseau de Flux de Pollution", fontsize=14)
         self.axes.axis('off')
         self.draw()
+    
+    @staticmethod
+    def _interval(low, up, fmt):
+        """Plage [low, up] (bornes infinies affichées ∞)"""
+        def borne(v):
+            return ("-∞" if v < 0 else "+∞") if abs(v) == float('inf') else format(v, fmt)
+        return f"[{borne(low)}, {borne(up)}]"
 
 
@@ -5,7 +5,8 @@
 import json
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import Qt
-from solver.optimizer import OptimizationThread
+from solver.optimizer import OptimizationThread, FlowSession, gp
+from solver.network import is_multicommodity
 from gui.graph_canvas import GraphCanvas
 
 class MainWindow(QMainWindow):
@@ -16,9 +17,14 @@ class MainWindow(QMainWindow):
         self.nodes = []
         self.arcs = []
         self.results = None
+        # Modèle Gurobi conservé entre les résolutions (réoptimisation à chaud)
+        self.session = None
+        # Révision du réseau, incrémentée à chaque modification: un résultat
+        # calculé sur une révision antérieure est écarté
+        self.revision = 0
         self.init_ui()
         self.load_default_data()
-        
+    
     def init_ui(self):
         """Interface utilisateur"""
         self.setWindowTitle("Flux de Pollution - Système Hydrique")
@@ -55,6 +61,28 @@ class MainWindow(QMainWindow):
             QPushButton:hover { background: #2563EB; }
         """)
         
+        self.engine_combo = QComboBox()
+        if gp is not None:
+            self.engine_combo.addItem("Gurobi (PL)", 'gurobi')
+        self.engine_combo.addItem("Simplexe réseau", 'network_simplex')
+        if gp is not None:
+            self.engine_combo.addItem("Génération de colonnes (multi-polluants)",
+                                      'column_generation')
+        
+        # Analyse de sensibilité (Gurobi seulement) et surcouche du graphe
+        self.sensitivity_check = QCheckBox("Analyse de sensibilité")
+        self.sensitivity_check.setToolTip(
+            "Potentiels des nœuds, coûts réduits et plages de coût/offre")
+        self.engine_combo.currentIndexChanged.connect(
+            lambda: self.sensitivity_check.setEnabled(self.engine_combo.currentData() == 'gurobi'))
+        self.sensitivity_check.setEnabled(self.engine_combo.currentData() == 'gurobi')
+        
+        self.overlay_combo = QComboBox()
+        self.overlay_combo.addItem("Flux", 'flows')
+        self.overlay_combo.addItem("Potentiels / coûts réduits", 'potentials')
+        self.overlay_combo.addItem("Plages (offre, coût)", 'ranging')
+        self.overlay_combo.currentIndexChanged.connect(self.update_graph)
+        
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         
@@ -64,6 +92,11 @@ class MainWindow(QMainWindow):
         import_btn = QPushButton("📂 Importer")
         import_btn.clicked.connect(self.import_data)
         
+        action_layout.addWidget(QLabel("Moteur:"))
+        action_layout.addWidget(self.engine_combo)
+        action_layout.addWidget(self.sensitivity_check)
+        action_layout.addWidget(QLabel("Affichage:"))
+        action_layout.addWidget(self.overlay_combo)
         action_layout.addWidget(self.solve_btn)
         action_layout.addWidget(self.progress_bar)
         action_layout.addWidget(export_btn)
@@ -101,10 +134,11 @@ class MainWindow(QMainWindow):
         layout.addLayout(btn_layout)
         
         self.nodes_table = QTableWidget()
-        self.nodes_table.setColumnCount(4)
+        self.nodes_table.setColumnCount(5)
         self.nodes_table.setHorizontalHeaderLabels(
-            ["Nom", "Type", "Offre/Demande", "Pos X"]
+            ["Nom", "Type", "Offre/Demande", "Pos X", "Polluant"]
         )
+        self.nodes_table.itemChanged.connect(self.on_node_edited)
         layout.addWidget(self.nodes_table)
         return tab
     
@@ -119,10 +153,11 @@ class MainWindow(QMainWindow):
         layout.addLayout(btn_layout)
         
         self.arcs_table = QTableWidget()
-        self.arcs_table.setColumnCount(4)
+        self.arcs_table.setColumnCount(5)
         self.arcs_table.setHorizontalHeaderLabels(
-            ["De", "Vers", "Coût", "Capacité"]
+            ["De", "Vers", "Coût", "Capacité", "Polluant"]
         )
+        self.arcs_table.itemChanged.connect(self.on_arc_edited)
         layout.addWidget(self.arcs_table)
         return tab
     
@@ -145,6 +180,15 @@ class MainWindow(QMainWindow):
         <p><b>Conservation:</b> Σx<sub>ij</sub> - Σx<sub>ji</sub> = b<sub>i</sub></p>
         <p><b>Capacité:</b> 0 ≤ x<sub>ij</sub> ≤ u<sub>ij</sub></p>
         <p><b>Équilibre:</b> Σb<sub>i</sub> = 0</p>
+        
+        <h3>Multi-polluants</h3>
+        <p>Un nœud d'offre/demande porte un polluant k; un arc sans polluant
+        est partagé, un arc avec polluant n'est ouvert qu'à celui-ci.</p>
+        <p><b>Conservation:</b> Σx<sub>ijk</sub> - Σx<sub>jik</sub> = b<sub>ik</sub> pour chaque k</p>
+        <p><b>Capacité partagée:</b> Σ<sub>k</sub> x<sub>ijk</sub> ≤ u<sub>ij</sub></p>
+        <p><b>Génération de colonnes:</b> flux λ<sub>p</sub> sur des chemins source → puits,
+        chemins ajoutés par plus courts chemins (un sous-problème par polluant,
+        résolus en parallèle)</p>
         """)
         layout.addWidget(text)
         return tab
@@ -174,45 +218,107 @@ class MainWindow(QMainWindow):
     
     def solve_optimization(self):
         """Lance Gurobi"""
-        total = sum(n['supply'] for n in self.nodes)
-        if abs(total) > 0.001:
-            QMessageBox.warning(self, "Erreur", 
-                f"Somme offres/demandes ≠ 0 ({total:.2f})")
-            return
+        # Équilibre par polluant (un seul bilan sans champ 'pollutant')
+        totals = {}
+        for n in self.nodes:
+            totals[n.get('pollutant')] = totals.get(n.get('pollutant'), 0) + n['supply']
+        for pollutant, total in totals.items():
+            if abs(total) > 0.001:
+                label = f" pour {pollutant}" if pollutant is not None else ""
+                QMessageBox.warning(self, "Erreur", 
+                    f"Somme offres/demandes ≠ 0{label} ({total:.2f})")
+                return
         
         self.solve_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
         
-        self.opt_thread = OptimizationThread(self.nodes, self.arcs)
+        engine = self.engine_combo.currentData()
+        if engine == 'gurobi' and self.session is None:
+            self.session = FlowSession()
+        
+        # Copies: les tables restent modifiables pendant la résolution
+        self.opt_thread = OptimizationThread([dict(n) for n in self.nodes],
+                                             [dict(a) for a in self.arcs], engine,
+                                             self.session if engine == 'gurobi' else None,
+                                             self.sensitivity_check.isChecked())
         self.opt_thread.finished.connect(self.on_finished)
         self.opt_thread.error.connect(self.on_error)
         self.opt_thread.progress.connect(self.progress_bar.setValue)
+        self.opt_thread.revision = self.revision
         self.opt_thread.start()
     
     def on_finished(self, results):
         """Affiche résultats"""
-        self.results = results
         self.solve_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
+        if self.opt_thread.revision != self.revision:
+            # Réseau modifié pendant la résolution: flux d'un autre réseau
+            self.results_text.setHtml("✏️ <b>Réseau modifié pendant la résolution</b><br>"
+                                      "Relancer la résolution pour mettre à jour les flux")
+            return
+        self.results = results
         
         if results['status'] == 'optimal':
             text = f"✅ <b>Optimal</b><br><br>"
-            text += f"<b>Coût:</b> {results['objective']:.2f} €<br><br>"
+            text += f"<b>Coût:</b> {results['objective']:.2f} €<br>"
+            if results.get('engine') == 'network_simplex':
+                text += f"Simplexe réseau: {results['iterations']} pivots<br>"
+            elif results.get('engine') == 'column_generation':
+                text += (f"Génération de colonnes: {results['iterations']} itérations, "
+                         f"{results['columns']} chemins générés<br>")
+            elif results.get('warm_start'):
+                text += (f"Réoptimisation à chaud: {results['edits']} modification(s), "
+                         f"{results['iterations']} itérations du simplexe<br>")
+            text += "<br>"
             
             for d in results['arc_details']:
                 if d['flow'] > 0.01:
                     text += f"<b>{d['from']} → {d['to']}</b><br>"
                     text += f"Flux: {d['flow']:.2f}/{d['capacity']:.0f}<br>"
+                    if 'pollutants' in d and list(d['pollutants']) != [None]:
+                        text += "Polluants: " + ", ".join(
+                            f"{p if p is not None else '-'} {f:.2f}"
+                            for p, f in d['pollutants'].items()) + "<br>"
                     text += f"Coût: {d['total_cost']:.2f} €<br><br>"
             
+            if 'sensitivity' in results:
+                text += self.sensitivity_report(results['sensitivity'])
+            elif self.opt_thread.sensitivity and self.opt_thread.engine == 'gurobi':
+                reason = (": réservée aux réseaux à un seul polluant"
+                          if is_multicommodity(self.nodes, self.arcs) else "")
+                text += f"<i>Analyse de sensibilité non disponible{reason}</i><br><br>"
+            
             self.results_text.setHtml(text)
             self.update_graph()
         else:
             self.results_text.setHtml("❌ <b>Pas de solution</b>")
     
+    def sensitivity_report(self, sensitivity):
+        """Résumé HTML de l'analyse de sensibilité"""
+        names = {n['id']: n['name'] for n in self.nodes}
+        text = "<b>Analyse de sensibilité</b><br>"
+        text += f"Référence: {names[sensitivity['reference']]} (π = 0)<br><br>"
+        
+        text += "<b>Coût d'une unité de plus vers la référence:</b><br>"
+        for node, potential in zip(self.nodes, sensitivity['potentials']):
+            if node['id'] != sensitivity['reference']:
+                text += f"{node['name']}: {potential:+.2f} €<br>"
+        
+        # Arcs saturés: gain par unité de capacité, du plus au moins rentable
+        saturated = sorted((reduced, k) for k, reduced in enumerate(sensitivity['reduced_costs'])
+                           if reduced < -1e-9)
+        if saturated:
+            text += "<br><b>Capacités à augmenter (gain €/unité):</b><br>"
+            for reduced, k in saturated:
+                arc = self.arcs[k]
+                text += f"{names[arc['from']]} → {names[arc['to']]}: {-reduced:.2f}<br>"
+        return text + "<br>"
+    
     def on_error(self, error):
         """Erreur"""
         QMessageBox.critical(self, "Erreur", error)
+        # Modèle dans un état incertain: reconstruit à la prochaine résolution
+        self.session = None
         self.solve_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
     
@@ -235,34 +341,131 @@ class MainWindow(QMainWindow):
                 data = json.load(f)
                 self.nodes = data['nodes']
                 self.arcs = data['arcs']
+                self.session = None
+                self.results = None
+                self.revision += 1
                 self.update_tables()
                 self.update_graph()
     
     # Méthodes de gestion des tables
     def update_tables(self):
         """Met à jour les tables de nœuds et d'arcs"""
-        # Table des nœuds
+        self.nodes_table.blockSignals(True)
+        self.arcs_table.blockSignals(True)
+        
+        # Table des nœuds (type non modifiable)
         self.nodes_table.setRowCount(len(self.nodes))
         for i, node in enumerate(self.nodes):
             self.nodes_table.setItem(i, 0, QTableWidgetItem(node['name']))
-            self.nodes_table.setItem(i, 1, QTableWidgetItem(node['type']))
+            self.nodes_table.setItem(i, 1, self._read_only(node['type']))
             self.nodes_table.setItem(i, 2, QTableWidgetItem(str(node['supply'])))
             self.nodes_table.setItem(i, 3, QTableWidgetItem(str(node.get('x', 0))))
+            self.nodes_table.setItem(i, 4, QTableWidgetItem(node.get('pollutant') or ""))
         
-        # Table des arcs
+        # Table des arcs (extrémités non modifiables)
+        names = {n['id']: n['name'] for n in self.nodes}
         self.arcs_table.setRowCount(len(self.arcs))
         for i, arc in enumerate(self.arcs):
-            from_name = next(n['name'] for n in self.nodes if n['id'] == arc['from'])
-            to_name = next(n['name'] for n in self.nodes if n['id'] == arc['to'])
-            self.arcs_table.setItem(i, 0, QTableWidgetItem(from_name))
-            self.arcs_table.setItem(i, 1, QTableWidgetItem(to_name))
+            from_name = names[arc['from']]
+            to_name = names[arc['to']]
+            self.arcs_table.setItem(i, 0, self._read_only(from_name))
+            self.arcs_table.setItem(i, 1, self._read_only(to_name))
             self.arcs_table.setItem(i, 2, QTableWidgetItem(str(arc['cost'])))
             self.arcs_table.setItem(i, 3, QTableWidgetItem(str(arc['capacity'])))
+            self.arcs_table.setItem(i, 4, QTableWidgetItem(arc.get('pollutant') or ""))
+        
+        self.nodes_table.blockSignals(False)
+        self.arcs_table.blockSignals(False)
+    
+    @staticmethod
+    def _read_only(text):
+        """Cellule non modifiable"""
+        item = QTableWidgetItem(text)
+        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+        return item
+    
+    def on_node_edited(self, item):
+        """Modification d'un nœud dans la table (nom, offre/demande, position X)"""
+        node = self.nodes[item.row()]
+        key = {0: 'name', 2: 'supply', 3: 'x', 4: 'pollutant'}.get(item.column())
+        if key is None:
+            return
+        text = item.text().strip()
+        try:
+            if key == 'name':
+                if not text:
+                    raise ValueError
+                node['name'] = text
+            elif key == 'pollutant':
+                self._set_pollutant(node, text)
+            else:
+                node[key] = float(text)
+        except ValueError:
+            QMessageBox.warning(self, "Erreur", f"Valeur invalide: {text}")
+        
+        # Valeur retenue réaffichée (ancienne si la saisie est invalide)
+        self.nodes_table.blockSignals(True)
+        item.setText((node.get('pollutant') or "") if key == 'pollutant' else str(node.get(key, 0)))
+        self.nodes_table.blockSignals(False)
+        if key == 'name':
+            self.arcs_table.blockSignals(True)
+            for i, arc in enumerate(self.arcs):
+                if arc['from'] == node['id']:
+                    self.arcs_table.item(i, 0).setText(node['name'])
+                if arc['to'] == node['id']:
+                    self.arcs_table.item(i, 1).setText(node['name'])
+            self.arcs_table.blockSignals(False)
+        self.network_modified()
+    
+    def on_arc_edited(self, item):
+        """Modification du coût, de la capacité ou du polluant d'un arc dans la table"""
+        arc = self.arcs[item.row()]
+        key = {2: 'cost', 3: 'capacity', 4: 'pollutant'}.get(item.column())
+        if key is None:
+            return
+        text = item.text().strip()
+        if key == 'pollutant':
+            self._set_pollutant(arc, text)
+        else:
+            try:
+                value = float(text)
+                if key == 'capacity' and value < 0:
+                    raise ValueError
+                arc[key] = value
+            except ValueError:
+                QMessageBox.warning(self, "Erreur", f"Valeur invalide: {text}")
+        
+        self.arcs_table.blockSignals(True)
+        item.setText((arc.get('pollutant') or "") if key == 'pollutant' else str(arc[key]))
+        self.arcs_table.blockSignals(False)
+        self.network_modified()
+    
+    @staticmethod
+    def _set_pollutant(element, text):
+        """Polluant d'un nœud ou d'un arc (texte vide: aucun / arc partagé)"""
+        if text:
+            element['pollutant'] = text
+        else:
+            element.pop('pollutant', None)
+    
+    def network_modified(self):
+        """
+        Réseau modifié: les flux affichés ne correspondent plus; la
+        prochaine résolution Gurobi réoptimise le modèle existant
+        """
+        self.revision += 1
+        if self.results is not None:
+            self.results = None
+            self.results_text.setHtml("✏️ <b>Réseau modifié</b><br>"
+                                      "Relancer la résolution pour mettre à jour les flux")
+        self.update_graph()
     
     def update_graph(self):
         """Met à jour la visualisation du graphe"""
         flows = self.results['flows'] if self.results else None
-        self.graph_canvas.plot_graph(self.nodes, self.arcs, flows)
+        sensitivity = self.results.get('sensitivity') if self.results else None
+        self.graph_canvas.plot_graph(self.nodes, self.arcs, flows, sensitivity,
+                                     self.overlay_combo.currentData())
     
     def add_node(self):
         """Ajoute un nouveau nœud"""
@@ -276,12 +479,15 @@ class MainWindow(QMainWindow):
         supply_input = QLineEdit("0")
         x_input = QLineEdit("0")
         y_input = QLineEdit("0")
+        pollutant_input = QLineEdit()
+        pollutant_input.setPlaceholderText("facultatif (multi-polluants)")
         
         layout.addRow("Nom:", name_input)
         layout.addRow("Type:", type_combo)
         layout.addRow("Offre/Demande:", supply_input)
         layout.addRow("Position X:", x_input)
         layout.addRow("Position Y:", y_input)
+        layout.addRow("Polluant:", pollutant_input)
         
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(dialog.accept)
@@ -290,16 +496,18 @@ class MainWindow(QMainWindow):
         
         if dialog.exec_() == QDialog.Accepted:
             new_id = max([n['id'] for n in self.nodes], default=-1) + 1
-            self.nodes.append({
+            node = {
                 'id': new_id,
                 'name': name_input.text(),
                 'type': type_combo.currentText(),
                 'supply': float(supply_input.text()),
                 'x': float(x_input.text()),
                 'y': float(y_input.text())
-            })
+            }
+            self._set_pollutant(node, pollutant_input.text().strip())
+            self.nodes.append(node)
             self.update_tables()
-            self.update_graph()
+            self.network_modified()
     
     def delete_node(self):
         """Supprime le nœud sélectionné"""
@@ -311,7 +519,7 @@ class MainWindow(QMainWindow):
             # Supprimer le nœud
             del self.nodes[row]
             self.update_tables()
-            self.update_graph()
+            self.network_modified()
     
     def add_arc(self):
         """Ajoute un nouvel arc"""
@@ -331,11 +539,14 @@ class MainWindow(QMainWindow):
         
         cost_input = QLineEdit("1.0")
         capacity_input = QLineEdit("100.0")
+        pollutant_input = QLineEdit()
+        pollutant_input.setPlaceholderText("vide: conduite partagée")
         
         layout.addRow("De:", from_combo)
         layout.addRow("Vers:", to_combo)
         layout.addRow("Coût:", cost_input)
         layout.addRow("Capacité:", capacity_input)
+        layout.addRow("Polluant:", pollutant_input)
         
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(dialog.accept)
@@ -343,14 +554,16 @@ class MainWindow(QMainWindow):
         layout.addRow(buttons)
         
         if dialog.exec_() == QDialog.Accepted:
-            self.arcs.append({
+            arc = {
                 'from': from_combo.currentData(),
                 'to': to_combo.currentData(),
                 'cost': float(cost_input.text()),
                 'capacity': float(capacity_input.text())
-            })
+            }
+            self._set_pollutant(arc, pollutant_input.text().strip())
+            self.arcs.append(arc)
             self.update_tables()
-            self.update_graph()
+            self.network_modified()
     
     def delete_arc(self):
         """Supprime l'arc sélectionné"""
@@ -358,4 +571,4 @@ class MainWindow(QMainWindow):
         if row >= 0:
             del self.arcs[row]
             self.update_tables()
-            self.update_graph()
\ No newline at end of file
+            self.network_modified()
\ No newline at end of file
@@ -0,0 +1,321 @@
+# =============================================================================
+# solver/column_generation.py - Multi-polluants par génération de colonnes
+# =============================================================================
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from solver.network import MultiCommodityNetwork
+
+# Gurobi résout le problème maître restreint
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+
+
+# Réseau de tarification d'un processus de travail (voir _init_worker)
+_GRAPH = None
+
+
+def _init_worker(graph):
+    """Initialisation d'un processus de travail: réseau transmis une seule fois"""
+    global _GRAPH
+    _GRAPH = graph
+
+
+def _price_worker(task):
+    """Tarification d'un polluant dans un processus de travail"""
+    return price_commodity(_GRAPH, task)
+
+
+def price_commodity(graph, task):
+    """
+    Sous-problème d'un polluant: plus courts chemins source -> puits pour
+    les coûts réduits des arcs
+    
+    Le coût réduit d'un chemin de s à t est Σ (c_a - π_a) - α_s - β_t
+    (π ≤ 0 dual de capacité, α et β duaux des lignes de source et de puits).
+    Un nœud fictif relié à chaque source par un arc de coût shift - α_s
+    ramène le calcul à un seul Dijkstra (coûts positifs ou nuls).
+    
+    Args:
+        graph: dict node_num, cost et commodities (voir commodity_graph)
+        task: (polluant, phase1, arcs duaux, valeurs duales, α, β, tolérance);
+            en phase 1 les coûts des arcs sont nuls
+    
+    Returns:
+        list: colonnes (source, puits, arcs du chemin, coût réduit) de coût
+        réduit négatif, une par puits au plus
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+    
+    k, phase1, dual_arcs, dual_values, alpha, beta, tolerance = task
+    n = graph['node_num']
+    commodity = graph['commodities'][k]
+    arcs, starts, sources, sinks = (commodity['arcs'], commodity['starts'],
+                                    commodity['sources'], commodity['sinks'])
+    
+    weight = np.zeros(len(graph['cost'])) if phase1 else graph['cost'].copy()
+    # π ≤ 0 au signe près des tolérances du maître: coûts réduits ≥ 0 pour Dijkstra
+    weight[dual_arcs] -= np.minimum(dual_values, 0.0)
+    weight = weight[arcs]
+    
+    # Arcs parallèles: le moins cher de chaque couple (origine, destination)
+    if len(starts) < len(arcs):
+        pair_weight = np.minimum.reduceat(weight, starts)
+        group = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(arcs))))
+        cheapest = np.flatnonzero(weight == pair_weight[group])
+        first = np.ones(len(cheapest), dtype=bool)
+        first[1:] = group[cheapest[1:]] != group[cheapest[:-1]]
+        pair_arc = arcs[cheapest[first]]
+        weight = pair_weight
+    else:
+        pair_arc = arcs
+    
+    # Ligne n: nœud fictif -> sources (structure CSR précalculée)
+    shift = alpha.max()
+    graphe = csr_matrix((np.concatenate([weight, shift - alpha]), commodity['indices'],
+                         commodity['indptr']), shape=(n + 1, n + 1))
+    dist, pred = dijkstra(graphe, indices=n, return_predecessors=True)
+    
+    reduced = dist[sinks] - shift - beta
+    keys = commodity['keys']
+    columns = []
+    for j in np.flatnonzero(reduced < -tolerance).tolist():
+        chemin = []
+        v = int(sinks[j])
+        while pred[v] != n:
+            u = int(pred[v])
+            chemin.append(pair_arc[np.searchsorted(keys, u * (n + 1) + v)])
+            v = u
+        columns.append((v, int(sinks[j]), np.array(chemin[::-1], dtype=np.int64), float(reduced[j])))
+    return columns
+
+
+class ColumnGenerationSolver:
+    """
+    Flux multi-polluants à coût minimum, formulation par chemins
+    
+    Variables: λ_p = flux sur le chemin p d'une source vers un puits du
+    même polluant. Le problème maître restreint (Gurobi) n'a qu'une ligne
+    par nœud d'offre/demande et une ligne de capacité par arc déjà
+    emprunté, au lieu de polluants x arcs variables. À chaque itération,
+    les sous-problèmes (plus courts chemins, un par polluant) sont
+    résolus en parallèle dans un pool de processus et les chemins de coût
+    réduit négatif entrent dans le maître. Phase 1: variables
+    artificielles sur les lignes d'offre/demande, minimisées seules.
+    """
+    
+    def __init__(self, nodes, arcs, workers=None):
+        """
+        Args:
+            nodes: liste de nœuds {'id', 'name', 'supply', 'pollutant', ...}
+            arcs: liste d'arcs {'from', 'to', 'cost', 'capacity', 'pollutant'}
+            workers: processus de tarification (par défaut: un par cœur,
+                au plus un par polluant; 1 = dans le processus courant)
+        """
+        self.network = network = MultiCommodityNetwork(nodes, arcs)
+        self.workers = workers
+        self.iterations = 0
+        self.paths = []
+        
+        self.graph = {
+            'node_num': network.node_num,
+            'cost': network.cost,
+            'commodities': [self.commodity_graph(p) for p in network.pollutants]
+        }
+    
+    def commodity_graph(self, pollutant):
+        """
+        Structure du sous-problème d'un polluant, calculée une seule fois:
+        arcs ouverts triés par (origine, destination) sans les boucles,
+        début de chaque couple (arcs parallèles groupés), structure CSR
+        du graphe des couples complété par le nœud fictif, sources et puits
+        """
+        network = self.network
+        n = network.node_num
+        arcs = network.allowed_arcs(pollutant)
+        arcs = arcs[network.tail[arcs] != network.head[arcs]]
+        tail, head = network.tail[arcs], network.head[arcs]
+        order = np.lexsort((head, tail))
+        arcs, tail, head = arcs[order], tail[order], head[order]
+        
+        nouveau = np.ones(len(arcs), dtype=bool)
+        nouveau[1:] = (tail[1:] != tail[:-1]) | (head[1:] != head[:-1])
+        starts = np.flatnonzero(nouveau)
+        tail, head = tail[starts], head[starts]
+        
+        of_pollutant = network.node_pollutant == pollutant
+        sources = np.flatnonzero(of_pollutant & (network.supply > 0))
+        sinks = np.flatnonzero(of_pollutant & (network.supply < 0))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(tail, minlength=n)),
+                                 [len(tail) + len(sources)]])
+        return {
+            'arcs': arcs,
+            'starts': starts,
+            'keys': tail * (n + 1) + head,
+            'indices': np.concatenate([head, sources]),
+            'indptr': indptr,
+            'sources': sources,
+            'sinks': sinks
+        }
+    
+    def _add_column(self, source, sink, chemin):
+        """Ajoute au maître le chemin (arcs) de source à sink"""
+        network, model = self.network, self.model
+        rows = [self.node_rows[source], self.node_rows[sink]]
+        for a in chemin.tolist():
+            row = self.capacity_rows.get(a)
+            if row is None:
+                # Ligne de capacité créée au premier chemin qui emprunte l'arc
+                row = model.addLConstr(gp.LinExpr(), GRB.LESS_EQUAL, network.capacity[a],
+                                       name=f"capacity_{a}")
+                self.capacity_rows[a] = row
+            rows.append(row)
+        var = model.addVar(lb=0.0, obj=self._path_cost(chemin),
+                           column=gp.Column([1.0] * len(rows), rows))
+        self.columns.append((source, sink, chemin, var))
+    
+    def _path_cost(self, chemin):
+        """Coût d'un chemin dans l'objectif de la phase courante"""
+        return 0.0 if self.phase1 else float(self.network.cost[chemin].sum())
+    
+    def _pricing_tasks(self, tolerance):
+        """Duaux du maître -> une tâche de tarification par polluant"""
+        model = self.model
+        dual_arcs = np.fromiter(self.capacity_rows.keys(), dtype=np.int64,
+                                count=len(self.capacity_rows))
+        dual_values = np.array(model.getAttr('Pi', list(self.capacity_rows.values())))
+        node_duals = np.zeros(self.network.node_num)
+        rows = list(self.node_rows.items())
+        node_duals[[i for i, _ in rows]] = model.getAttr('Pi', [row for _, row in rows])
+        return [
+            (k, self.phase1, dual_arcs, dual_values, node_duals[commodity['sources']],
+             node_duals[commodity['sinks']], tolerance)
+            for k, commodity in enumerate(self.graph['commodities'])
+        ]
+    
+    def _generate(self, pricing, max_iterations):
+        """
+        Boucle maître / tarification jusqu'à ce qu'aucun chemin n'ait de
+        coût réduit négatif
+        
+        Returns:
+            bool: False si la limite d'itérations est atteinte
+        """
+        scale = 1.0 if self.phase1 else max(1.0, np.abs(self.network.cost).max(initial=0.0))
+        tolerance = 1e-7 * scale
+        while True:
+            self.model.optimize()
+            if self.model.status != GRB.OPTIMAL:
+                raise RuntimeError(f"Problème maître: statut {self.model.status}")
+            columns = [c for found in pricing(self._pricing_tasks(tolerance)) for c in found]
+            if not columns:
+                return True
+            for source, sink, chemin, _ in columns:
+                self._add_column(source, sink, chemin)
+            self.iterations += 1
+            if max_iterations is not None and self.iterations >= max_iterations:
+                return False
+    
+    def solve(self, max_iterations=1000):
+        """
+        Résout le problème multi-polluants
+        
+        Returns:
+            dict: format de solve_min_cost_flow, avec commodity_flows
+            (flux par polluant), paths (chemins utilisés), iterations et
+            columns
+        """
+        if gp is None:
+            raise RuntimeError("Gurobi est nécessaire au problème maître")
+        network = self.network
+        if network.node_num == 0:
+            return {'status': 'infeasible', 'message': "Réseau vide"}
+        for p, total in network.imbalances().items():
+            if abs(total) > 1e-9 * max(1.0, np.abs(network.supply).sum()):
+                return {'status': 'infeasible',
+                        'message': f"Somme offres/demandes ≠ 0 pour {p} ({total:.2f})"}
+        if (network.capacity < 0).any():
+            return {'status': 'infeasible', 'message': "Capacité négative"}
+        if (network.cost < 0).any():
+            return {'status': 'infeasible',
+                    'message': "Coûts négatifs: formulation par chemins non applicable"}
+        
+        model = self.model = gp.Model("Pollution_MultiFlow")
+        model.setParam('OutputFlag', 0)
+        
+        # Lignes d'offre/demande (une par nœud, polluant du nœud) et artificielles
+        self.node_rows = {}
+        artificials = []
+        for i in np.flatnonzero(network.supply != 0).tolist():
+            row = model.addLConstr(gp.LinExpr(), GRB.EQUAL, abs(network.supply[i]),
+                                   name=f"node_{i}")
+            self.node_rows[i] = row
+            artificials.append(model.addVar(lb=0.0, obj=1.0, column=gp.Column(1.0, row)))
+        self.capacity_rows = {}
+        self.columns = []
+        self.iterations = 0
+        
+        workers = self.workers or os.cpu_count() or 1
+        workers = max(1, min(workers, len(network.pollutants)))
+        pool = None
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self.graph,))
+        
+        def pricing(tasks):
+            if pool is not None:
+                return pool.map(_price_worker, tasks)
+            return [price_commodity(self.graph, task) for task in tasks]
+        
+        try:
+            # Phase 1: réalisabilité (artificielles seules dans l'objectif)
+            self.phase1 = True
+            if not self._generate(pricing, max_iterations):
+                return {'status': 'iteration_limit',
+                        'message': f"Limite de {max_iterations} itérations atteinte"}
+            if model.objVal > 1e-9 * max(1.0, np.abs(network.supply).sum()):
+                return {'status': 'infeasible',
+                        'message': "Aucun flux ne satisfait offres, demandes et capacités"}
+            
+            # Phase 2: coûts réels, artificielles fixées à 0
+            self.phase1 = False
+            for var in artificials:
+                var.UB = 0.0
+                var.Obj = 0.0
+            for _, _, chemin, var in self.columns:
+                var.Obj = self._path_cost(chemin)
+            if not self._generate(pricing, max_iterations):
+                return {'status': 'iteration_limit',
+                        'message': f"Limite de {max_iterations} itérations atteinte"}
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        return self.result()
+    
+    def result(self):
+        """Flux par polluant à partir des flux des chemins"""
+        network = self.network
+        values = self.model.getAttr('X', [var for *_, var in self.columns])
+        pollutant_of = network.node_pollutant
+        commodity_flows = {p: np.zeros(network.arc_num) for p in network.pollutants}
+        self.paths = []
+        for (source, sink, chemin, _), value in zip(self.columns, values):
+            if value <= 1e-9:
+                continue
+            commodity_flows[pollutant_of[source]][chemin] += value
+            self.paths.append({
+                'pollutant': pollutant_of[source],
+                'nodes': [network.names[source]] + network.names[network.head[chemin]].tolist(),
+                'flow': value
+            })
+        return network.result(commodity_flows, self.model.objVal, engine='column_generation',
+                              iterations=self.iterations, columns=len(self.columns),
+                              paths=self.paths)
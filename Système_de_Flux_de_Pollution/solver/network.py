@@ -0,0 +1,135 @@
+# =============================================================================
+# solver/network.py - Réseau compilé en tableaux (index, incidence, résultats)
+# =============================================================================
+
+import numpy as np
+
+
+class FlowNetwork:
+    """
+    Nœuds et arcs compilés une seule fois en tableaux NumPy
+    
+    L'index id -> position des nœuds est construit une fois; tail et head
+    sont les positions des extrémités de chaque arc. Construction et
+    extraction des résultats sont linéaires en nœuds + arcs.
+    """
+    
+    def __init__(self, nodes, arcs):
+        """
+        Args:
+            nodes: liste de nœuds {'id', 'name', 'supply', ...}
+            arcs: liste d'arcs {'from', 'to', 'cost', 'capacity'}
+        """
+        self.nodes = nodes
+        self.arcs = arcs
+        self.index = {node['id']: i for i, node in enumerate(nodes)}
+        self.node_num = len(nodes)
+        self.arc_num = len(arcs)
+        
+        index = self.index
+        self.supply = np.array([node['supply'] for node in nodes], dtype=float)
+        self.names = np.array([node['name'] for node in nodes], dtype=object)
+        self.tail = np.fromiter((index[a['from']] for a in arcs), dtype=np.int64, count=self.arc_num)
+        self.head = np.fromiter((index[a['to']] for a in arcs), dtype=np.int64, count=self.arc_num)
+        self.cost = np.fromiter((a['cost'] for a in arcs), dtype=float, count=self.arc_num)
+        self.capacity = np.fromiter((a['capacity'] for a in arcs), dtype=float, count=self.arc_num)
+    
+    def incidence(self):
+        """
+        Matrice d'incidence nœuds x arcs (creuse, CSR): +1 à l'origine,
+        -1 à la destination de chaque arc (une boucle donne une colonne nulle)
+        """
+        # scipy n'est nécessaire qu'au modèle PL
+        import scipy.sparse as sp
+        colonnes = np.arange(self.arc_num)
+        valeurs = np.concatenate([np.ones(self.arc_num), -np.ones(self.arc_num)])
+        return sp.csr_matrix(
+            (valeurs, (np.concatenate([self.tail, self.head]), np.concatenate([colonnes, colonnes]))),
+            shape=(self.node_num, self.arc_num)
+        )
+    
+    def result(self, flow, objective=None, **extra):
+        """
+        Dictionnaire de résultats de solve_min_cost_flow à partir du vecteur
+        des flux (noms des extrémités lus dans le tableau des noms)
+        """
+        flow = np.asarray(flow, dtype=float)
+        flows = flow.tolist()
+        from_names = self.names[self.tail].tolist()
+        to_names = self.names[self.head].tolist()
+        costs = self.cost.tolist()
+        capacities = self.capacity.tolist()
+        total_costs = (flow * self.cost).tolist()
+        arc_details = [
+            {'from': from_names[k], 'to': to_names[k], 'flow': flows[k],
+             'capacity': capacities[k], 'cost': costs[k], 'total_cost': total_costs[k]}
+            for k in range(self.arc_num)
+        ]
+        result = {
+            'status': 'optimal',
+            'objective': float(flow @ self.cost) if objective is None else objective,
+            'flows': flows,
+            'arc_details': arc_details
+        }
+        result.update(extra)
+        return result
+
+
+def pollutants(nodes):
+    """
+    Polluants des nœuds d'offre/demande (champ 'pollutant', None si
+    absent), dans l'ordre d'apparition
+    """
+    return list(dict.fromkeys(node.get('pollutant') for node in nodes if node['supply'] != 0))
+
+
+def is_multicommodity(nodes, arcs):
+    """Vrai si un nœud ou un arc porte un champ 'pollutant'"""
+    return (any(node.get('pollutant') is not None for node in nodes)
+            or any(arc.get('pollutant') is not None for arc in arcs))
+
+
+class MultiCommodityNetwork(FlowNetwork):
+    """
+    Réseau multi-polluants (multi-flots)
+    
+    L'offre/demande d'un nœud est celle de son polluant (champ
+    'pollutant' du nœud). Un arc sans polluant est une conduite partagée
+    par tous les polluants, dans la limite de sa capacité totale; un arc
+    avec polluant (liaison vers une station de traitement dédiée) n'est
+    ouvert qu'à ce polluant.
+    """
+    
+    def __init__(self, nodes, arcs):
+        super().__init__(nodes, arcs)
+        self.pollutants = pollutants(nodes)
+        self.node_pollutant = np.array([node.get('pollutant') for node in nodes], dtype=object)
+        self.arc_pollutant = np.array([arc.get('pollutant') for arc in arcs], dtype=object)
+    
+    def commodity_supply(self, pollutant):
+        """Vecteur offre/demande du polluant (nul aux autres nœuds)"""
+        return np.where(self.node_pollutant == pollutant, self.supply, 0.0)
+    
+    def allowed_arcs(self, pollutant):
+        """Positions des arcs ouverts au polluant"""
+        return np.flatnonzero((self.arc_pollutant == None) | (self.arc_pollutant == pollutant))
+    
+    def imbalances(self):
+        """Somme offres/demandes de chaque polluant (nulle si équilibré)"""
+        return {p: float(self.commodity_supply(p).sum()) for p in self.pollutants}
+    
+    def result(self, commodity_flows, objective=None, **extra):
+        """
+        Résultats de FlowNetwork.result pour le flux total, avec les flux
+        par polluant (commodity_flows: polluant -> vecteur des flux)
+        """
+        total = np.zeros(self.arc_num)
+        for flow in commodity_flows.values():
+            total += flow
+        result = super().result(total, objective, **extra)
+        by_pollutant = {p: np.asarray(flow, dtype=float) for p, flow in commodity_flows.items()}
+        for p, flow in by_pollutant.items():
+            for k in np.flatnonzero(flow > 1e-9).tolist():
+                result['arc_details'][k].setdefault('pollutants', {})[p] = float(flow[k])
+        result['commodity_flows'] = {p: flow.tolist() for p, flow in by_pollutant.items()}
+        return result
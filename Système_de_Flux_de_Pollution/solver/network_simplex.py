@@ -0,0 +1,313 @@
+# =============================================================================
+# solver/network_simplex.py - Simplexe réseau (flux à coût minimum, sans Gurobi)
+# =============================================================================
+
+import numpy as np
+
+from solver.network import FlowNetwork
+
+# États des arcs hors arbre: à la borne inférieure (+1) ou supérieure (-1)
+STATE_LOWER = 1
+STATE_TREE = 0
+STATE_UPPER = -1
+
+# Sens de l'arc de l'arbre qui relie un nœud à son parent
+DIR_UP = 1      # nœud -> parent
+DIR_DOWN = -1   # parent -> nœud
+
+
+class NetworkSimplex:
+    """
+    Simplexe réseau primal sur des arcs stockés en tableaux NumPy
+    
+    Les arcs (tail, head, cost, capacity, flow) sont des tableaux; une racine
+    artificielle reliée à chaque nœud donne l'arbre initial (arbre fortement
+    réalisable). L'arbre couvrant est stocké en préordre: le sous-arbre d'un
+    nœud est une tranche contiguë de `order`, ce qui permet de mettre à jour
+    potentiels, tailles et préordre par tranches NumPy à chaque pivot.
+    Règle d'entrée: recherche par blocs (Grigoriadis), vectorisée.
+    """
+    
+    # Tolérance relative sur les coûts réduits
+    EPS = 1e-12
+    
+    def __init__(self, nodes, arcs):
+        """
+        Args:
+            nodes: liste de nœuds {'id', 'name', 'supply', ...}
+            arcs: liste d'arcs {'from', 'to', 'cost', 'capacity'}
+        """
+        self.network = network = FlowNetwork(nodes, arcs)
+        self.node_num, self.arc_num = network.node_num, network.arc_num
+        self.supply, self.tail, self.head = network.supply, network.tail, network.head
+        self.cost, self.capacity = network.cost, network.capacity
+        self.flow = np.zeros(self.arc_num)
+        self.potential = np.zeros(self.node_num)
+        self.iterations = 0
+    
+    def _init_tree(self):
+        """Arbre initial: un arc artificiel entre chaque nœud et la racine"""
+        n, m = self.node_num, self.arc_num
+        root = n
+        nodes = np.arange(n)
+        offre = self.supply >= 0
+        
+        # Coût artificiel supérieur au coût de tout chemin élémentaire
+        art_cost = (np.abs(self.cost).max(initial=0.0) + 1) * (n + 1)
+        
+        self._tail = np.concatenate([self.tail, np.where(offre, nodes, root)])
+        self._head = np.concatenate([self.head, np.where(offre, root, nodes)])
+        self._cost = np.concatenate([self.cost, np.where(offre, 0.0, art_cost)])
+        self._cap = np.concatenate([self.capacity, np.full(n, np.inf)])
+        self._flow = np.concatenate([np.zeros(m), np.abs(self.supply)])
+        self._state = np.concatenate([np.full(m, STATE_LOWER, dtype=np.int8),
+                                      np.zeros(n, dtype=np.int8)])
+        
+        # Parents en liste Python (remontées pas à pas), le reste en tableaux
+        self._root = root
+        self._parent = [root] * n + [-1]
+        self._pred = np.concatenate([m + nodes, [-1]])
+        self._pred_dir = np.concatenate([np.where(offre, DIR_UP, DIR_DOWN), [0]]).astype(np.int8)
+        self._pi = np.concatenate([np.where(offre, 0.0, art_cost), [0.0]])
+        # Préordre: racine puis les nœuds; taille des sous-arbres
+        self._order = np.concatenate([[root], nodes])
+        self._pos = np.concatenate([nodes + 1, [0]])
+        self._size = np.concatenate([np.ones(n, dtype=np.int64), [n + 1]])
+        # Marques de parcours pour la recherche du sommet de jonction
+        self._mark = [0] * (n + 1)
+        self._stamp = 0
+    
+    def _find_entering(self, block_size):
+        """
+        Recherche par blocs: premier bloc (parcours circulaire) contenant un
+        arc violant les conditions d'optimalité, arc le plus violé de ce bloc
+        
+        Returns:
+            indice de l'arc entrant, ou -1 si la solution est optimale
+        """
+        total = len(self._cost)
+        start = self._next_arc
+        parcouru = 0
+        while parcouru < total:
+            fin = min(start + block_size, total)
+            bloc = slice(start, fin)
+            c = self._state[bloc] * (self._cost[bloc] + self._pi[self._tail[bloc]]
+                                     - self._pi[self._head[bloc]])
+            k = int(np.argmin(c))
+            parcouru += fin - start
+            start = 0 if fin == total else fin
+            if c[k] < -self.EPS * max(1.0, abs(self._cost[bloc][k])):
+                self._next_arc = start
+                return bloc.start + k
+        return -1
+    
+    def _cycle(self, first, second):
+        """
+        Chemins de first et de second jusqu'à leur plus proche ancêtre commun
+        (exclu): les deux remontées avancent en alternance et s'arrêtent au
+        premier nœud déjà marqué par l'autre
+        
+        Returns:
+            (chemin de first, chemin de second), listes de nœuds
+        """
+        if first == second:
+            return [], []
+        parent, mark, root = self._parent, self._mark, self._root
+        self._stamp += 2
+        sa, sb = self._stamp, self._stamp + 1
+        mark[first], mark[second] = sa, sb
+        chemin_a, chemin_b = [first], [second]
+        u, v = first, second
+        while True:
+            if u != root:
+                u = parent[u]
+                if mark[u] == sb:
+                    return chemin_a, chemin_b[:chemin_b.index(u)]
+                mark[u] = sa
+                chemin_a.append(u)
+            if v != root:
+                v = parent[v]
+                if mark[v] == sa:
+                    return chemin_a[:chemin_a.index(v)], chemin_b
+                mark[v] = sb
+                chemin_b.append(v)
+    
+    def _pivot(self, in_arc):
+        """
+        Un pivot: flux poussé le long du cycle de l'arc entrant, arc sortant
+        choisi pour garder l'arbre fortement réalisable
+        
+        Returns:
+            False si le cycle est de capacité infinie (problème non borné)
+        """
+        pred, pred_dir = self._pred, self._pred_dir
+        flow, cap = self._flow, self._cap
+        
+        state = int(self._state[in_arc])
+        if state == STATE_LOWER:
+            first, second = int(self._tail[in_arc]), int(self._head[in_arc])
+        else:
+            first, second = int(self._head[in_arc]), int(self._tail[in_arc])
+        chemin_first, chemin_second = self._cycle(first, second)
+        nf = np.array(chemin_first, dtype=np.int64)
+        ns = np.array(chemin_second, dtype=np.int64)
+        ef, es = pred[nf], pred[ns]
+        up_f, up_s = pred_dir[nf] == DIR_UP, pred_dir[ns] == DIR_UP
+        
+        # Arc sortant: capacité résiduelle minimale sur le cycle; premier
+        # minimum côté first, dernier côté second (arbre fortement réalisable)
+        delta = cap[in_arc]
+        u_out, result = -1, 0
+        if len(nf):
+            d = np.where(up_f, flow[ef], cap[ef] - flow[ef])
+            i = int(np.argmin(d))
+            if d[i] < delta:
+                delta, u_out, result = d[i], chemin_first[i], 1
+        if len(ns):
+            d = np.where(up_s, cap[es] - flow[es], flow[es])
+            i = len(d) - 1 - int(np.argmin(d[::-1]))
+            if d[i] <= delta:
+                delta, u_out, result = d[i], chemin_second[i], 2
+        
+        if delta == np.inf:
+            return False
+        
+        # Mise à jour des flux le long du cycle (poussé de first vers second)
+        if delta > 0:
+            flow[in_arc] += state * delta
+            flow[ef] += np.where(up_f, -delta, delta)
+            flow[es] += np.where(up_s, delta, -delta)
+        
+        if result == 0:
+            # L'arc entrant passe d'une borne à l'autre, l'arbre ne change pas
+            self._state[in_arc] = -state
+            return True
+        
+        # Arc sortant: fixé exactement à la borne atteinte
+        out_arc = int(pred[u_out])
+        vers_zero = (pred_dir[u_out] == DIR_UP) == (result == 1)
+        flow[out_arc] = 0.0 if vers_zero else cap[out_arc]
+        self._state[out_arc] = STATE_LOWER if vers_zero else STATE_UPPER
+        self._state[in_arc] = STATE_TREE
+        
+        # Chemin u_in -> u_out (réenraciné) et chemin de v_in à la jonction
+        if result == 1:
+            u_in, v_in = first, second
+            k = chemin_first.index(u_out)
+            chemin, au_dessus, autre = chemin_first[:k + 1], nf[k + 1:], ns
+        else:
+            u_in, v_in = second, first
+            k = chemin_second.index(u_out)
+            chemin, au_dessus, autre = chemin_second[:k + 1], ns[k + 1:], nf
+        self._update_tree(in_arc, u_in, v_in, chemin, au_dessus, autre)
+        return True
+    
+    def _update_tree(self, in_arc, u_in, v_in, chemin, au_dessus, autre):
+        """
+        Le sous-arbre de u_out = chemin[-1] est détaché, réenraciné en u_in
+        et rattaché sous v_in par l'arc entrant
+        
+        Args:
+            chemin: nœuds de u_in à u_out
+            au_dessus: nœuds entre u_out et la jonction (perdent le sous-arbre)
+            autre: nœuds de v_in à la jonction (gagnent le sous-arbre)
+        """
+        parent, pred, pred_dir = self._parent, self._pred, self._pred_dir
+        order, pos, size = self._order, self._pos, self._size
+        u_out = chemin[-1]
+        taille = int(size[u_out])
+        debut = int(pos[u_out])
+        
+        # Nouveau préordre du sous-arbre: les nœuds sont regroupés par nœud
+        # du chemin dont ils dépendent (intervalles emboîtés du préordre),
+        # chaque groupe gardant son ordre
+        ch = np.array(chemin, dtype=np.int64)
+        starts = pos[ch] - debut
+        ends = starts + size[ch]
+        compte = np.zeros(taille + 1, dtype=np.int64)
+        np.add.at(compte, starts, 1)
+        np.add.at(compte, ends, -1)
+        groupe = len(ch) - np.cumsum(compte[:taille])
+        bloc = order[debut:debut + taille][np.argsort(groupe, kind='stable')]
+        
+        # Tailles: ancêtres hors du sous-arbre, puis le long du chemin
+        size[au_dessus] -= taille
+        size[autre] += taille
+        anciennes = size[ch[:-1]].copy()
+        size[ch[1:]] = taille - anciennes
+        size[u_in] = taille
+        
+        # Parents et arcs de l'arbre inversés le long du chemin
+        pred[ch[1:]] = pred[ch[:-1]].copy()
+        pred_dir[ch[1:]] = -pred_dir[ch[:-1]]
+        for i in range(len(chemin) - 1, 0, -1):
+            parent[chemin[i]] = chemin[i - 1]
+        parent[u_in] = v_in
+        pred[u_in] = in_arc
+        pred_dir[u_in] = DIR_UP if self._tail[in_arc] == u_in else DIR_DOWN
+        
+        # Potentiels: coût réduit nul sur l'arc entrant
+        if pred_dir[u_in] == DIR_UP:
+            sigma = self._pi[v_in] - self._cost[in_arc] - self._pi[u_in]
+        else:
+            sigma = self._pi[v_in] + self._cost[in_arc] - self._pi[u_in]
+        self._pi[bloc] += sigma
+        
+        # Préordre: bloc retiré puis réinséré juste après v_in; seule la plage
+        # entre l'ancienne et la nouvelle place du bloc est réécrite
+        p = int(pos[v_in])
+        if p < debut:
+            lo, hi = p + 1, debut + taille
+            order[lo:hi] = np.concatenate([bloc, order[lo:debut]])
+        else:
+            lo, hi = debut, p + 1
+            order[lo:hi] = np.concatenate([order[debut + taille:hi], bloc])
+        pos[order[lo:hi]] = np.arange(lo, hi)
+    
+    def solve(self, max_iterations=None):
+        """
+        Résout le problème de flux à coût minimum
+        
+        Returns:
+            dict: même format que OptimizationThread.solve_min_cost_flow
+        """
+        if self.node_num == 0:
+            return {'status': 'infeasible', 'message': "Réseau vide"}
+        if abs(self.supply.sum()) > 1e-9 * max(1.0, np.abs(self.supply).sum()):
+            return {'status': 'infeasible',
+                    'message': f"Somme offres/demandes ≠ 0 ({self.supply.sum():.2f})"}
+        if (self.capacity < 0).any():
+            return {'status': 'infeasible', 'message': "Capacité négative"}
+        
+        self._init_tree()
+        self._next_arc = 0
+        total = len(self._cost)
+        block_size = max(int(np.sqrt(total)), 10)
+        self.iterations = 0
+        while True:
+            in_arc = self._find_entering(block_size)
+            if in_arc < 0:
+                break
+            if not self._pivot(in_arc):
+                return {'status': 'unbounded',
+                        'message': "Cycle de coût négatif et de capacité infinie"}
+            self.iterations += 1
+            if max_iterations is not None and self.iterations >= max_iterations:
+                return {'status': 'iteration_limit',
+                        'message': f"Limite de {max_iterations} itérations atteinte"}
+        
+        # Flux résiduel sur un arc artificiel: offres et demandes incompatibles
+        artificiels = self._flow[self.arc_num:]
+        if (artificiels > 1e-9 * max(1.0, np.abs(self.supply).max())).any():
+            return {'status': 'infeasible',
+                    'message': "Aucun flux ne satisfait offres, demandes et capacités"}
+        
+        self.flow = self._flow[:self.arc_num].copy()
+        # Potentiels de nœuds (duaux de la conservation, racine à 0)
+        self.potential = self._pi[:self.node_num].copy()
+        return self.result()
+    
+    def result(self):
+        """Dictionnaire de résultats (format de solve_min_cost_flow)"""
+        return self.network.result(self.flow, engine='network_simplex',
+                                   iterations=self.iterations)
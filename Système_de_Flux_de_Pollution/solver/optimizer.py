@@ -2,115 +2,385 @@
 # solver/optimizer.py - Module d'optimisation Gurobi
 # =============================================================================
 
-import gurobipy as gp
-from gurobipy import GRB
+from collections import deque
+import numpy as np
 from PyQt5.QtCore import QThread, pyqtSignal
+from solver.network import FlowNetwork, MultiCommodityNetwork, is_multicommodity
+from solver.network_simplex import NetworkSimplex
+from solver.column_generation import ColumnGenerationSolver
+
+# Gurobi est facultatif: le simplexe réseau n'en dépend pas
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+
+# Moteurs de résolution disponibles
+ENGINES = ('gurobi', 'network_simplex', 'column_generation')
+
+class FlowSession:
+    """
+    Modèle Gurobi persistant entre deux résolutions du même réseau
+    
+    La première résolution construit le modèle; les suivantes comparent
+    le réseau à celui déjà chargé et appliquent seulement les
+    modifications (borne supérieure pour une capacité, coefficient
+    d'objectif pour un coût, second membre pour une offre/demande,
+    colonne ajoutée pour un nouvel arc, suppression pour un arc ou un
+    nœud retiré). Gurobi repart alors de la base optimale précédente.
+    """
+    
+    def __init__(self):
+        self.model = None
+        self.flow = []          # variable de chaque arc, dans l'ordre des arcs
+        self.conservation = {}  # id nœud -> contrainte de conservation
+        self.supply = {}        # id nœud -> second membre chargé
+        self.arcs = []          # (from, to, cost, capacity) chargés
+    
+    def build(self, nodes, arcs):
+        """
+        Construit le modèle de flux à coût minimum
+        
+        Variables: x_ij = flux sur l'arc (i,j)
+        Objectif: min Σ c_ij * x_ij
+        Contraintes:
+        - Conservation: A x = b, A matrice d'incidence nœuds x arcs (creuse)
+        - Capacités: 0 ≤ x_ij ≤ u_ij
+        
+        Le modèle est construit en temps linéaire: réseau compilé en
+        tableaux (index id -> nœud construit une fois), variables en un seul
+        MVar, conservation en une seule contrainte matricielle.
+        """
+        network = FlowNetwork(nodes, arcs)
+        
+        model = gp.Model("Pollution_Flow")
+        model.setParam('OutputFlag', 0)
+        
+        # Variables de décision
+        flow = model.addMVar(network.arc_num, lb=0.0, ub=network.capacity,
+                             vtype=GRB.CONTINUOUS, name="flow")
+        
+        # Fonction objectif
+        model.setObjective(network.cost @ flow, GRB.MINIMIZE)
+        
+        # Contraintes de conservation
+        conservation = model.addMConstr(network.incidence(), flow, '=', network.supply,
+                                        name="conservation")
+        model.update()
+        
+        self.model = model
+        self.flow = flow.tolist()
+        self.conservation = dict(zip((node['id'] for node in nodes), conservation.tolist()))
+        self.supply = {node['id']: node['supply'] for node in nodes}
+        self.arcs = [(a['from'], a['to'], a['cost'], a['capacity']) for a in arcs]
+    
+    def update(self, nodes, arcs):
+        """
+        Applique au modèle les différences entre le réseau chargé et
+        (nodes, arcs)
+        
+        Les arcs sont appariés par extrémités (dans l'ordre pour des arcs
+        parallèles): un arc déplacé dans la liste garde sa variable.
+        
+        Returns:
+            int: nombre de modifications appliquées
+        """
+        model = self.model
+        edits = 0
+        
+        # Nœuds retirés, ajoutés, offre/demande modifiée
+        ids = {node['id'] for node in nodes}
+        for node_id in [i for i in self.conservation if i not in ids]:
+            model.remove(self.conservation.pop(node_id))
+            del self.supply[node_id]
+            edits += 1
+        for node in nodes:
+            constr = self.conservation.get(node['id'])
+            if constr is None:
+                self.conservation[node['id']] = model.addLConstr(
+                    gp.LinExpr(), GRB.EQUAL, node['supply'],
+                    name=f"conservation_{node['id']}")
+                edits += 1
+            elif node['supply'] != self.supply[node['id']]:
+                constr.RHS = node['supply']
+                edits += 1
+            self.supply[node['id']] = node['supply']
+        
+        # Arcs encore présents, par extrémités
+        loaded = {}
+        for k, (u, v, _, _) in enumerate(self.arcs):
+            loaded.setdefault((u, v), deque()).append(k)
+        
+        flow = []
+        for arc in arcs:
+            u, v, cost, capacity = arc['from'], arc['to'], arc['cost'], arc['capacity']
+            candidates = loaded.get((u, v))
+            if candidates:
+                k = candidates.popleft()
+                var = self.flow[k]
+                if cost != self.arcs[k][2]:
+                    var.Obj = cost
+                    edits += 1
+                if capacity != self.arcs[k][3]:
+                    var.UB = capacity
+                    edits += 1
+            else:
+                # Nouvel arc: colonne +1 à l'origine, -1 à la destination
+                column = gp.Column()
+                if u != v:
+                    column.addTerms([1.0, -1.0], [self.conservation[u], self.conservation[v]])
+                var = model.addVar(lb=0.0, ub=capacity, obj=cost, column=column,
+                                   name=f"flow_{u}_{v}")
+                edits += 1
+            flow.append(var)
+        
+        # Arcs retirés
+        for candidates in loaded.values():
+            for k in candidates:
+                model.remove(self.flow[k])
+                edits += 1
+        
+        self.flow = flow
+        self.arcs = [(a['from'], a['to'], a['cost'], a['capacity']) for a in arcs]
+        return edits
+    
+    def solve(self, nodes, arcs, sensitivity=False):
+        """
+        Résout le réseau (nodes, arcs): construction à la première
+        résolution, modifications et réoptimisation à chaud ensuite
+        
+        Args:
+            sensitivity: ajouter l'analyse de sensibilité (voir sensitivity)
+        
+        Returns:
+            dict: résultats (voir FlowNetwork.result), avec warm_start,
+            edits et iterations (itérations du simplexe)
+        """
+        warm_start = self.model is not None
+        if warm_start:
+            edits = self.update(nodes, arcs)
+        else:
+            self.build(nodes, arcs)
+            edits = 0
+        
+        model = self.model
+        model.optimize()
+        
+        # Extraction des résultats
+        if model.status == GRB.OPTIMAL:
+            flow, objective = model.getAttr('X', self.flow), model.objVal
+            iterations = int(model.IterCount)
+            analysis = self.sensitivity(nodes) if sensitivity and nodes else None
+            if analysis is not None:
+                # Sommet optimal décrit par l'analyse (peut différer du premier
+                # si la solution est dégénérée)
+                flow, objective = analysis.pop('flows'), analysis.pop('objective')
+            result = FlowNetwork(nodes, arcs).result(
+                flow, objective, engine='gurobi',
+                warm_start=warm_start, edits=edits, iterations=iterations)
+            if analysis is not None:
+                result['sensitivity'] = analysis
+            return result
+        else:
+            return {
+                'status': 'infeasible',
+                'message': f"Statut: {model.status}"
+            }
+    
+    def sensitivity(self, nodes, reference=None):
+        """
+        Analyse de sensibilité de la dernière solution optimale, lue par
+        requêtes groupées (une par attribut)
+        
+        Les contraintes de conservation sont liées (Σ b_i = 0): une offre
+        ne varie seule qu'équilibrée par un autre nœud. Une variable libre
+        sur la ligne du nœud de référence (par défaut la plus grande
+        demande) absorbe l'écart le temps de l'analyse: π_ref = 0 et
+        - potentials[i]: coût d'une unité de plus émise en i et traitée au
+          nœud de référence (π_i - π_j pour une unité de i vers j)
+        - supply_low/up[i]: plage de l'offre/demande de i sur laquelle les
+          potentiels restent valables
+        - reduced_costs[k]: variation du coût total par unité forcée sur
+          l'arc (négatif sur un arc saturé: gain par unité de capacité)
+        - cost_low/up[k]: plage du coût de l'arc sans changement des routes
+        
+        La réoptimisation avec la variable libre peut s'arrêter sur un autre
+        sommet optimal quand la solution est dégénérée: flows et objective
+        sont ceux du sommet décrit par l'analyse.
+        
+        Returns:
+            dict: reference (id), flows, objective et les listes ci-dessus
+            (ordre des nœuds et des arcs); None si la réoptimisation échoue
+        """
+        model = self.model
+        if reference is None:
+            reference = min(nodes, key=lambda node: node['supply'])['id']
+        rows = [self.conservation[node['id']] for node in nodes]
+        # Base optimale remise en place ensuite pour la prochaine réoptimisation
+        constrs = list(self.conservation.values())
+        vbasis = model.getAttr('VBasis', self.flow)
+        cbasis = model.getAttr('CBasis', constrs)
+        
+        balance = model.addVar(lb=-GRB.INFINITY, ub=GRB.INFINITY, obj=0.0,
+                               column=gp.Column(1.0, self.conservation[reference]),
+                               name="balance")
+        try:
+            model.optimize()
+            if model.status != GRB.OPTIMAL:
+                return None
+            return {
+                'reference': reference,
+                'flows': model.getAttr('X', self.flow),
+                'objective': model.objVal,
+                'potentials': [pi + 0.0 for pi in model.getAttr('Pi', rows)],  # pas de -0.0
+                'supply_low': model.getAttr('SARHSLow', rows),
+                'supply_up': model.getAttr('SARHSUp', rows),
+                'reduced_costs': model.getAttr('RC', self.flow),
+                'cost_low': model.getAttr('SAObjLow', self.flow),
+                'cost_up': model.getAttr('SAObjUp', self.flow)
+            }
+        finally:
+            model.remove(balance)
+            model.update()
+            model.setAttr('VBasis', self.flow, vbasis)
+            model.setAttr('CBasis', constrs, cbasis)
 
 class OptimizationThread(QThread):
-    """Thread pour l'optimisation avec Gurobi"""
+    """Thread pour l'optimisation (Gurobi ou simplexe réseau)"""
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
     progress = pyqtSignal(int)
     
-    def __init__(self, nodes, arcs):
+    def __init__(self, nodes, arcs, engine='gurobi', session=None, sensitivity=False):
         super().__init__()
         self.nodes = nodes
         self.arcs = arcs
+        self.engine = engine if gp is not None else 'network_simplex'
+        self.session = session
+        self.sensitivity = sensitivity
     
     def run(self):
         try:
             self.progress.emit(10)
-            result = self.solve_min_cost_flow()
+            if self.engine == 'column_generation':
+                result = self.solve_column_generation()
+            elif is_multicommodity(self.nodes, self.arcs):
+                if self.engine == 'network_simplex':
+                    raise ValueError("Le simplexe réseau ne traite qu'un seul polluant: "
+                                     "utiliser Gurobi ou la génération de colonnes")
+                result = self.solve_multicommodity()
+            elif self.engine == 'network_simplex':
+                result = self.solve_network_simplex()
+            else:
+                result = self.solve_min_cost_flow()
             self.progress.emit(100)
             self.finished.emit(result)
         except Exception as e:
             self.error.emit(str(e))
     
+    def solve_network_simplex(self):
+        """
+        Même problème résolu par le simplexe réseau (solver/network_simplex.py),
+        sans modèle PL ni licence Gurobi
+        """
+        simplex = NetworkSimplex(self.nodes, self.arcs)
+        self.progress.emit(30)
+        result = simplex.solve()
+        self.progress.emit(90)
+        return result
+    
     def solve_min_cost_flow(self):
         """
-        Résout le problème de flux à coût minimum
+        Résout le problème de flux à coût minimum avec Gurobi
         
-        Variables: x_ij = flux sur l'arc (i,j)
-        Objectif: min Σ c_ij * x_ij
+        Avec une session (FlowSession), le modèle de la résolution
+        précédente est modifié puis réoptimisé à partir de sa base optimale;
+        sinon un modèle est construit pour cette seule résolution. Avec
+        sensitivity, le résultat contient aussi potentiels, coûts réduits
+        et plages (FlowSession.sensitivity).
+        """
+        if gp is None:
+            raise RuntimeError("Gurobi n'est pas installé: utiliser le simplexe réseau")
+        session = self.session if self.session is not None else FlowSession()
+        self.progress.emit(30)
+        result = session.solve(self.nodes, self.arcs, self.sensitivity)
+        self.progress.emit(90)
+        return result
+    
+    def solve_multicommodity(self):
+        """
+        Flux multi-polluants, formulation par arcs
+        
+        Variables: x_ijk = flux du polluant k sur l'arc (i,j), pour les
+        arcs ouverts à k
+        Objectif: min Σ c_ij * x_ijk
         Contraintes:
-        - Conservation: Σ x_ij - Σ x_ji = b_i
-        - Capacités: 0 ≤ x_ij ≤ u_ij
+        - Conservation par polluant: A_k x_k = b_k (bloc diagonal creux)
+        - Capacité partagée: Σ_k x_ijk ≤ u_ij
+        
+        Le modèle grandit en polluants x arcs: pour les grands réseaux,
+        préférer la génération de colonnes (solve_column_generation).
         """
-        model = gp.Model("Pollution_Flow")
+        import scipy.sparse as sp
+        if gp is None:
+            raise RuntimeError("Gurobi n'est pas installé: utiliser le simplexe réseau")
+        network = MultiCommodityNetwork(self.nodes, self.arcs)
+        
+        model = gp.Model("Pollution_MultiFlow")
         model.setParam('OutputFlag', 0)
         
+        # Arcs ouverts à chaque polluant, bout à bout: position -> arc
+        allowed = [network.allowed_arcs(p) for p in network.pollutants]
+        arc_of = np.concatenate(allowed) if allowed else np.zeros(0, dtype=np.int64)
+        incidence = network.incidence()
+        
         self.progress.emit(30)
         
         # Variables de décision
-        flow_vars = {}
-        for idx, arc in enumerate(self.arcs):
-            flow_vars[idx] = model.addVar(
-                lb=0.0,
-                ub=arc['capacity'],
-                name=f"flow_{arc['from']}_{arc['to']}",
-                vtype=GRB.CONTINUOUS
-            )
+        flow = model.addMVar(len(arc_of), lb=0.0, vtype=GRB.CONTINUOUS, name="flow")
+        model.setObjective(network.cost[arc_of] @ flow, GRB.MINIMIZE)
         
         self.progress.emit(50)
         
-        # Fonction objectif
-        objective = gp.quicksum(
-            arc['cost'] * flow_vars[idx] 
-            for idx, arc in enumerate(self.arcs)
-        )
-        model.setObjective(objective, GRB.MINIMIZE)
+        # Conservation par polluant
+        if allowed:
+            model.addMConstr(sp.block_diag([incidence[:, arcs] for arcs in allowed], format='csr'),
+                             flow, '=',
+                             np.concatenate([network.commodity_supply(p) for p in network.pollutants]),
+                             name="conservation")
         
-        # Contraintes de conservation
-        for node in self.nodes:
-            node_id = node['id']
-            
-            outflow = gp.quicksum(
-                flow_vars[idx] 
-                for idx, arc in enumerate(self.arcs) 
-                if arc['from'] == node_id
-            )
-            
-            inflow = gp.quicksum(
-                flow_vars[idx] 
-                for idx, arc in enumerate(self.arcs) 
-                if arc['to'] == node_id
-            )
-            
-            model.addConstr(
-                outflow - inflow == node['supply'],
-                name=f"conservation_{node_id}"
-            )
+        # Capacité partagée entre polluants
+        sharing = sp.csr_matrix((np.ones(len(arc_of)), (arc_of, np.arange(len(arc_of)))),
+                                shape=(network.arc_num, len(arc_of)))
+        model.addMConstr(sharing, flow, '<', network.capacity, name="capacity")
         
         self.progress.emit(70)
         model.optimize()
         self.progress.emit(90)
         
-        # Extraction des résultats
         if model.status == GRB.OPTIMAL:
-            flows = [flow_vars[idx].X for idx in range(len(self.arcs))]
-            
-            arc_details = []
-            for idx, arc in enumerate(self.arcs):
-                from_name = next(n['name'] for n in self.nodes if n['id'] == arc['from'])
-                to_name = next(n['name'] for n in self.nodes if n['id'] == arc['to'])
-                
-                arc_details.append({
-                    'from': from_name,
-                    'to': to_name,
-                    'flow': flows[idx],
-                    'capacity': arc['capacity'],
-                    'cost': arc['cost'],
-                    'total_cost': flows[idx] * arc['cost']
-                })
-            
-            return {
-                'status': 'optimal',
-                'objective': model.objVal,
-                'flows': flows,
-                'arc_details': arc_details
-            }
+            values = flow.X
+            commodity_flows = {}
+            start = 0
+            for p, arcs in zip(network.pollutants, allowed):
+                commodity_flows[p] = np.zeros(network.arc_num)
+                commodity_flows[p][arcs] = values[start:start + len(arcs)]
+                start += len(arcs)
+            return network.result(commodity_flows, model.objVal, engine='gurobi')
         else:
             return {
                 'status': 'infeasible',
                 'message': f"Statut: {model.status}"
             }
+    
+    def solve_column_generation(self):
+        """
+        Flux multi-polluants par génération de colonnes (formulation par
+        chemins, tarification parallèle: solver/column_generation.py)
+        """
+        solver = ColumnGenerationSolver(self.nodes, self.arcs)
+        self.progress.emit(30)
+        result = solver.solve()
+        self.progress.emit(90)
+        return result
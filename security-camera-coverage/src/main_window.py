@@ -21,7 +21,9 @@ import numpy as np
 import json
 from datetime import datetime
 
-from src.optimization_model import MaximalCoveringLocationModel
+from src.optimization_model import MaximalCoveringLocationModel, DEFAULT_FLOOR
+from src.multi_floor import MultiFloorOptimizer
+from src.set_covering import SetCoveringModel
 from src.visualization import CoverageVisualizer
 
 
@@ -31,23 +33,33 @@ class OptimizationThread(QThread):
     finished = pyqtSignal(bool, dict)
     progress = pyqtSignal(str)
     
-    def __init__(self, model, time_limit, gap):
+    def __init__(self, model, time_limit, gap, coverage_mode="binary"):
         super().__init__()
         self.model = model
         self.time_limit = time_limit
         self.gap = gap
+        self.coverage_mode = coverage_mode
     
     def run(self):
         """Exécute l'optimisation dans un thread séparé."""
         try:
+            floors = self.model.get_floors()
+            if len(floors) > 1:
+                self.run_multi_floor(floors)
+                return
+            
             self.progress.emit("Construction du modèle...")
             # Activer les diagnostics pour le débogage
-            success = self.model.build_model(enable_diagnostics=True)
+            success = self.model.build_model(enable_diagnostics=True,
+                                             coverage_mode=self.coverage_mode)
             
             if not success:
                 self.finished.emit(False, {})
                 return
             
+            if self.model.diagnostics:
+                self.progress.emit(self.model.format_coverage_diagnostics(self.model.diagnostics))
+            
             self.progress.emit("Résolution en cours...")
             success = self.model.solve(time_limit=self.time_limit, gap=self.gap)
             
@@ -62,6 +74,50 @@ class OptimizationThread(QThread):
         except Exception as e:
             self.progress.emit(f"Erreur: {str(e)}")
             self.finished.emit(False, {})
+    
+    def run_multi_floor(self, floors):
+        """Résout chaque étage en parallèle puis répartit le budget global."""
+        self.progress.emit(f"{len(floors)} étages/bâtiments: calcul des courbes "
+                           f"couverture/budget en parallèle...")
+        optimizer = MultiFloorOptimizer(self.model)
+        solution = optimizer.solve(time_limit=self.time_limit, gap=self.gap,
+                                   coverage_mode=self.coverage_mode)
+        if not solution:
+            self.progress.emit("Aucune solution trouvée.")
+            self.finished.emit(False, {})
+            return
+        
+        for floor, alloc in solution['floor_allocation'].items():
+            self.progress.emit(f"Étage {floor}: {alloc['n_cameras']} caméras, "
+                               f"budget {alloc['budget']:.0f} €, "
+                               f"objectif {alloc['objective']:.1f}")
+        self.progress.emit("Solution trouvée!")
+        self.finished.emit(True, solution)
+
+
+class SetCoveringThread(QThread):
+    """Thread pour calculer le budget minimal couvrant les zones critiques."""
+    
+    finished = pyqtSignal(bool, dict)
+    progress = pyqtSignal(str)
+    
+    def __init__(self, model, priority_threshold, time_limit, gap):
+        super().__init__()
+        self.model = model
+        self.priority_threshold = priority_threshold
+        self.time_limit = time_limit
+        self.gap = gap
+    
+    def run(self):
+        """Exécute le recouvrement dans un thread séparé."""
+        try:
+            self.progress.emit("Recouvrement des zones critiques en cours...")
+            set_covering = SetCoveringModel(self.model, self.priority_threshold)
+            solution = set_covering.solve(time_limit=self.time_limit, gap=self.gap)
+            self.finished.emit(True, solution)
+        except Exception as e:
+            self.progress.emit(f"Erreur: {str(e)}")
+            self.finished.emit(False, {})
 
 
 class MainWindow(QMainWindow):
@@ -73,6 +129,7 @@ class MainWindow(QMainWindow):
         self.visualizer = CoverageVisualizer()
         self.current_solution = None
         self.optimization_thread = None
+        self.set_covering_thread = None
         
         self.init_ui()
         self.load_default_data()
@@ -185,8 +242,8 @@ class MainWindow(QMainWindow):
         zones_group = QGroupBox("Zones à Surveiller")
         zones_layout = QVBoxLayout()
         self.zones_table = QTableWidget()
-        self.zones_table.setColumnCount(5)
-        self.zones_table.setHorizontalHeaderLabels(["X", "Y", "Priorité", "Population", "Description"])
+        self.zones_table.setColumnCount(6)
+        self.zones_table.setHorizontalHeaderLabels(["X", "Y", "Priorité", "Population", "Description", "Étage"])
         zones_layout.addWidget(self.zones_table)
         zones_group.setLayout(zones_layout)
         tables_splitter.addWidget(zones_group)
@@ -195,8 +252,8 @@ class MainWindow(QMainWindow):
         cameras_group = QGroupBox("Emplacements Potentiels de Caméras")
         cameras_layout = QVBoxLayout()
         self.cameras_table = QTableWidget()
-        self.cameras_table.setColumnCount(6)
-        self.cameras_table.setHorizontalHeaderLabels(["X", "Y", "Coût (€)", "Portée (m)", "Angle (°)", "Type"])
+        self.cameras_table.setColumnCount(7)
+        self.cameras_table.setHorizontalHeaderLabels(["X", "Y", "Coût (€)", "Portée (m)", "Angle (°)", "Type", "Étage"])
         cameras_layout.addWidget(self.cameras_table)
         cameras_group.setLayout(cameras_layout)
         tables_splitter.addWidget(cameras_group)
@@ -229,9 +286,34 @@ class MainWindow(QMainWindow):
         row1.addWidget(self.gap_spin)
         
         params_layout.addLayout(row1)
+        
+        row2 = QHBoxLayout()
+        row2.addWidget(QLabel("Modèle de couverture:"))
+        self.coverage_mode_combo = QComboBox()
+        self.coverage_mode_combo.addItem("Binaire (zone couverte ou non)", "binary")
+        self.coverage_mode_combo.addItem("Graduelle (qualité décroissante avec la distance)", "gradual")
+        row2.addWidget(self.coverage_mode_combo)
+        row2.addStretch()
+        params_layout.addLayout(row2)
+        
         params_group.setLayout(params_layout)
         layout.addWidget(params_group)
         
+        # Recouvrement des zones critiques (budget minimal)
+        cover_group = QGroupBox("Budget Minimal - Recouvrement des Zones Critiques")
+        cover_layout = QHBoxLayout()
+        cover_layout.addWidget(QLabel("Priorité minimale des zones à couvrir:"))
+        self.cover_threshold_spin = QDoubleSpinBox()
+        self.cover_threshold_spin.setRange(1.0, 10.0)
+        self.cover_threshold_spin.setValue(7.0)
+        self.cover_threshold_spin.setSingleStep(1.0)
+        cover_layout.addWidget(self.cover_threshold_spin)
+        self.cover_button = QPushButton("Calculer le Budget Minimal")
+        self.cover_button.clicked.connect(self.start_set_covering)
+        cover_layout.addWidget(self.cover_button)
+        cover_group.setLayout(cover_layout)
+        layout.addWidget(cover_group)
+        
         # Bouton de résolution
         self.solve_button = QPushButton("🚀 Lancer l'Optimisation")
         self.solve_button.setStyleSheet("QPushButton { font-size: 14px; padding: 10px; background-color: #4CAF50; color: white; }")
@@ -353,6 +435,7 @@ class MainWindow(QMainWindow):
             self.zones_table.setItem(i, 2, QTableWidgetItem(str(priority)))
             self.zones_table.setItem(i, 3, QTableWidgetItem(str(population)))
             self.zones_table.setItem(i, 4, QTableWidgetItem(description))
+            self.zones_table.setItem(i, 5, QTableWidgetItem(DEFAULT_FLOOR))
         
         # Générer emplacements caméras aléatoires
         camera_types = ["fixe", "PTZ", "thermique", "PTZ", "fixe"]  # Plus de PTZ
@@ -376,6 +459,7 @@ class MainWindow(QMainWindow):
             self.cameras_table.setItem(i, 3, QTableWidgetItem(f"{range_m:.1f}"))
             self.cameras_table.setItem(i, 4, QTableWidgetItem(f"{angle:.0f}"))
             self.cameras_table.setItem(i, 5, QTableWidgetItem(cam_type))
+            self.cameras_table.setItem(i, 6, QTableWidgetItem(DEFAULT_FLOOR))
         
         self.log_message("Données aléatoires générées avec succès.")
     
@@ -401,6 +485,8 @@ class MainWindow(QMainWindow):
                     self.zones_table.setItem(i, 2, QTableWidgetItem(str(zone[2])))
                     self.zones_table.setItem(i, 3, QTableWidgetItem(str(zone[3])))
                     self.zones_table.setItem(i, 4, QTableWidgetItem(zone[4]))
+                    floor = zone[5] if len(zone) > 5 else DEFAULT_FLOOR
+                    self.zones_table.setItem(i, 5, QTableWidgetItem(str(floor)))
                 
                 # Charger les caméras
                 cameras = data.get('cameras', [])
@@ -413,6 +499,8 @@ class MainWindow(QMainWindow):
                     self.cameras_table.setItem(i, 3, QTableWidgetItem(str(cam[3])))
                     self.cameras_table.setItem(i, 4, QTableWidgetItem(str(cam[4])))
                     self.cameras_table.setItem(i, 5, QTableWidgetItem(cam[5]))
+                    floor = cam[6] if len(cam) > 6 else DEFAULT_FLOOR
+                    self.cameras_table.setItem(i, 6, QTableWidgetItem(str(floor)))
                 
                 self.log_message(f"Données chargées depuis {filename}")
                 QMessageBox.information(self, "Succès", "Données chargées avec succès!")
@@ -439,7 +527,8 @@ class MainWindow(QMainWindow):
                         float(self.zones_table.item(i, 1).text()),
                         int(self.zones_table.item(i, 2).text()),
                         int(self.zones_table.item(i, 3).text()),
-                        self.zones_table.item(i, 4).text()
+                        self.zones_table.item(i, 4).text(),
+                        self.table_floor(self.zones_table, i, 5)
                     ]
                     data['zones'].append(zone)
                 
@@ -451,7 +540,8 @@ class MainWindow(QMainWindow):
                         float(self.cameras_table.item(i, 2).text()),
                         float(self.cameras_table.item(i, 3).text()),
                         float(self.cameras_table.item(i, 4).text()),
-                        self.cameras_table.item(i, 5).text()
+                        self.cameras_table.item(i, 5).text(),
+                        self.table_floor(self.cameras_table, i, 6)
                     ]
                     data['cameras'].append(cam)
                 
@@ -464,58 +554,75 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Erreur lors de la sauvegarde: {str(e)}")
     
+    def table_floor(self, table, row, column):
+        """Lit l'étage d'une ligne de table (étage par défaut si vide)."""
+        item = table.item(row, column)
+        floor = item.text().strip() if item is not None else ""
+        return floor or DEFAULT_FLOOR
+    
+    def build_model_from_tables(self):
+        """Construit un modèle de couverture à partir des tables de données."""
+        # Extraire les données des tables
+        zones = []
+        zone_priorities = {}
+        zone_populations = {}
+        zone_floors = {}
+        
+        for i in range(self.zones_table.rowCount()):
+            x = float(self.zones_table.item(i, 0).text())
+            y = float(self.zones_table.item(i, 1).text())
+            priority = float(self.zones_table.item(i, 2).text())
+            population = int(self.zones_table.item(i, 3).text())
+            
+            zones.append((x, y))
+            zone_priorities[i] = priority
+            zone_populations[i] = population
+            zone_floors[i] = self.table_floor(self.zones_table, i, 5)
+        
+        camera_locations = []
+        camera_costs = {}
+        camera_ranges = {}
+        camera_angles = {}
+        camera_types = {}
+        camera_floors = {}
+        
+        for i in range(self.cameras_table.rowCount()):
+            x = float(self.cameras_table.item(i, 0).text())
+            y = float(self.cameras_table.item(i, 1).text())
+            cost = float(self.cameras_table.item(i, 2).text())
+            range_m = float(self.cameras_table.item(i, 3).text())
+            angle = float(self.cameras_table.item(i, 4).text())
+            cam_type = self.cameras_table.item(i, 5).text()
+            
+            camera_locations.append((x, y))
+            camera_costs[i] = cost
+            camera_ranges[i] = range_m
+            camera_angles[i] = angle
+            camera_types[i] = cam_type
+            camera_floors[i] = self.table_floor(self.cameras_table, i, 6)
+        
+        # Configurer le modèle
+        model = MaximalCoveringLocationModel()
+        model.set_problem_data(
+            zones=zones,
+            camera_locations=camera_locations,
+            zone_priorities=zone_priorities,
+            zone_populations=zone_populations,
+            camera_costs=camera_costs,
+            camera_ranges=camera_ranges,
+            camera_angles=camera_angles,
+            max_cameras=self.max_cameras_spin.value(),
+            max_budget=self.max_budget_spin.value(),
+            camera_types=camera_types,
+            zone_floors=zone_floors,
+            camera_floors=camera_floors
+        )
+        return model
+    
     def start_optimization(self):
         """Lance l'optimisation dans un thread séparé."""
         try:
-            # Extraire les données des tables
-            zones = []
-            zone_priorities = {}
-            zone_populations = {}
-            
-            for i in range(self.zones_table.rowCount()):
-                x = float(self.zones_table.item(i, 0).text())
-                y = float(self.zones_table.item(i, 1).text())
-                priority = float(self.zones_table.item(i, 2).text())
-                population = int(self.zones_table.item(i, 3).text())
-                
-                zones.append((x, y))
-                zone_priorities[i] = priority
-                zone_populations[i] = population
-            
-            camera_locations = []
-            camera_costs = {}
-            camera_ranges = {}
-            camera_angles = {}
-            camera_types = {}
-            
-            for i in range(self.cameras_table.rowCount()):
-                x = float(self.cameras_table.item(i, 0).text())
-                y = float(self.cameras_table.item(i, 1).text())
-                cost = float(self.cameras_table.item(i, 2).text())
-                range_m = float(self.cameras_table.item(i, 3).text())
-                angle = float(self.cameras_table.item(i, 4).text())
-                cam_type = self.cameras_table.item(i, 5).text()
-                
-                camera_locations.append((x, y))
-                camera_costs[i] = cost
-                camera_ranges[i] = range_m
-                camera_angles[i] = angle
-                camera_types[i] = cam_type
-            
-            # Configurer le modèle
-            self.model = MaximalCoveringLocationModel()
-            self.model.set_problem_data(
-                zones=zones,
-                camera_locations=camera_locations,
-                zone_priorities=zone_priorities,
-                zone_populations=zone_populations,
-                camera_costs=camera_costs,
-                camera_ranges=camera_ranges,
-                camera_angles=camera_angles,
-                max_cameras=self.max_cameras_spin.value(),
-                max_budget=self.max_budget_spin.value(),
-                camera_types=camera_types
-            )
+            self.model = self.build_model_from_tables()
             
             # Désactiver le bouton et afficher la progression
             self.solve_button.setEnabled(False)
@@ -527,7 +634,9 @@ class MainWindow(QMainWindow):
             time_limit = self.time_limit_spin.value()
             gap = self.gap_spin.value() / 100.0  # Convertir en fraction
             
-            self.optimization_thread = OptimizationThread(self.model, time_limit, gap)
+            coverage_mode = self.coverage_mode_combo.currentData()
+            
+            self.optimization_thread = OptimizationThread(self.model, time_limit, gap, coverage_mode)
             self.optimization_thread.progress.connect(self.log_message)
             self.optimization_thread.finished.connect(self.optimization_finished)
             self.optimization_thread.start()
@@ -537,6 +646,63 @@ class MainWindow(QMainWindow):
             self.solve_button.setEnabled(True)
             self.progress_bar.hide()
     
+    def start_set_covering(self):
+        """Calcule le budget minimal couvrant toutes les zones critiques."""
+        try:
+            model = self.build_model_from_tables()
+            
+            self.cover_button.setEnabled(False)
+            self.progress_bar.show()
+            self.log_message("Calcul du budget minimal (recouvrement des zones critiques)...")
+            
+            self.set_covering_thread = SetCoveringThread(
+                model, self.cover_threshold_spin.value(),
+                self.time_limit_spin.value(), self.gap_spin.value() / 100.0
+            )
+            self.set_covering_thread.progress.connect(self.log_message)
+            self.set_covering_thread.finished.connect(self.set_covering_finished)
+            self.set_covering_thread.start()
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors du démarrage: {str(e)}")
+            self.cover_button.setEnabled(True)
+            self.progress_bar.hide()
+    
+    def set_covering_finished(self, success, solution):
+        """Appelé lorsque le recouvrement est terminé: reporte le budget."""
+        self.cover_button.setEnabled(True)
+        self.progress_bar.hide()
+        
+        if not success:
+            QMessageBox.warning(self, "Attention", "Erreur lors du calcul du budget minimal.")
+            return
+        
+        red = solution['reductions']
+        self.log_message(
+            f"Recouvrement ({solution['method']}, {solution['status']}): "
+            f"{solution['n_cameras']} caméras {solution['cameras_installed']}, "
+            f"coût {solution['total_cost']:.0f} € "
+            f"(borne inférieure {solution['lower_bound']:.0f} €, gap {solution['gap']*100:.2f}%)"
+        )
+        self.log_message(
+            f"Réductions: {red['rows_initial']}→{red['rows_remaining']} zones, "
+            f"{red['columns_initial']}→{red['columns_remaining']} caméras, "
+            f"{red['fixed_cameras']} caméras imposées"
+        )
+        if solution['uncoverable_critical_zones']:
+            self.log_message(
+                f"⚠️ Zones critiques hors de portée de toute caméra: "
+                f"{solution['uncoverable_critical_zones']}"
+            )
+        
+        # Le budget trouvé alimente directement le modèle de couverture maximale
+        self.max_budget_spin.setValue(float(np.ceil(solution['recommended_max_budget'])))
+        self.max_cameras_spin.setValue(max(1, solution['recommended_max_cameras']))
+        self.log_message(
+            f"Budget maximal fixé à {self.max_budget_spin.value():.0f} € "
+            f"et {self.max_cameras_spin.value()} caméras maximum."
+        )
+    
     def optimization_finished(self, success, solution):
         """Appelé lorsque l'optimisation est terminée."""
         self.solve_button.setEnabled(True)
@@ -574,6 +740,7 @@ class MainWindow(QMainWindow):
    Nombre: {sol['n_zones_covered']} / {self.n_zones_spin.value()}
    Pourcentage: {sol['coverage_percentage']:.1f}%
    Couverture Prioritaire Totale: {sol['total_priority_coverage']:.0f}
+   Couverture Pondérée par la Qualité: {sol['total_quality_coverage']:.0f}
 
 ⏱️ Temps de Résolution: {sol['solve_time']:.2f} secondes
 """
@@ -586,7 +753,7 @@ class MainWindow(QMainWindow):
         
         for cam in sol['camera_details']:
             details += f"📷 Caméra #{cam['id']} ({cam['type'].upper()})\n"
-            details += f"   Position: ({cam['position'][0]:.1f}, {cam['position'][1]:.1f})\n"
+            details += f"   Position: ({cam['position'][0]:.1f}, {cam['position'][1]:.1f}) | Étage: {cam['floor']}\n"
             details += f"   Coût: {cam['cost']:.0f} €\n"
             details += f"   Portée: {cam['range']:.1f}m | Angle: {cam['angle']:.0f}°\n"
             details += f"   Zones couvertes: {cam['n_zones_covered']}\n\n"
@@ -598,11 +765,12 @@ class MainWindow(QMainWindow):
         for zone in sol['zone_details']:
             status = "✅ COUVERTE" if zone['is_covered'] else "❌ NON COUVERTE"
             details += f"Zone #{zone['id']} - {status}\n"
-            details += f"   Position: ({zone['position'][0]:.1f}, {zone['position'][1]:.1f})\n"
+            details += f"   Position: ({zone['position'][0]:.1f}, {zone['position'][1]:.1f}) | Étage: {zone['floor']}\n"
             details += f"   Priorité: {zone['priority']:.0f} | Population: {zone['population']}\n"
             if zone['is_covered']:
                 details += f"   Caméras surveillantes: {zone['covering_cameras']}\n"
                 details += f"   Niveau de redondance: {zone['redundancy_level']}\n"
+                details += f"   Qualité de couverture: {zone['coverage_quality']*100:.0f}%\n"
             details += "\n"
         
         self.details_text.setPlainText(details)
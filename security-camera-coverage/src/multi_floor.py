@@ -0,0 +1,237 @@
+"""
+Module de résolution multi-étages / multi-bâtiments du problème de
+Couverture Maximale avec budget partagé.
+
+Les zones d'un étage ne peuvent être vues que par les caméras du même étage:
+le problème se décompose en sous-problèmes indépendants liés uniquement par
+le budget global et le nombre maximal de caméras.
+
+Méthode:
+1. Pour chaque étage (en parallèle, un processus par étage), on calcule la
+   courbe couverture / budget en résolvant le sous-modèle MCLP sur une grille
+   de budgets et de nombres de caméras (le modèle Gurobi est construit une
+   seule fois, seuls les seconds membres changent entre deux résolutions).
+2. Un sac à dos à choix multiples (programmation dynamique sur le budget
+   discrétisé et le nombre de caméras) choisit un point de chaque courbe pour
+   répartir au mieux max_budget et max_cameras entre les étages.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+import time
+
+from src.optimization_model import MaximalCoveringLocationModel, DEFAULT_FLOOR
+
+
+def _solve_floor_curve(task: Dict) -> Tuple[str, List[Tuple[float, int, float, List[int]]]]:
+    """
+    Calcule la courbe couverture / budget d'un étage (exécuté dans un processus).
+    
+    task['time_limit'] borne le calcul de toute la courbe: chaque résolution
+    de la grille reçoit le temps restant, et la grille s'arrête (courbe
+    partielle) lorsque ce temps est épuisé.
+    
+    Args:
+        task: Données de l'étage (indices locaux) et paramètres de la grille
+    
+    Returns:
+        (étage, liste de points (coût, nb caméras, objectif, caméras locales))
+    """
+    deadline = time.time() + task['time_limit']
+    model = MaximalCoveringLocationModel()
+    model.set_problem_data(**task['data'])
+    model.build_model(coverage_mode=task['coverage_mode'])
+    
+    gurobi_model = model.model
+    gurobi_model.setParam('OutputFlag', 0)
+    gurobi_model.setParam('Threads', 1)
+    gurobi_model.setParam('MIPGap', task['gap'])
+    gurobi_model.update()
+    budget_constr = gurobi_model.getConstrByName("budget_constraint")
+    count_constr = gurobi_model.getConstrByName("max_cameras_constraint")
+    
+    n_cameras = len(model.camera_locations)
+    costs = [model.camera_costs.get(i, 1000.0) for i in range(n_cameras)]
+    n_useful = int(np.count_nonzero(np.bincount(model.coverage_cameras, minlength=n_cameras)))
+    k_max = min(task['max_cameras'], n_useful)
+    
+    points = {(): (0.0, 0, 0.0)}
+    remaining = task['time_limit']
+    for k in range(1, k_max + 1):
+        count_constr.RHS = k
+        saturated = True
+        for step in range(1, task['n_steps'] + 1):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            budget_constr.RHS = task['max_budget'] * step / task['n_steps']
+            gurobi_model.setParam('TimeLimit', remaining)
+            gurobi_model.optimize()
+            if gurobi_model.SolCount == 0:
+                continue
+            cameras = tuple(i for i in range(n_cameras) if model.x[i].X > 0.5)
+            points[cameras] = (sum(costs[i] for i in cameras), len(cameras),
+                               gurobi_model.ObjVal)
+            if len(cameras) == k:
+                saturated = False
+        if remaining <= 0:
+            print(f"Étage {task['floor']}: temps limite atteint, courbe partielle")
+            break
+        # Le plafond de caméras n'est jamais atteint: l'augmenter ne change rien
+        if saturated:
+            break
+    
+    return task['floor'], [(cost, n, obj, list(cams))
+                           for cams, (cost, n, obj) in points.items()]
+
+
+class MultiFloorOptimizer:
+    """
+    Optimiseur multi-étages: décompose un MaximalCoveringLocationModel par
+    étage, résout les étages en parallèle et répartit le budget global.
+    """
+    
+    def __init__(self, model: MaximalCoveringLocationModel):
+        """
+        Initialise l'optimiseur multi-étages.
+        
+        Args:
+            model: Modèle dont set_problem_data a été appelé avec des étages
+        """
+        self.model = model
+        self.floor_curves = {}
+        self.allocation = {}
+    
+    def split_by_floor(self) -> Dict[str, Tuple[List[int], List[int], Dict]]:
+        """
+        Découpe les données du problème par étage.
+        
+        Returns:
+            {étage: (indices globaux des zones, indices globaux des caméras,
+            données du sous-problème indexées localement)}
+        """
+        m = self.model
+        subproblems = {}
+        for floor in m.get_floors():
+            zone_ids = [j for j in range(len(m.zones))
+                        if m.zone_floors.get(j, DEFAULT_FLOOR) == floor]
+            camera_ids = [i for i in range(len(m.camera_locations))
+                          if m.camera_floors.get(i, DEFAULT_FLOOR) == floor]
+            data = {
+                'zones': [m.zones[j] for j in zone_ids],
+                'camera_locations': [m.camera_locations[i] for i in camera_ids],
+                'zone_priorities': {k: m.zone_priorities.get(j, 1.0) for k, j in enumerate(zone_ids)},
+                'zone_populations': {k: m.zone_populations.get(j, 1) for k, j in enumerate(zone_ids)},
+                'camera_costs': {k: m.camera_costs.get(i, 1000.0) for k, i in enumerate(camera_ids)},
+                'camera_ranges': {k: m.camera_ranges.get(i, 50.0) for k, i in enumerate(camera_ids)},
+                'camera_angles': {k: m.camera_angles.get(i, 360.0) for k, i in enumerate(camera_ids)},
+                'camera_types': {k: m.camera_types.get(i, "fixe") for k, i in enumerate(camera_ids)},
+                'max_cameras': m.max_cameras,
+                'max_budget': m.max_budget
+            }
+            subproblems[floor] = (zone_ids, camera_ids, data)
+        return subproblems
+    
+    def _allocate(self, curves: Dict[str, List], resolution: int) -> Dict[str, int]:
+        """
+        Sac à dos à choix multiples: choisit un point par courbe d'étage en
+        maximisant l'objectif total sous budget et nombre de caméras globaux.
+        
+        Le budget est discrétisé en `resolution` unités; les coûts sont
+        arrondis à l'unité supérieure, la répartition respecte donc toujours
+        le budget réel.
+        
+        Returns:
+            {étage: indice du point retenu dans sa courbe}
+        """
+        unit = self.model.max_budget / resolution if self.model.max_budget > 0 else 1.0
+        n_units = resolution
+        k_max = int(self.model.max_cameras)
+        
+        dp = np.full((n_units + 1, k_max + 1), -np.inf)
+        dp[0, 0] = 0.0
+        choices = []
+        floors = list(curves)
+        for floor in floors:
+            new_dp = np.full_like(dp, -np.inf)
+            choice = np.full(dp.shape, -1, dtype=int)
+            for p, (cost, n, obj, _) in enumerate(curves[floor]):
+                cost_units = int(np.ceil(cost / unit - 1e-9))
+                if cost_units > n_units or n > k_max:
+                    continue
+                candidate = np.full_like(dp, -np.inf)
+                candidate[cost_units:, n:] = dp[:n_units + 1 - cost_units, :k_max + 1 - n] + obj
+                better = candidate > new_dp
+                new_dp[better] = candidate[better]
+                choice[better] = p
+            choices.append(choice)
+            dp = new_dp
+        
+        b, k = np.unravel_index(np.argmax(dp), dp.shape)
+        selection = {}
+        for floor, choice in zip(reversed(floors), reversed(choices)):
+            p = int(choice[b, k])
+            selection[floor] = p
+            cost, n, _, _ = curves[floor][p]
+            b -= int(np.ceil(cost / unit - 1e-9))
+            k -= n
+        return selection
+    
+    def solve(self, time_limit: int = 300, gap: float = 0.01,
+              coverage_mode: str = "binary", n_steps: int = 20,
+              resolution: int = 200, max_workers: int = None) -> Dict:
+        """
+        Résout le problème multi-étages.
+        
+        Args:
+            time_limit: Temps maximal du calcul de la courbe de chaque étage
+                (secondes, réparti entre les résolutions de sa grille)
+            gap: Gap d'optimalité de chaque sous-problème
+            coverage_mode: "binary" ou "gradual"
+            n_steps: Nombre de niveaux de budget par courbe d'étage
+            resolution: Nombre d'unités de budget de la programmation dynamique
+            max_workers: Nombre de processus (par défaut: un par cœur)
+        
+        Returns:
+            Solution détaillée globale (même format que get_detailed_solution)
+            complétée par la répartition 'floor_allocation'
+        """
+        start_time = time.time()
+        subproblems = self.split_by_floor()
+        tasks = [{
+            'floor': floor,
+            'data': data,
+            'coverage_mode': coverage_mode,
+            'time_limit': time_limit,
+            'gap': gap,
+            'n_steps': n_steps,
+            'max_budget': self.model.max_budget,
+            'max_cameras': int(self.model.max_cameras)
+        } for floor, (_, _, data) in subproblems.items()]
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            self.floor_curves = dict(executor.map(_solve_floor_curve, tasks))
+        
+        selection = self._allocate(self.floor_curves, resolution)
+        
+        # Recomposer la solution globale: caméras retenues fixées dans le modèle complet
+        selected = set()
+        self.allocation = {}
+        for floor, p in selection.items():
+            cost, n, obj, local_cams = self.floor_curves[floor][p]
+            camera_ids = subproblems[floor][1]
+            selected.update(camera_ids[c] for c in local_cams)
+            self.allocation[floor] = {'budget': cost, 'n_cameras': n, 'objective': obj}
+        
+        if not self.model.build_model(enable_diagnostics=True, coverage_mode=coverage_mode):
+            return {}
+        for i, var in self.model.x.items():
+            var.LB = var.UB = 1.0 if i in selected else 0.0
+        if not self.model.solve(time_limit=time_limit, gap=gap):
+            return {}
+        self.model.solve_time = time.time() - start_time
+        
+        solution = self.model.get_detailed_solution()
+        solution['floor_allocation'] = self.allocation
+        return solution
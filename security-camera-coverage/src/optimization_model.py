@@ -13,6 +13,9 @@ from typing import Dict, List, Tuple, Optional
 import time
 
 
+DEFAULT_FLOOR = "0"  # Étage attribué aux zones et caméras sans identifiant
+
+
 class MaximalCoveringLocationModel:
     """
     Modèle d'optimisation pour le problème de couverture maximale
@@ -39,8 +42,16 @@ class MaximalCoveringLocationModel:
         self.max_cameras = 0
         self.max_budget = 0
         self.coverage_matrix = None
+        self.coverage_cameras = None  # Couples non nuls (caméra, zone) de la matrice
+        self.coverage_zones = None
+        self.coverage_quality = None  # Qualité 1 - distance/portée de chaque couple
+        self.coverage_mode = "binary"  # "binary" ou "gradual"
+        self.z = {}  # Variables d'affectation zone → caméra (mode graduel)
+        self.diagnostics = {}
         self.time_windows = {}  # Fenêtres de temps pour surveillance prioritaire
         self.camera_types = {}  # Types de caméras (fixe, PTZ, thermique, etc.)
+        self.zone_floors = {}  # Étage/bâtiment de chaque zone
+        self.camera_floors = {}  # Étage/bâtiment de chaque emplacement de caméra
         
     def set_problem_data(self, 
                         zones: List[Tuple[float, float]],
@@ -53,7 +64,9 @@ class MaximalCoveringLocationModel:
                         max_cameras: int,
                         max_budget: float,
                         time_windows: Optional[Dict[int, List[int]]] = None,
-                        camera_types: Optional[Dict[int, str]] = None):
+                        camera_types: Optional[Dict[int, str]] = None,
+                        zone_floors: Optional[Dict[int, str]] = None,
+                        camera_floors: Optional[Dict[int, str]] = None):
         """
         Définit les données du problème d'optimisation.
         
@@ -69,6 +82,9 @@ class MaximalCoveringLocationModel:
             max_budget: Budget total disponible
             time_windows: Périodes de surveillance prioritaire par zone
             camera_types: Types de caméras (fixe, PTZ, thermique, etc.)
+            zone_floors: Étage ou bâtiment de chaque zone
+            camera_floors: Étage ou bâtiment de chaque caméra (une caméra ne
+                couvre que les zones du même étage)
         """
         self.zones = zones
         self.camera_locations = camera_locations
@@ -81,6 +97,8 @@ class MaximalCoveringLocationModel:
         self.max_budget = max_budget
         self.time_windows = time_windows or {}
         self.camera_types = camera_types or {}
+        self.zone_floors = zone_floors or {}
+        self.camera_floors = camera_floors or {}
         
         # Calculer la matrice de couverture
         self._compute_coverage_matrix()
@@ -89,83 +107,184 @@ class MaximalCoveringLocationModel:
         """
         Calcule la matrice de couverture indiquant quelles zones peuvent être
         surveillées par quelles caméras en fonction de la distance et de l'angle.
+        
+        Le calcul est vectorisé (distances caméras × zones en une passe) et
+        conserve aussi la structure creuse de la matrice: les couples
+        (caméra, zone) non nuls triés par caméra, réutilisés par les
+        diagnostics et la construction du modèle, ainsi que la qualité de
+        couverture 1 - distance/portée de chaque couple (même décroissance
+        que la heatmap).
         """
         n_zones = len(self.zones)
         n_cameras = len(self.camera_locations)
         self.coverage_matrix = np.zeros((n_cameras, n_zones), dtype=int)
+        self.coverage_cameras = np.zeros(0, dtype=int)
+        self.coverage_zones = np.zeros(0, dtype=int)
+        self.coverage_quality = np.zeros(0, dtype=float)
+        
+        if n_zones == 0 or n_cameras == 0:
+            return
+        
+        cam_pos = np.asarray(self.camera_locations, dtype=float).reshape(n_cameras, 2)
+        zone_pos = np.asarray(self.zones, dtype=float).reshape(n_zones, 2)
+        ranges = np.array([self.camera_ranges.get(i, 50.0)  # Par défaut 50m
+                           for i in range(n_cameras)], dtype=float)
+        
+        # Distance euclidienne de chaque caméra à chaque zone
+        distances = np.hypot(cam_pos[:, None, 0] - zone_pos[None, :, 0],
+                             cam_pos[:, None, 1] - zone_pos[None, :, 1])
+        
+        # Une zone est couverte si elle est dans la portée de la caméra
+        covered = distances <= ranges[:, None]
+        
+        # ... et sur le même étage / bâtiment
+        if self.zone_floors or self.camera_floors:
+            floor_codes = {floor: code for code, floor in enumerate(self.get_floors())}
+            zone_codes = np.array([floor_codes[self.zone_floors.get(j, DEFAULT_FLOOR)]
+                                   for j in range(n_zones)])
+            camera_codes = np.array([floor_codes[self.camera_floors.get(i, DEFAULT_FLOOR)]
+                                     for i in range(n_cameras)])
+            covered &= camera_codes[:, None] == zone_codes[None, :]
+        self.coverage_matrix[covered] = 1
+        self.coverage_cameras, self.coverage_zones = np.nonzero(covered)
+        
+        # Qualité décroissante avec la distance, uniquement pour les couples à portée
+        pair_ranges = ranges[self.coverage_cameras]
+        pair_distances = distances[covered]
+        self.coverage_quality = 1.0 - np.divide(
+            pair_distances, pair_ranges,
+            out=np.zeros_like(pair_distances), where=pair_ranges > 0
+        )
+    
+    def get_floors(self) -> List[str]:
+        """Retourne la liste triée des étages/bâtiments présents dans les données."""
+        floors = {self.zone_floors.get(j, DEFAULT_FLOOR) for j in range(len(self.zones))}
+        floors |= {self.camera_floors.get(i, DEFAULT_FLOOR)
+                   for i in range(len(self.camera_locations))}
+        return sorted(floors, key=str)
+    
+    def compute_coverage_diagnostics(self) -> Dict:
+        """
+        Calcule les diagnostics de la matrice de couverture.
+        
+        Les degrés des zones et des caméras sont obtenus par une seule
+        réduction (bincount) sur les couples non nuls de la matrice creuse,
+        ce qui rend le coût négligeable devant la résolution.
+        
+        Returns:
+            Dictionnaire contenant:
+            - uncoverable_zones: zones qu'aucune caméra ne peut voir
+            - useless_cameras: caméras qui ne couvrent aucune zone
+            - zone_degree_histogram: {nb caméras à portée: nb zones}
+            - camera_degree_histogram: {nb zones couvertes: nb caméras}
+            - bounds: bornes supérieures sur la couverture atteignable
+        """
+        n_zones = len(self.zones)
+        n_cameras = len(self.camera_locations)
+        cams = self.coverage_cameras
+        zns = self.coverage_zones
+        
+        zone_degree = np.bincount(zns, minlength=n_zones)
+        camera_degree = np.bincount(cams, minlength=n_cameras)
+        
+        weights = np.array([self.zone_priorities.get(j, 1.0) *
+                            self.zone_populations.get(j, 1)
+                            for j in range(n_zones)], dtype=float)
+        costs = np.array([self.camera_costs.get(i, 1000.0)
+                          for i in range(n_cameras)], dtype=float)
+        camera_weight = np.bincount(cams, weights=weights[zns], minlength=n_cameras)
+        
+        uncoverable = np.flatnonzero(zone_degree == 0)
+        useless = np.flatnonzero(camera_degree == 0)
+        
+        # Nombre maximal de caméras installables (budget et plafond K):
+        # on prend les caméras utiles les moins chères tant que le budget le permet
+        useful_costs = np.sort(costs[camera_degree > 0])
+        n_affordable = int(np.searchsorted(np.cumsum(useful_costs),
+                                           self.max_budget, side='right'))
+        k_eff = min(int(self.max_cameras), n_affordable)
+        
+        # Avec k_eff caméras, on ne couvre pas plus que la somme des k_eff plus
+        # grands degrés (resp. poids couverts), ni plus que les zones couvrables
+        top_degrees = np.sort(camera_degree)[::-1][:k_eff]
+        top_weights = np.sort(camera_weight)[::-1][:k_eff]
+        coverable_weight = float(weights[zone_degree > 0].sum())
+        
+        return {
+            'n_zones': n_zones,
+            'n_cameras': n_cameras,
+            'n_coverage_pairs': int(cams.size),
+            'uncoverable_zones': uncoverable.tolist(),
+            'useless_cameras': useless.tolist(),
+            'zone_degree_histogram': {
+                int(d): int(c) for d, c in enumerate(np.bincount(zone_degree)) if c
+            },
+            'camera_degree_histogram': {
+                int(d): int(c) for d, c in enumerate(np.bincount(camera_degree)) if c
+            },
+            'bounds': {
+                'max_cameras_affordable': k_eff,
+                'max_zones_covered': min(int(top_degrees.sum()),
+                                         n_zones - int(uncoverable.size)),
+                'max_weighted_coverage': min(float(top_weights.sum()), coverable_weight),
+                'coverable_weight': coverable_weight,
+                'total_weight': float(weights.sum())
+            }
+        }
+    
+    def format_coverage_diagnostics(self, diagnostics: Dict) -> str:
+        """
+        Met en forme les diagnostics pour le journal de l'interface.
         
-        for i, cam_pos in enumerate(self.camera_locations):
-            cam_range = self.camera_ranges.get(i, 50.0)  # Par défaut 50m
+        Args:
+            diagnostics: Dictionnaire retourné par compute_coverage_diagnostics
             
-            for j, zone_pos in enumerate(self.zones):
-                # Calculer la distance euclidienne
-                distance = np.sqrt(
-                    (cam_pos[0] - zone_pos[0])**2 + 
-                    (cam_pos[1] - zone_pos[1])**2
-                )
-                
-                # Une zone est couverte si elle est dans la portée de la caméra
-                if distance <= cam_range:
-                    self.coverage_matrix[i, j] = 1
+        Returns:
+            Texte multi-lignes lisible
+        """
+        n_zones = diagnostics['n_zones']
+        n_cameras = diagnostics['n_cameras']
+        uncoverable = diagnostics['uncoverable_zones']
+        useless = diagnostics['useless_cameras']
+        bounds = diagnostics['bounds']
+        
+        lines = ["DIAGNOSTICS DE LA MATRICE DE COUVERTURE"]
+        lines.append(f"📊 Zones pouvant être couvertes: {n_zones - len(uncoverable)}/{n_zones}")
+        lines.append(f"   Zones IMPOSSIBLES à couvrir: {len(uncoverable)}/{n_zones}")
+        for j in uncoverable:
+            pos = self.zones[j]
+            priority = self.zone_priorities.get(j, 1)
+            pop = self.zone_populations.get(j, 1)
+            lines.append(f"      ⚠️ Zone #{j} - Position: {pos}, Priorité: {priority}, Population: {pop}")
+        
+        lines.append(f"📹 Caméras utiles: {n_cameras - len(useless)}/{n_cameras}")
+        lines.append(f"   Caméras inutiles (ne couvrent rien): {len(useless)}/{n_cameras}")
+        for i in useless:
+            pos = self.camera_locations[i]
+            cam_type = self.camera_types.get(i, 'fixe')
+            range_m = self.camera_ranges.get(i, 50)
+            lines.append(f"      ⚠️ Caméra #{i} ({cam_type}) - Position: {pos}, Portée: {range_m}m")
+        
+        zone_hist = ", ".join(f"{d}→{c}" for d, c in diagnostics['zone_degree_histogram'].items())
+        cam_hist = ", ".join(f"{d}→{c}" for d, c in diagnostics['camera_degree_histogram'].items())
+        lines.append(f"📈 Caméras à portée par zone (degré→zones): {zone_hist}")
+        lines.append(f"   Zones par caméra (degré→caméras): {cam_hist}")
+        
+        lines.append(f"🎯 Bornes: ≤ {bounds['max_cameras_affordable']} caméras finançables, "
+                     f"≤ {bounds['max_zones_covered']} zones couvertes, "
+                     f"couverture pondérée ≤ {bounds['max_weighted_coverage']:.0f} "
+                     f"(total {bounds['total_weight']:.0f})")
+        return "\n".join(lines)
     
     def print_coverage_diagnostics(self):
         """Affiche des diagnostics sur la matrice de couverture."""
-        n_zones = len(self.zones)
-        n_cameras = len(self.camera_locations)
-        
+        diagnostics = self.compute_coverage_diagnostics()
         print("\n" + "="*70)
-        print("DIAGNOSTICS DE LA MATRICE DE COUVERTURE")
-        print("="*70)
-        
-        # Zones pouvant être couvertes
-        zones_coverable = []
-        zones_not_coverable = []
-        
-        for j in range(n_zones):
-            can_cover = sum(self.coverage_matrix[:, j])
-            if can_cover > 0:
-                zones_coverable.append((j, can_cover))
-            else:
-                zones_not_coverable.append(j)
-        
-        print(f"\n📊 Statistiques:")
-        print(f"   Zones pouvant être couvertes: {len(zones_coverable)}/{n_zones}")
-        print(f"   Zones IMPOSSIBLES à couvrir: {len(zones_not_coverable)}/{n_zones}")
-        
-        if zones_not_coverable:
-            print(f"\n⚠️  ZONES IMPOSSIBLES À COUVRIR (aucune caméra à portée):")
-            for j in zones_not_coverable:
-                pos = self.zones[j]
-                priority = self.zone_priorities.get(j, 1)
-                pop = self.zone_populations.get(j, 1)
-                print(f"      Zone #{j} - Position: {pos}, Priorité: {priority}, Population: {pop}")
-        
-        # Caméras utiles
-        cameras_useful = []
-        cameras_useless = []
-        
-        for i in range(n_cameras):
-            zones_covered = sum(self.coverage_matrix[i, :])
-            if zones_covered > 0:
-                cameras_useful.append((i, zones_covered))
-            else:
-                cameras_useless.append(i)
-        
-        print(f"\n📹 Caméras:")
-        print(f"   Caméras utiles: {len(cameras_useful)}/{n_cameras}")
-        print(f"   Caméras inutiles (ne couvrent rien): {len(cameras_useless)}/{n_cameras}")
-        
-        if cameras_useless:
-            print(f"\n⚠️  CAMÉRAS INUTILES:")
-            for i in cameras_useless:
-                pos = self.camera_locations[i]
-                cam_type = self.camera_types.get(i, 'fixe')
-                range_m = self.camera_ranges.get(i, 50)
-                print(f"      Caméra #{i} ({cam_type}) - Position: {pos}, Portée: {range_m}m")
-        
-        print("\n" + "="*70 + "\n")
+        print(self.format_coverage_diagnostics(diagnostics))
+        print("="*70 + "\n")
+        return diagnostics
                     
-    def build_model(self, enable_diagnostics=False):
+    def build_model(self, enable_diagnostics=False, coverage_mode="binary"):
         """
         Construit le modèle d'optimisation Gurobi avec toutes les contraintes.
         
@@ -183,11 +302,29 @@ class MaximalCoveringLocationModel:
             3. Couverture: y_j ≤ Σ(couverture_ij × x_i) pour tout j
             4. Types de caméras: contraintes spécifiques par type
             5. Fenêtres de temps: contraintes de couverture temporelle
+        
+        Mode graduel (coverage_mode="gradual"):
+            z_ij ∈ [0,1], créée uniquement pour les couples à portée (a_ij = 1),
+            affecte la zone j à la caméra i. La valeur de couverture de la zone
+            est la meilleure qualité q_ij = 1 - d_ij/r_i parmi les caméras
+            installées:
+            Maximiser Σ(priorité_j × population_j × q_ij × z_ij)
+            avec y_j = Σ_i z_ij ≤ 1 et z_ij ≤ x_i.
+            La taille du modèle reste proportionnelle au nombre de couples a_ij.
+        
+        Args:
+            enable_diagnostics: Calcule les diagnostics de couverture
+            coverage_mode: "binary" (couverture tout-ou-rien) ou "gradual"
         """
         try:
-            # Afficher les diagnostics si demandé
+            if coverage_mode not in ("binary", "gradual"):
+                raise ValueError(f"Mode de couverture inconnu: {coverage_mode}")
+            self.coverage_mode = coverage_mode
+            gradual = coverage_mode == "gradual"
+            
+            # Calculer les diagnostics si demandé (rendus par l'interface)
             if enable_diagnostics:
-                self.print_coverage_diagnostics()
+                self.diagnostics = self.compute_coverage_diagnostics()
             
             # Créer le modèle Gurobi
             self.model = gp.Model("MaximalCoveringLocationProblem")
@@ -205,31 +342,57 @@ class MaximalCoveringLocationModel:
                     name=f"x_{i}_cam_{cam_type}"
                 )
             
-            # y_j: 1 si la zone j est couverte
+            # y_j: 1 si la zone j est couverte (continue en mode graduel,
+            # l'intégralité découle des z_ij et des x_i)
             self.y = {}
             for j in range(n_zones):
                 self.y[j] = self.model.addVar(
-                    vtype=GRB.BINARY, 
+                    vtype=GRB.CONTINUOUS if gradual else GRB.BINARY,
+                    ub=1.0,
                     name=f"y_{j}_zone"
                 )
             
+            # Couples (caméra, zone) à portée, regroupés par zone
+            pair_cameras = self.coverage_cameras.tolist()
+            pair_zones = self.coverage_zones.tolist()
+            pairs_by_zone = {j: [] for j in range(n_zones)}
+            for k, j in enumerate(pair_zones):
+                pairs_by_zone[j].append(k)
+            
+            # z_ij: affectation de la zone j à la caméra i (mode graduel)
+            self.z = {}
+            if gradual:
+                for k, j in enumerate(pair_zones):
+                    self.z[k] = self.model.addVar(
+                        vtype=GRB.CONTINUOUS, ub=1.0,
+                        name=f"z_{pair_cameras[k]}_{j}"
+                    )
+            
             # Fonction objectif: Maximiser la couverture pondérée
-            # Objectif principal: couverture pondérée
-            coverage_objective = gp.quicksum(
-                self.zone_priorities.get(j, 1.0) * 
-                self.zone_populations.get(j, 1) * 
-                self.y[j]
-                for j in range(n_zones)
-            )
+            # Objectif principal: couverture pondérée (par la qualité en mode graduel)
+            if gradual:
+                quality = self.coverage_quality.tolist()
+                coverage_objective = gp.quicksum(
+                    self.zone_priorities.get(j, 1.0) * 
+                    self.zone_populations.get(j, 1) * 
+                    quality[k] * self.z[k]
+                    for k, j in enumerate(pair_zones)
+                )
+            else:
+                coverage_objective = gp.quicksum(
+                    self.zone_priorities.get(j, 1.0) * 
+                    self.zone_populations.get(j, 1) * 
+                    self.y[j]
+                    for j in range(n_zones)
+                )
             
             # Bonus: Encourager la redondance pour zones critiques (priorité >= 7)
             # Bonus = 10% de la valeur de base si couverture >= 2 caméras
             redundancy_bonus = gp.quicksum(
                 0.1 * self.zone_priorities.get(j, 1.0) * 
                 self.zone_populations.get(j, 1) * 
-                self.coverage_matrix[i, j] * self.x[i]
-                for j in range(n_zones)
-                for i in range(n_cameras)
+                self.x[pair_cameras[k]]
+                for k, j in enumerate(pair_zones)
                 if self.zone_priorities.get(j, 1.0) >= 7.0
             )
             
@@ -253,21 +416,33 @@ class MaximalCoveringLocationModel:
             )
             
             # Contrainte 3: Une zone n'est couverte que si au moins une caméra la couvre
-            for j in range(n_zones):
-                covering_cameras = gp.quicksum(
-                    self.coverage_matrix[i, j] * self.x[i]
-                    for i in range(n_cameras)
-                )
-                self.model.addConstr(
-                    self.y[j] <= covering_cameras,
-                    name=f"coverage_zone_{j}"
-                )
+            if gradual:
+                # La zone est affectée à au plus une caméra installée
+                for j in range(n_zones):
+                    self.model.addConstr(
+                        self.y[j] == gp.quicksum(self.z[k] for k in pairs_by_zone[j]),
+                        name=f"coverage_zone_{j}"
+                    )
+                for k, z_k in self.z.items():
+                    self.model.addConstr(
+                        z_k <= self.x[pair_cameras[k]],
+                        name=f"assignment_{pair_cameras[k]}_{pair_zones[k]}"
+                    )
+            else:
+                for j in range(n_zones):
+                    covering_cameras = gp.quicksum(
+                        self.x[pair_cameras[k]] for k in pairs_by_zone[j]
+                    )
+                    self.model.addConstr(
+                        self.y[j] <= covering_cameras,
+                        name=f"coverage_zone_{j}"
+                    )
             
             # Contrainte 3b: Éviter d'installer des caméras qui ne couvrent aucune zone
             # Une caméra ne devrait être installée que si elle couvre au moins une zone
+            camera_degree = np.bincount(self.coverage_cameras, minlength=n_cameras)
             for i in range(n_cameras):
-                zones_coverable = sum(self.coverage_matrix[i, :])
-                if zones_coverable == 0:
+                if camera_degree[i] == 0:
                     # Cette caméra ne peut couvrir aucune zone, ne pas l'installer
                     self.model.addConstr(
                         self.x[i] == 0,
@@ -405,7 +580,9 @@ class MaximalCoveringLocationModel:
             'coverage_details': {},
             'total_cost': 0,
             'coverage_percentage': 0,
-            'total_priority_coverage': 0
+            'total_priority_coverage': 0,
+            'coverage_quality': {},
+            'total_quality_coverage': 0
         }
         
         n_zones = len(self.zones)
@@ -438,6 +615,19 @@ class MaximalCoveringLocationModel:
         
         self.solution['coverage_percentage'] = (covered_zones / n_zones * 100) if n_zones > 0 else 0
         self.solution['total_priority_coverage'] = total_priority
+        
+        # Meilleure qualité de couverture de chaque zone parmi les caméras installées
+        installed = np.zeros(n_cameras, dtype=bool)
+        installed[self.solution['cameras_installed']] = True
+        active = installed[self.coverage_cameras]
+        best_quality = np.zeros(n_zones)
+        np.maximum.at(best_quality, self.coverage_zones[active], self.coverage_quality[active])
+        total_quality = 0
+        for j in self.solution['zones_covered']:
+            self.solution['coverage_quality'][j] = float(best_quality[j])
+            total_quality += (self.zone_priorities.get(j, 1.0) *
+                              self.zone_populations.get(j, 1) * best_quality[j])
+        self.solution['total_quality_coverage'] = float(total_quality)
         self.objective_value = self.model.ObjVal
     
     def get_solution_summary(self) -> Dict:
@@ -458,10 +648,13 @@ class MaximalCoveringLocationModel:
             'budget_utilization': (self.solution['total_cost'] / self.max_budget * 100) if self.max_budget > 0 else 0,
             'coverage_percentage': self.solution['coverage_percentage'],
             'total_priority_coverage': self.solution['total_priority_coverage'],
+            'total_quality_coverage': self.solution['total_quality_coverage'],
+            'coverage_mode': self.coverage_mode,
             'solve_time': self.solve_time,
             'cameras_installed': self.solution['cameras_installed'],
             'zones_covered': self.solution['zones_covered'],
-            'coverage_details': self.solution['coverage_details']
+            'coverage_details': self.solution['coverage_details'],
+            'coverage_quality': self.solution['coverage_quality']
         }
     
     def get_detailed_solution(self) -> Dict:
@@ -481,6 +674,7 @@ class MaximalCoveringLocationModel:
                 'cost': self.camera_costs.get(cam_id, 1000.0),
                 'range': self.camera_ranges.get(cam_id, 50.0),
                 'angle': self.camera_angles.get(cam_id, 360.0),
+                'floor': self.camera_floors.get(cam_id, DEFAULT_FLOOR),
                 'zones_covered': zones_covered,
                 'n_zones_covered': len(zones_covered)
             })
@@ -498,11 +692,16 @@ class MaximalCoveringLocationModel:
                 'position': zone_pos,
                 'priority': self.zone_priorities.get(j, 1.0),
                 'population': self.zone_populations.get(j, 1),
+                'floor': self.zone_floors.get(j, DEFAULT_FLOOR),
                 'is_covered': is_covered,
                 'covering_cameras': covering_cams,
-                'redundancy_level': len(covering_cams)
+                'redundancy_level': len(covering_cams),
+                'coverage_quality': self.solution['coverage_quality'].get(j, 0.0)
             })
         
         summary['zone_details'] = zone_details
         
+        if self.diagnostics:
+            summary['diagnostics'] = self.diagnostics
+        
         return summary
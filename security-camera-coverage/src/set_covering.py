@@ -0,0 +1,340 @@
+"""
+Module de résolution du problème de Recouvrement d'Ensemble (Set Covering)
+compagnon du modèle de couverture maximale.
+
+Question duale de la couverture maximale: quel est l'ensemble de caméras de
+coût minimal couvrant toutes les zones dont la priorité dépasse un seuil ?
+Le coût obtenu sert directement de budget maximal pour le modèle MCLP.
+
+Méthode:
+1. Réductions de lignes (zones dominées) et de colonnes (caméras dominées,
+   caméras essentielles)
+2. Borne supérieure gloutonne (Chvátal) et borne inférieure lagrangienne
+   (sous-gradient vectorisé sur la structure creuse de couverture)
+3. Résolution exacte Gurobi si l'écart entre les bornes reste trop grand
+"""
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+from typing import Dict, List, Set, Tuple
+import time
+
+
+class SetCoveringModel:
+    """
+    Recouvrement à coût minimal des zones critiques, construit sur les données
+    et la matrice de couverture creuse d'un MaximalCoveringLocationModel.
+    """
+    
+    def __init__(self, mclp_model, priority_threshold: float = 7.0):
+        """
+        Initialise le modèle de recouvrement.
+        
+        Args:
+            mclp_model: Modèle de couverture maximale dont set_problem_data a été appelé
+            priority_threshold: Priorité minimale d'une zone pour devoir être couverte
+        """
+        self.mclp = mclp_model
+        self.priority_threshold = priority_threshold
+        self.solution = {}
+    
+    def _build_instance(self) -> Tuple[Dict[int, Set[int]], Dict[int, Set[int]], List[int], List[int]]:
+        """
+        Extrait l'instance de recouvrement restreinte aux zones critiques.
+        
+        Returns:
+            (zones par caméra, caméras par zone, zones critiques, zones critiques
+            impossibles à couvrir)
+        """
+        n_zones = len(self.mclp.zones)
+        critical = [j for j in range(n_zones)
+                    if self.mclp.zone_priorities.get(j, 1.0) >= self.priority_threshold]
+        is_critical = np.zeros(n_zones, dtype=bool)
+        is_critical[critical] = True
+        
+        mask = is_critical[self.mclp.coverage_zones]
+        rows_of = {}
+        cols_of = {j: set() for j in critical}
+        for i, j in zip(self.mclp.coverage_cameras[mask].tolist(),
+                        self.mclp.coverage_zones[mask].tolist()):
+            rows_of.setdefault(i, set()).add(j)
+            cols_of[j].add(i)
+        
+        uncoverable = [j for j in critical if not cols_of[j]]
+        for j in uncoverable:
+            del cols_of[j]
+        
+        return rows_of, cols_of, critical, uncoverable
+    
+    def _reduce(self, rows_of, cols_of, costs) -> Tuple[List[int], Dict[str, int]]:
+        """
+        Applique les réductions classiques jusqu'à stabilité (modifie les
+        dictionnaires en place):
+        - caméra essentielle: seule caméra voyant une zone, elle est imposée
+        - zone dominée: si cols(j) ⊆ cols(k), couvrir j couvre k, k est retirée
+        - caméra dominée: si rows(i) ⊆ rows(l) et c_i ≥ c_l, i est retirée
+        
+        Returns:
+            (caméras imposées, statistiques des réductions)
+        """
+        fixed = []
+        stats = {'fixed_cameras': 0, 'rows_removed': 0, 'columns_removed': 0}
+        
+        def remove_row(j):
+            for i in cols_of.pop(j):
+                rows_of[i].discard(j)
+        
+        def remove_column(i):
+            for j in rows_of.pop(i):
+                cols_of[j].discard(i)
+        
+        changed = True
+        while changed:
+            changed = False
+            
+            # Caméras sans zone critique
+            for i in [i for i, rows in rows_of.items() if not rows]:
+                del rows_of[i]
+                stats['columns_removed'] += 1
+            
+            # Caméras essentielles
+            for j in list(cols_of):
+                if j in cols_of and len(cols_of[j]) == 1:
+                    i = next(iter(cols_of[j]))
+                    fixed.append(i)
+                    stats['fixed_cameras'] += 1
+                    for k in list(rows_of[i]):
+                        remove_row(k)
+                        stats['rows_removed'] += 1
+                    del rows_of[i]
+                    changed = True
+            
+            # Zones dominées: comparer uniquement les zones partageant une caméra
+            for j in sorted(cols_of, key=lambda j: len(cols_of[j])):
+                if j not in cols_of:
+                    continue
+                cols_j = cols_of[j]
+                pivot = min(cols_j, key=lambda i: len(rows_of[i]))
+                for k in list(rows_of[pivot]):
+                    if k != j and k in cols_of and cols_j <= cols_of[k] \
+                            and (len(cols_j) < len(cols_of[k]) or j < k):
+                        remove_row(k)
+                        stats['rows_removed'] += 1
+                        changed = True
+            
+            # Caméras dominées
+            for i in sorted(rows_of, key=lambda i: (len(rows_of[i]), -costs[i])):
+                if i not in rows_of or not rows_of[i]:
+                    continue
+                rows_i = rows_of[i]
+                pivot = min(rows_i, key=lambda j: len(cols_of[j]))
+                for l in cols_of[pivot]:
+                    if l != i and rows_i <= rows_of[l] and \
+                            (costs[i] > costs[l] or (costs[i] == costs[l] and
+                                                     (len(rows_i) < len(rows_of[l]) or i > l))):
+                        remove_column(i)
+                        stats['columns_removed'] += 1
+                        changed = True
+                        break
+        
+        return fixed, stats
+    
+    @staticmethod
+    def _greedy(rows_of, cols_of, costs, start=()) -> List[int]:
+        """
+        Heuristique gloutonne de Chvátal: choisit la caméra de plus petit coût
+        par zone nouvellement couverte, puis retire les caméras redondantes.
+        
+        Args:
+            start: caméras déjà retenues (solution partielle à compléter)
+        """
+        selected = list(dict.fromkeys(i for i in start if i in rows_of))
+        uncovered = set(cols_of)
+        for i in selected:
+            uncovered -= rows_of[i]
+        
+        while uncovered:
+            best, best_ratio = None, None
+            for i, rows in rows_of.items():
+                gain = len(rows & uncovered)
+                if gain:
+                    ratio = costs[i] / gain
+                    if best_ratio is None or ratio < best_ratio:
+                        best, best_ratio = i, ratio
+            selected.append(best)
+            uncovered -= rows_of[best]
+        
+        # Retirer les caméras redondantes, les plus chères d'abord
+        cover_count = {j: 0 for j in cols_of}
+        for i in selected:
+            for j in rows_of[i]:
+                cover_count[j] += 1
+        for i in sorted(selected, key=lambda i: -costs[i]):
+            if all(cover_count[j] > 1 for j in rows_of[i]):
+                selected.remove(i)
+                for j in rows_of[i]:
+                    cover_count[j] -= 1
+        
+        return selected
+    
+    def _lagrangian_bound(self, rows_of, cols_of, costs, upper_bound,
+                          incumbent, max_iter: int = 300) -> Tuple[float, List[int]]:
+        """
+        Borne inférieure lagrangienne par sous-gradient.
+        
+        Relaxation des contraintes de couverture avec multiplicateurs u_j ≥ 0:
+            L(u) = Σ u_j + Σ_i min(0, c_i - Σ_{j ∈ rows(i)} u_j)
+        Chaque itération se réduit à deux bincount sur les couples creux.
+        Les solutions lagrangiennes sont réparées par le glouton pour
+        améliorer la borne supérieure.
+        
+        Returns:
+            (meilleure borne inférieure, meilleure solution réalisable)
+        """
+        columns = list(rows_of)
+        rows = list(cols_of)
+        if not rows:
+            return 0.0, []
+        col_index = {i: k for k, i in enumerate(columns)}
+        row_index = {j: k for k, j in enumerate(rows)}
+        pair_c = np.array([col_index[i] for i in columns for _ in rows_of[i]], dtype=int)
+        pair_r = np.array([row_index[j] for i in columns for j in rows_of[i]], dtype=int)
+        c = np.array([costs[i] for i in columns], dtype=float)
+        n_rows = len(rows)
+        n_cols = len(columns)
+        
+        # Initialisation: u_j = min_i c_i / |rows(i)|
+        ratio = c / np.maximum(np.bincount(pair_c, minlength=n_cols), 1)
+        u = np.full(n_rows, np.inf)
+        np.minimum.at(u, pair_r, ratio[pair_c])
+        
+        best_lb = 0.0
+        best_cover = list(incumbent)
+        lam = 2.0
+        stall = 0
+        for it in range(max_iter):
+            reduced = c - np.bincount(pair_c, weights=u[pair_r], minlength=n_cols)
+            x = reduced < 0
+            lb = float(u.sum() + reduced[x].sum())
+            if lb > best_lb + 1e-9:
+                best_lb = lb
+                stall = 0
+            else:
+                stall += 1
+                if stall >= 20:
+                    lam /= 2.0
+                    stall = 0
+            
+            # Heuristique lagrangienne: compléter la solution relâchée
+            if it % 10 == 0:
+                cover = self._greedy(rows_of, cols_of, costs,
+                                     start=[columns[k] for k in np.flatnonzero(x)])
+                cover_cost = sum(costs[i] for i in cover)
+                if cover_cost < upper_bound:
+                    upper_bound = cover_cost
+                    best_cover = cover
+            
+            if upper_bound - best_lb <= 1e-6 * max(upper_bound, 1.0) or lam < 1e-4:
+                break
+            
+            subgradient = 1.0 - np.bincount(pair_r, weights=x[pair_c].astype(float),
+                                            minlength=n_rows)
+            norm = float(subgradient @ subgradient)
+            if norm == 0:
+                break
+            u = np.maximum(0.0, u + lam * (upper_bound - lb) / norm * subgradient)
+        
+        return best_lb, best_cover
+    
+    def _solve_exact(self, rows_of, cols_of, costs, incumbent,
+                     time_limit: int, gap: float) -> Tuple[List[int], float, bool]:
+        """
+        Résout exactement le recouvrement réduit avec Gurobi (démarrage à
+        chaud sur la meilleure solution heuristique).
+        
+        Returns:
+            (caméras retenues, borne inférieure, True si optimal)
+        """
+        model = gp.Model("SetCoveringProblem")
+        model.setParam('OutputFlag', 0)
+        model.setParam('TimeLimit', time_limit)
+        model.setParam('MIPGap', gap)
+        
+        x = {}
+        for i in rows_of:
+            x[i] = model.addVar(vtype=GRB.BINARY, obj=costs[i], name=f"x_{i}")
+            x[i].Start = 1.0 if i in incumbent else 0.0
+        for j, cols in cols_of.items():
+            model.addConstr(gp.quicksum(x[i] for i in cols) >= 1, name=f"cover_zone_{j}")
+        model.ModelSense = GRB.MINIMIZE
+        model.optimize()
+        
+        if model.SolCount == 0:
+            return list(incumbent), 0.0, False
+        selected = [i for i in rows_of if x[i].X > 0.5]
+        return selected, model.ObjBound, model.status == GRB.OPTIMAL
+    
+    def solve(self, time_limit: int = 60, gap: float = 0.01) -> Dict:
+        """
+        Calcule l'ensemble de caméras de coût minimal couvrant les zones critiques.
+        
+        Args:
+            time_limit: Temps maximal accordé à la résolution exacte (secondes)
+            gap: Écart relatif accepté entre bornes avant de recourir à Gurobi
+        
+        Returns:
+            Dictionnaire de solution; 'recommended_max_budget' et
+            'recommended_max_cameras' alimentent directement le modèle MCLP
+        """
+        start_time = time.time()
+        n_cameras = len(self.mclp.camera_locations)
+        costs = {i: self.mclp.camera_costs.get(i, 1000.0) for i in range(n_cameras)}
+        
+        rows_of, cols_of, critical, uncoverable = self._build_instance()
+        n_rows_initial = len(cols_of)
+        n_cols_initial = len(rows_of)
+        fixed, reductions = self._reduce(rows_of, cols_of, costs)
+        reductions['rows_remaining'] = len(cols_of)
+        reductions['columns_remaining'] = len(rows_of)
+        
+        fixed_cost = sum(costs[i] for i in fixed)
+        greedy = self._greedy(rows_of, cols_of, costs)
+        upper = sum(costs[i] for i in greedy)
+        lower, best = self._lagrangian_bound(rows_of, cols_of, costs, upper, greedy)
+        upper = sum(costs[i] for i in best)
+        
+        method = 'heuristique'
+        optimal = upper - lower <= gap * max(upper, 1e-9)
+        if not optimal:
+            remaining = max(1, int(time_limit - (time.time() - start_time)))
+            exact, bound, optimal = self._solve_exact(rows_of, cols_of, costs, set(best),
+                                                      remaining, gap)
+            exact_cost = sum(costs[i] for i in exact)
+            if exact_cost <= upper:
+                best, upper = exact, exact_cost
+            lower = max(lower, bound)
+            method = 'gurobi'
+        
+        cameras = sorted(fixed + best)
+        total_cost = fixed_cost + upper
+        lower_bound = fixed_cost + min(lower, upper)
+        
+        self.solution = {
+            'status': 'optimal' if optimal else 'feasible',
+            'method': method,
+            'priority_threshold': self.priority_threshold,
+            'critical_zones': critical,
+            'uncoverable_critical_zones': uncoverable,
+            'cameras_installed': cameras,
+            'n_cameras': len(cameras),
+            'total_cost': total_cost,
+            'lower_bound': lower_bound,
+            'gap': (total_cost - lower_bound) / total_cost if total_cost > 0 else 0.0,
+            'reductions': dict(reductions, rows_initial=n_rows_initial,
+                               columns_initial=n_cols_initial),
+            'solve_time': time.time() - start_time,
+            'recommended_max_budget': total_cost,
+            'recommended_max_cameras': len(cameras)
+        }
+        return self.solution